@@ -0,0 +1,140 @@
+import asyncio
+import logging
+import os
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from app.db.payloads import SPLIT_FLAG, load_payloads
+from app.db.summaries import apply_changes
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_ENABLED = os.getenv("ARCHIVE_ENABLED", "true").lower() == "true"
+ARCHIVE_INTERVAL_SECONDS = int(os.getenv("ARCHIVE_INTERVAL_SECONDS", "3600"))
+ARCHIVE_GRACE_DAYS = int(os.getenv("ARCHIVE_GRACE_DAYS", "30"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+ARCHIVE_MAX_BATCHES = int(os.getenv("ARCHIVE_MAX_BATCHES", "20"))
+
+LOCK_ID = "archiver"
+WORKER_ID = uuid.uuid4().hex
+
+
+def stale_filter(now: datetime) -> dict:
+    """Cancelled, or expired without being completed, for longer than the grace period."""
+    cutoff = now - timedelta(days=ARCHIVE_GRACE_DAYS)
+    return {
+        "$or": [
+            {"status": "cancelled", "updated_at": {"$lt": cutoff}},
+            {"status": "active", "invite_expires_at": {"$lt": cutoff}},
+        ]
+    }
+
+
+async def acquire_lease(db: AsyncIOMotorDatabase, seconds: int) -> bool:
+    """Only one worker across the deployment archives per interval."""
+    now = datetime.utcnow()
+    try:
+        await db.locks.find_one_and_update(
+            {
+                "_id": LOCK_ID,
+                "$or": [{"expires_at": {"$lt": now}}, {"owner": WORKER_ID}],
+            },
+            {
+                "$set": {
+                    "owner": WORKER_ID,
+                    "expires_at": now + timedelta(seconds=seconds),
+                }
+            },
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        return False
+    return True
+
+
+async def archive_batch(db: AsyncIOMotorDatabase, now: datetime) -> int:
+    predicate = stale_filter(now)
+    documents = await db.assessments.find(predicate).to_list(length=ARCHIVE_BATCH_SIZE)
+    if not documents:
+        return 0
+
+    # Archived documents carry their payload inline again.
+    await load_payloads(db, documents)
+    archived_at = datetime.utcnow()
+    for document in documents:
+        document.pop(SPLIT_FLAG, None)
+        document["archived_at"] = archived_at
+    try:
+        await db.assessments_archive.insert_many(documents, ordered=False)
+    except BulkWriteError as exc:
+        # Duplicates are leftovers from an interrupted run; anything else is real.
+        if any(error.get("code") != 11000 for error in exc.details["writeErrors"]):
+            raise
+
+    ids = [document["_id"] for document in documents]
+    result = await db.assessments.delete_many({"_id": {"$in": ids}, **predicate})
+    archived = ids
+    if result.deleted_count < len(ids):
+        # Some were revived (e.g. invite extended) between read and delete.
+        remaining = await db.assessments.distinct("_id", {"_id": {"$in": ids}})
+        await db.assessments_archive.delete_many({"_id": {"$in": remaining}})
+        archived = list(set(ids) - set(remaining))
+    await db.assessment_payloads.delete_many({"_id": {"$in": archived}})
+    archived_ids = set(archived)
+    await apply_changes(
+        db,
+        (
+            (document["owner_id"], document, None)
+            for document in documents
+            if document["_id"] in archived_ids and document.get("owner_id")
+        ),
+    )
+    return result.deleted_count
+
+
+async def archive_stale(db: AsyncIOMotorDatabase) -> int:
+    now = datetime.utcnow()
+    archived = 0
+    for _ in range(ARCHIVE_MAX_BATCHES):
+        moved = await archive_batch(db, now)
+        archived += moved
+        if moved < ARCHIVE_BATCH_SIZE:
+            break
+    return archived
+
+
+async def run_archiver(db: AsyncIOMotorDatabase) -> None:
+    # Stagger workers so they don't all race for the lease at boot.
+    await asyncio.sleep(random.uniform(0, min(60, ARCHIVE_INTERVAL_SECONDS)))
+    while True:
+        try:
+            if await acquire_lease(db, ARCHIVE_INTERVAL_SECONDS):
+                archived = await archive_stale(db)
+                if archived:
+                    logger.info("Archived %d stale assessments", archived)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Archiving stale assessments failed")
+        await asyncio.sleep(ARCHIVE_INTERVAL_SECONDS)
+
+
+def start_archiver(db: AsyncIOMotorDatabase) -> Optional[asyncio.Task]:
+    if not ARCHIVE_ENABLED:
+        return None
+    return asyncio.create_task(run_archiver(db))
+
+
+async def stop_archiver(task: Optional[asyncio.Task]) -> None:
+    if task is None:
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
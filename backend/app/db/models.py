@@ -36,6 +36,9 @@ class AssessmentDocument:
             "invite_token": invite_token,
             "invite_expires_at": invite_expires_at,
             "status": "active",
+            "revision": 0,
+            # Responses go to assessment_payloads; see app.db.payloads.
+            "payload_split": True,
             "created_at": now(),
             "updated_at": now(),
         }
@@ -67,14 +70,49 @@ class ProgressDocument:
         }
 
 
+def keyed_by_metric(value: Any) -> Any:
+    """Store per-metric lists as maps keyed by metricId so deltas can target them."""
+    if isinstance(value, list) and all(
+        isinstance(item, dict) and isinstance(item.get("metricId"), str)
+        for item in value
+    ):
+        return {item["metricId"]: item for item in value}
+    return value
+
+
+def metric_list(value: Any) -> Any:
+    """Inverse of ``keyed_by_metric`` for responses: the list clients send.
+
+    Maps whose entries don't carry their own metricId (or legacy values)
+    are returned unchanged.
+    """
+    if isinstance(value, dict) and all(
+        isinstance(item, dict) and item.get("metricId") == key
+        for key, item in value.items()
+    ):
+        return list(value.values())
+    return value
+
+
 class AssessmentUpdate:
     def __init__(self, payload: dict[str, Any]):
         self.payload = payload
+        self.removed: dict[str, str] = {}
 
     def set(self, key: str, value: Any) -> None:
         if value is not None:
             self.payload[key] = value
 
+    def set_keyed(self, field: str, updates: dict[str, Any]) -> None:
+        for key, value in updates.items():
+            if value is None:
+                self.removed[f"{field}.{key}"] = ""
+            else:
+                self.payload[f"{field}.{key}"] = value
+
     def to_update(self) -> dict:
         self.payload["updated_at"] = now()
-        return {"$set": self.payload}
+        update = {"$set": self.payload, "$inc": {"revision": 1}}
+        if self.removed:
+            update["$unset"] = self.removed
+        return update
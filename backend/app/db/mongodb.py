@@ -1,24 +1,66 @@
 import os
-from pymongo import MongoClient, ASCENDING
-from pymongo.database import Database
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING
 from pymongo.errors import OperationFailure
 
+from app.monitoring import CommandMetrics
+from app.utils.idempotency import IDEMPOTENCY_TTL_SECONDS
+
 MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017/")
 DATABASE_NAME = os.getenv("MONGODB_DB", "aicompass")
+MIN_POOL_SIZE = int(os.getenv("MONGODB_MIN_POOL_SIZE", "0"))
+MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
+WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "5000"))
+SERVER_SELECTION_TIMEOUT_MS = int(
+    os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000")
+)
 
-client: MongoClient | None = None
-db: Database | None = None
+client: AsyncIOMotorClient | None = None
+db: AsyncIOMotorDatabase | None = None
+# PID that created the client; a client inherited across fork is not safe.
+client_pid: int | None = None
 
 
-def connect_db() -> None:
-    global client, db
-    client = MongoClient(MONGODB_URL)
+async def connect_db() -> None:
+    global client, db, client_pid
+    if client is not None and client_pid == os.getpid():
+        return
+    client_pid = os.getpid()
+    client = AsyncIOMotorClient(
+        MONGODB_URL,
+        minPoolSize=MIN_POOL_SIZE,
+        maxPoolSize=MAX_POOL_SIZE,
+        waitQueueTimeoutMS=WAIT_QUEUE_TIMEOUT_MS,
+        serverSelectionTimeoutMS=SERVER_SELECTION_TIMEOUT_MS,
+        event_listeners=[CommandMetrics()],
+    )
     db = client[DATABASE_NAME]
+    await create_indexes(db)
+
 
+async def create_indexes(db: AsyncIOMotorDatabase) -> None:
     try:
-        db.users.create_index([("email", ASCENDING)], unique=True)
-        db.assessments.create_index([("owner_id", ASCENDING)])
-        db.assessments.create_index([("invite_token", ASCENDING)], unique=True)
+        await db.users.create_index([("email", ASCENDING)], unique=True)
+        await db.assessments.create_index([("owner_id", ASCENDING)])
+        await db.assessments.create_index(
+            [
+                ("owner_id", ASCENDING),
+                ("created_at", DESCENDING),
+                ("_id", DESCENDING),
+            ]
+        )
+        await db.assessments.create_index([("invite_token", ASCENDING)], unique=True)
+        # Archiver scan: cancelled/active documents past the grace period.
+        await db.assessments.create_index(
+            [("status", ASCENDING), ("invite_expires_at", ASCENDING)]
+        )
+        await db.assessments.create_index(
+            [("status", ASCENDING), ("updated_at", ASCENDING)]
+        )
+        await db.idempotency_keys.create_index(
+            [("created_at", ASCENDING)], expireAfterSeconds=IDEMPOTENCY_TTL_SECONDS
+        )
     except OperationFailure as exc:
         if exc.code == 13:
             raise RuntimeError(
@@ -28,12 +70,15 @@ def connect_db() -> None:
 
 
 def close_db() -> None:
-    global client
-    if client:
+    global client, db, client_pid
+    if client and client_pid == os.getpid():
         client.close()
+    client = None
+    db = None
+    client_pid = None
 
 
-def get_db() -> Database:
+def get_db() -> AsyncIOMotorDatabase:
     if db is None:
         raise RuntimeError("Database not initialized")
     return db
@@ -0,0 +1,305 @@
+"""Response payloads stored apart from assessment metadata.
+
+Selections, scores, responses and the exec profile live in
+``assessment_payloads`` under the assessment's ``_id``, so metadata reads
+and conditional writes on ``assessments`` stay small. Documents created
+before the split keep the fields inline until migrated, either lazily on
+their next invite write or in bulk:
+
+python -m app.db.payloads --batch-size 500
+
+Metadata and payload are written separately, metadata first. A write that
+changes the payload also bumps ``payload_revision`` on the metadata and
+stamps the payload with the new value, and a payload only replaces one
+with an older stamp. Readers check that the two agree, so they never mix
+the halves of different writes or see metadata whose payload write has
+not landed.
+"""
+
+import argparse
+import asyncio
+import os
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from app.db.models import keyed_by_metric
+from app.db.mongodb import close_db, connect_db, get_db
+
+PAYLOAD_FIELDS = ("selections", "scores", "responses", "exec_profile")
+PAYLOAD_PROJECTION = {field: 1 for field in PAYLOAD_FIELDS}
+
+# Marks documents whose payload lives in assessment_payloads.
+SPLIT_FLAG = "payload_split"
+UNSPLIT = {SPLIT_FLAG: {"$ne": True}}
+
+PAYLOAD_REVISION = "payload_revision"
+PAYLOAD_READ_ATTEMPTS = 3
+# How long a payload may lag its metadata before the write is taken for
+# abandoned (its request failed, or its worker died) and the payload is
+# accepted as it stands.
+PAYLOAD_SETTLE_SECONDS = float(os.getenv("PAYLOAD_SETTLE_SECONDS", "5"))
+
+
+class StalePayload(Exception):
+    """The stored payload doesn't belong to the metadata it was read with."""
+
+
+def is_payload_key(key: str) -> bool:
+    return key.partition(".")[0] in PAYLOAD_FIELDS
+
+
+def split_update(update: dict) -> tuple[dict, Optional[dict]]:
+    """Separate an AssessmentUpdate into metadata and payload updates.
+
+    The metadata half keeps ``$inc`` and ``updated_at`` so every write still
+    bumps the revision, and bumps ``payload_revision`` when the payload
+    changes. The payload half is None when nothing in it changes.
+    """
+    metadata: dict = {"$set": {}, "$inc": {**update["$inc"]}}
+    payload: dict = {}
+    for operator in ("$set", "$unset"):
+        for key, value in update.get(operator, {}).items():
+            if is_payload_key(key):
+                payload.setdefault(operator, {})[key] = value
+            else:
+                metadata.setdefault(operator, {})[key] = value
+    if payload:
+        metadata["$inc"][PAYLOAD_REVISION] = 1
+    return metadata, payload or None
+
+
+def payload_revision(document: dict) -> int:
+    return document.get(PAYLOAD_REVISION) or 0
+
+
+def payload_filter(assessment_id: ObjectId, revision: int) -> dict:
+    """Matches the payload only while it is older than ``revision``."""
+    return {"_id": assessment_id, "revision": {"$not": {"$gte": revision}}}
+
+
+def stamped(update: dict, revision: int) -> dict:
+    """The payload half of a write, stamped with its ``payload_revision``."""
+    return {**update, "$set": {**update.get("$set", {}), "revision": revision}}
+
+
+def payload_document(document: dict) -> dict:
+    """The payload for an inline document, with lists keyed by metricId."""
+    return {
+        "_id": document["_id"],
+        **{
+            field: keyed_by_metric(document[field])
+            for field in PAYLOAD_FIELDS
+            if document.get(field) is not None
+        },
+    }
+
+
+def attach_payload(
+    document: dict, payload: Optional[dict], fields: Iterable[str] = PAYLOAD_FIELDS
+) -> dict:
+    """Fill ``fields`` on ``document`` from its payload, in place.
+
+    Payloads written before stamping have no revision and match metadata
+    that has none either.
+    """
+    if document.get(SPLIT_FLAG):
+        payload = payload or {}
+        if payload.get("revision", 0) != payload_revision(document):
+            raise StalePayload(document["_id"])
+        for field in fields:
+            document[field] = payload.get(field)
+    return document
+
+
+async def settle_payload(
+    db: AsyncIOMotorDatabase, assessment_id: ObjectId, revision: int
+) -> None:
+    """Accept the payload as current for ``revision`` without changing it.
+
+    For writes whose metadata landed but whose payload never will; a late
+    payload write for ``revision`` is then refused.
+    """
+    try:
+        await db.assessment_payloads.update_one(
+            payload_filter(assessment_id, revision),
+            {"$set": {"revision": revision}},
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        # It already has this revision or a newer one.
+        pass
+
+
+async def find_with_payload(
+    db: AsyncIOMotorDatabase,
+    query: dict,
+    projection: Optional[dict] = None,
+    fields: Iterable[str] = PAYLOAD_FIELDS,
+) -> Optional[dict]:
+    """The first document matching ``query``, with ``fields`` from its payload.
+
+    Both halves come back in one round trip. A payload that doesn't match
+    its metadata is read again while the write in between finishes, and
+    settled once that write is older than PAYLOAD_SETTLE_SECONDS; until
+    then StalePayload is raised.
+    """
+    fields = tuple(fields)
+    pipeline: list[dict] = [{"$match": query}, {"$limit": 1}]
+    if projection is not None:
+        pipeline.append(
+            {
+                "$project": {
+                    **projection,
+                    SPLIT_FLAG: 1,
+                    PAYLOAD_REVISION: 1,
+                    "updated_at": 1,
+                }
+            }
+        )
+    pipeline.append(
+        {
+            "$lookup": {
+                "from": "assessment_payloads",
+                "localField": "_id",
+                "foreignField": "_id",
+                "as": "payload",
+            }
+        }
+    )
+
+    async def read() -> Optional[dict]:
+        documents = await db.assessments.aggregate(pipeline).to_list(length=1)
+        return documents[0] if documents else None
+
+    for attempt in range(PAYLOAD_READ_ATTEMPTS):
+        document = await read()
+        if document is None:
+            return None
+        payload = next(iter(document.pop("payload")), None)
+        try:
+            return attach_payload(document, payload, fields)
+        except StalePayload:
+            await asyncio.sleep(0.05 * (attempt + 1))
+
+    settle_before = datetime.utcnow() - timedelta(seconds=PAYLOAD_SETTLE_SECONDS)
+    if (
+        payload_revision(document) > (payload or {}).get("revision", 0)
+        and (document.get("updated_at") or datetime.min) <= settle_before
+    ):
+        await settle_payload(db, document["_id"], payload_revision(document))
+        document = await read()
+        if document is not None:
+            payload = next(iter(document.pop("payload")), None)
+            return attach_payload(document, payload, fields)
+        return None
+    raise StalePayload(document["_id"])
+
+
+async def load_payloads(
+    db: AsyncIOMotorDatabase,
+    documents: list[dict],
+    fields: Iterable[str] = PAYLOAD_FIELDS,
+) -> list[dict]:
+    """Fill payload fields on a page of documents with one query.
+
+    Bulk readers (export, archive, rescoring) take payloads as stored,
+    without checking their revision.
+    """
+    fields = tuple(fields)
+    split = [document["_id"] for document in documents if document.get(SPLIT_FLAG)]
+    if not split:
+        return documents
+    payloads = {
+        payload["_id"]: payload
+        async for payload in db.assessment_payloads.find(
+            {"_id": {"$in": split}}, {field: 1 for field in fields}
+        )
+    }
+    for document in documents:
+        if document.get(SPLIT_FLAG):
+            payload = payloads.get(document["_id"], {})
+            for field in fields:
+                document[field] = payload.get(field)
+    return documents
+
+
+async def migrate_document(db: AsyncIOMotorDatabase, assessment_id: ObjectId) -> None:
+    """Move one document's inline payload out before it is written to."""
+    document = await db.assessments.find_one(
+        {"_id": assessment_id, **UNSPLIT}, PAYLOAD_PROJECTION
+    )
+    if document is None:
+        return
+    try:
+        await db.assessment_payloads.insert_one(payload_document(document))
+    except DuplicateKeyError:
+        # A concurrent migration already moved it; its copy may have newer writes.
+        pass
+    await db.assessments.update_one(
+        {"_id": assessment_id, **UNSPLIT},
+        {
+            "$set": {SPLIT_FLAG: True},
+            "$unset": {field: "" for field in PAYLOAD_FIELDS},
+        },
+    )
+
+
+async def migrate_all(db: AsyncIOMotorDatabase, batch_size: int = 500) -> int:
+    """Split every inline document, one bounded batch at a time.
+
+    Re-running resumes where it left off; each batch is one unordered
+    insert_many plus one bulk_write.
+    """
+    migrated = 0
+    while True:
+        documents = await db.assessments.find(UNSPLIT, PAYLOAD_PROJECTION).to_list(
+            length=batch_size
+        )
+        if not documents:
+            return migrated
+        try:
+            await db.assessment_payloads.insert_many(
+                [payload_document(document) for document in documents], ordered=False
+            )
+        except BulkWriteError as exc:
+            # Duplicates were moved lazily or by an interrupted run.
+            if any(error.get("code") != 11000 for error in exc.details["writeErrors"]):
+                raise
+        result = await db.assessments.bulk_write(
+            [
+                UpdateOne(
+                    {"_id": document["_id"], **UNSPLIT},
+                    {
+                        "$set": {SPLIT_FLAG: True},
+                        "$unset": {field: "" for field in PAYLOAD_FIELDS},
+                    },
+                )
+                for document in documents
+            ],
+            ordered=False,
+        )
+        migrated += result.modified_count
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    await connect_db()
+    try:
+        migrated = await migrate_all(get_db(), args.batch_size)
+        print(f"Moved payloads out of {migrated} assessments")
+    finally:
+        close_db()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """Concurrent reads of the same key share one in-flight database call.
+
+    The read runs in its own task, so a caller that disconnects and gets
+    cancelled doesn't cancel it for the others. Callers receive the same
+    document object and must treat it as read-only.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.leaders = 0
+        self.coalesced = 0
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, read: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            self.leaders += 1
+            task = asyncio.ensure_future(read())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception retrieved even if every caller went away.
+            task.exception()
+
+
+invite_reads = SingleFlight("invite")
+assessment_reads = SingleFlight("assessment")
+user_reads = SingleFlight("user")
+
+GROUPS = (invite_reads, assessment_reads, user_reads)
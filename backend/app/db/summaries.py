@@ -0,0 +1,284 @@
+"""Per-owner dashboard rollups kept in ``owner_summaries``.
+
+Writers pass the before/after state of an assessment to ``apply_change`` so
+the summary moves by the difference; reads are a single find_one by owner.
+Only completed assessments count towards the composite figures, matching
+what the dashboard shows. Drift from interrupted or out-of-band writes is
+corrected by rebuilding summaries with one aggregation, for everyone or for
+the given owners (the score recompute job does the latter itself):
+
+python -m app.db.summaries [--owner OWNER_ID ...]
+"""
+
+import argparse
+import asyncio
+from collections import Counter
+from datetime import datetime
+from typing import Iterable, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+from app.db.mongodb import close_db, connect_db, get_db
+
+STATUSES = ("active", "completed", "cancelled")
+OTHER_STATUS = "other"
+COMPOSITE_BINS = 10
+
+# Assessment fields a summary is computed from.
+SUMMARY_SOURCE_PROJECTION = {
+    "owner_id": 1,
+    "status": 1,
+    "progress.percent": 1,
+    "score_summary.composite_score": 1,
+}
+
+
+def status_key(status: Optional[str]) -> str:
+    status = status or "active"
+    return status if status in STATUSES else OTHER_STATUS
+
+
+def composite_bin(score: float) -> int:
+    return min(COMPOSITE_BINS - 1, max(0, int(score // (100 / COMPOSITE_BINS))))
+
+
+def contribution(document: Optional[dict]) -> Counter:
+    """What one assessment adds to its owner's summary counters."""
+    counts: Counter = Counter()
+    if document is None:
+        return counts
+    counts["total"] += 1
+    counts[f"status.{status_key(document.get('status'))}"] += 1
+    percent = (document.get("progress") or {}).get("percent")
+    if isinstance(percent, (int, float)):
+        counts["progress.sum"] += percent
+        counts["progress.count"] += 1
+    composite = (document.get("score_summary") or {}).get("composite_score")
+    # Recomputes also score unfinished assessments; only completed ones count.
+    if status_key(document.get("status")) == "completed" and isinstance(
+        composite, (int, float)
+    ):
+        counts["composite.sum"] += composite
+        counts["composite.count"] += 1
+        counts[f"composite.bins.{composite_bin(composite)}"] += 1
+    return counts
+
+
+def change_delta(before: Optional[dict], after: Optional[dict]) -> dict:
+    """$inc for moving an assessment from ``before`` to ``after``.
+
+    Either side may be None for inserts and removals.
+    """
+    delta = contribution(after)
+    delta.subtract(contribution(before))
+    return {key: value for key, value in delta.items() if value}
+
+
+def summary_update(delta: dict) -> dict:
+    return {"$inc": delta, "$set": {"updated_at": datetime.utcnow()}}
+
+
+async def apply_change(
+    db: AsyncIOMotorDatabase,
+    owner_id: str,
+    before: Optional[dict],
+    after: Optional[dict],
+) -> None:
+    delta = change_delta(before, after)
+    if delta:
+        await db.owner_summaries.update_one(
+            {"_id": owner_id}, summary_update(delta), upsert=True
+        )
+
+
+async def apply_changes(
+    db: AsyncIOMotorDatabase,
+    changes: Iterable[tuple[str, Optional[dict], Optional[dict]]],
+) -> None:
+    """Batch form of ``apply_change``: one upsert per owner in one bulk_write."""
+    per_owner: dict[str, Counter] = {}
+    for owner_id, before, after in changes:
+        per_owner.setdefault(owner_id, Counter()).update(change_delta(before, after))
+    operations = [
+        UpdateOne(
+            {"_id": owner_id},
+            summary_update({key: value for key, value in delta.items() if value}),
+            upsert=True,
+        )
+        for owner_id, delta in per_owner.items()
+        if any(delta.values())
+    ]
+    if operations:
+        await db.owner_summaries.bulk_write(operations, ordered=False)
+
+
+def applied(before: dict, update: dict) -> dict:
+    """The state ``update`` leaves behind, from the document it was applied to.
+
+    Only top-level $set fields matter to summaries, so this avoids a second
+    read to learn the after-image.
+    """
+    after = {**before}
+    for key, value in update.get("$set", {}).items():
+        if "." not in key:
+            after[key] = value
+    for key, value in update.get("$inc", {}).items():
+        after[key] = (after.get(key) or 0) + value
+    return after
+
+
+def summary_response(summary: Optional[dict]) -> dict:
+    summary = summary or {}
+    progress = summary.get("progress") or {}
+    composite = summary.get("composite") or {}
+    bins = composite.get("bins") or {}
+    statuses = summary.get("status") or {}
+    return {
+        "total": summary.get("total", 0),
+        "by_status": {
+            status: statuses.get(status, 0)
+            for status in (*STATUSES, OTHER_STATUS)
+            if status != OTHER_STATUS or statuses.get(status)
+        },
+        "average_percent": (
+            round(progress.get("sum", 0) / progress["count"], 1)
+            if progress.get("count")
+            else None
+        ),
+        "composite_count": composite.get("count", 0),
+        "composite_mean": (
+            round(composite.get("sum", 0) / composite["count"], 1)
+            if composite.get("count")
+            else None
+        ),
+        "composite_histogram": [
+            bins.get(str(index), 0) for index in range(COMPOSITE_BINS)
+        ],
+    }
+
+
+def rollup_stages(started: datetime, owner_ids: Optional[list[str]] = None) -> list:
+    """Aggregation stages producing one summary document per owner."""
+    status = {
+        "$switch": {
+            "branches": [
+                {"case": {"$eq": [{"$ifNull": ["$status", "active"]}, s]}, "then": s}
+                for s in STATUSES
+            ],
+            "default": OTHER_STATUS,
+        }
+    }
+    percent = "$progress.percent"
+    composite = "$score_summary.composite_score"
+    width = 100 / COMPOSITE_BINS
+    composite_bin_expr = {
+        "$min": [
+            COMPOSITE_BINS - 1,
+            {"$max": [0, {"$floor": {"$divide": [composite, width]}}]},
+        ]
+    }
+
+    def count_if(condition: dict) -> dict:
+        return {"$sum": {"$cond": [condition, 1, 0]}}
+
+    has_composite = {"$and": [{"$eq": [status, "completed"]}, {"$isNumber": composite}]}
+    group = {
+        "_id": "$owner_id",
+        "total": {"$sum": 1},
+        **{
+            f"status_{s}": count_if({"$eq": [status, s]})
+            for s in (*STATUSES, OTHER_STATUS)
+        },
+        "progress_sum": {"$sum": percent},
+        "progress_count": count_if({"$isNumber": percent}),
+        "composite_sum": {"$sum": {"$cond": [has_composite, composite, 0]}},
+        "composite_count": count_if(has_composite),
+        **{
+            f"bin_{index}": count_if(
+                {"$and": [has_composite, {"$eq": [composite_bin_expr, index]}]}
+            )
+            for index in range(COMPOSITE_BINS)
+        },
+    }
+    match = {"owner_id": {"$ne": None}}
+    if owner_ids is not None:
+        match = {"owner_id": {"$in": owner_ids}}
+    return [
+        {"$match": match},
+        {"$group": group},
+        {
+            "$project": {
+                "total": 1,
+                "status": {s: f"$status_{s}" for s in (*STATUSES, OTHER_STATUS)},
+                "progress": {"sum": "$progress_sum", "count": "$progress_count"},
+                "composite": {
+                    "sum": "$composite_sum",
+                    "count": "$composite_count",
+                    "bins": {
+                        str(index): f"$bin_{index}" for index in range(COMPOSITE_BINS)
+                    },
+                },
+                "updated_at": {"$literal": started},
+            }
+        },
+    ]
+
+
+def reconcile_pipeline(
+    started: datetime, owner_ids: Optional[list[str]] = None
+) -> list[dict]:
+    """Rebuild the owners' summaries from their assessments in one pass."""
+    return [
+        *rollup_stages(started, owner_ids),
+        {
+            "$merge": {
+                "into": "owner_summaries",
+                "on": "_id",
+                "whenMatched": "replace",
+                "whenNotMatched": "insert",
+            }
+        },
+    ]
+
+
+async def reconcile(
+    db: AsyncIOMotorDatabase, owner_ids: Optional[Iterable[str]] = None
+) -> int:
+    """Replace summaries with a fresh rollup, for everyone or ``owner_ids``.
+
+    Owners left without assessments lose their summary. Returns how many
+    summaries were rebuilt.
+    """
+    scope: dict = {}
+    if owner_ids is not None:
+        owner_ids = list(owner_ids)
+        if not owner_ids:
+            return 0
+        scope = {"_id": {"$in": owner_ids}}
+    started = datetime.utcnow()
+    await db.assessments.aggregate(reconcile_pipeline(started, owner_ids)).to_list(
+        length=None
+    )
+    # Summaries the $merge didn't touch belong to owners with no assessments.
+    await db.owner_summaries.delete_many({**scope, "updated_at": {"$lt": started}})
+    return await db.owner_summaries.count_documents(scope)
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    await connect_db()
+    try:
+        owners = await reconcile(get_db(), args.owner)
+        print(f"Rebuilt summaries for {owners} owners")
+    finally:
+        close_db()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--owner", action="append", default=None)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
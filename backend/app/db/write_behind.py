@@ -0,0 +1,322 @@
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Any, Optional
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from app.db.payloads import (
+    PAYLOAD_REVISION,
+    payload_filter,
+    payload_revision,
+    split_update,
+    stamped,
+)
+from app.db.summaries import SUMMARY_SOURCE_PROJECTION, applied, apply_changes
+from app.utils.invite_cache import invite_cache
+from app.utils.progress_feed import progress_broker, progress_event
+
+logger = logging.getLogger(__name__)
+
+WRITE_BEHIND_ENABLED = os.getenv("WRITE_BEHIND_ENABLED", "false").lower() == "true"
+WRITE_BEHIND_INTERVAL_MS = int(os.getenv("WRITE_BEHIND_INTERVAL_MS", "500"))
+WRITE_BEHIND_MAX_PENDING = int(os.getenv("WRITE_BEHIND_MAX_PENDING", "1000"))
+
+DUPLICATE_KEY = 11000
+
+
+class PendingWrite:
+    """Autosaves for one invite merged into a single $set/$unset.
+
+    Keys are top-level fields or ``field.metricId`` paths. The state is kept
+    free of overlapping paths so it can be sent as one update.
+    """
+
+    def __init__(self, assessment_id: ObjectId, owner_id: str):
+        self.assessment_id = assessment_id
+        self.owner_id = owner_id
+        self.sets: dict[str, Any] = {}
+        self.unsets: set[str] = set()
+        # Fields already checked not to hold a legacy list.
+        self.guarded: set[str] = set()
+        self.saves = 0
+
+    def _clear(self, key: str) -> None:
+        prefix = f"{key}."
+        for existing in [k for k in self.sets if k == key or k.startswith(prefix)]:
+            del self.sets[existing]
+        self.unsets = {k for k in self.unsets if not (k == key or k.startswith(prefix))}
+
+    def _apply(self, key: str, value: Any, remove: bool) -> None:
+        field, dot, child = key.partition(".")
+        if dot and field in self.sets:
+            # A pending whole-field save absorbs later per-metric deltas.
+            container = {k: v for k, v in self.sets[field].items() if k != child}
+            if not remove:
+                container[child] = value
+            self.sets[field] = container
+            return
+        self._clear(key)
+        if remove:
+            self.unsets.add(key)
+        else:
+            self.sets[key] = value
+
+    def merge(self, update: dict) -> bool:
+        """Fold an AssessmentUpdate into the pending state.
+
+        Returns False, leaving the state untouched, when the update can't be
+        merged (a delta against a pending non-map value).
+        """
+        for key in [*update.get("$unset", {}), *update["$set"]]:
+            field, dot, _ = key.partition(".")
+            if dot and field in self.sets and not isinstance(self.sets[field], dict):
+                return False
+        for key in update.get("$unset", {}):
+            self._apply(key, None, remove=True)
+        for key, value in update["$set"].items():
+            self._apply(key, value, remove=False)
+        self.saves += 1
+        return True
+
+    def to_update(self) -> dict:
+        update: dict = {"$set": self.sets, "$inc": {"revision": 1}}
+        if self.unsets:
+            update["$unset"] = {key: "" for key in self.unsets}
+        return update
+
+
+async def bulk_write(collection, operations: list) -> list[int]:
+    """Unordered bulk_write returning the indexes of upserts whose filter no
+    longer matched, which fail as duplicate keys.
+
+    Other per-document failures won't succeed on retry, so they are logged
+    and dropped; anything else propagates.
+    """
+    try:
+        await collection.bulk_write(operations, ordered=False)
+    except BulkWriteError as exc:
+        errors = exc.details["writeErrors"]
+        dropped = [error for error in errors if error["code"] != DUPLICATE_KEY]
+        if dropped:
+            logger.error(
+                "Dropped %d buffered invite saves on %s: %s",
+                len(dropped),
+                collection.name,
+                dropped[:3],
+            )
+        return [error["index"] for error in errors if error["code"] == DUPLICATE_KEY]
+    return []
+
+
+class WriteBehindBuffer:
+    """Opt-in coalescing of invite autosaves.
+
+    Saves are acknowledged once validated and buffered, and each flush writes
+    one update per invite plus one bulk_write of payloads. Completion and
+    revision-checked saves bypass the buffer after flushing the token. Saves
+    for an invite that was cancelled or expired meanwhile are dropped.
+    Buffers are per worker, so keep a respondent's saves on one worker
+    (keep-alive or sticky sessions) when running several.
+    """
+
+    def __init__(self, configured: bool, interval: float, max_pending: int):
+        self.configured = configured
+        self.interval = interval
+        self.max_pending = max_pending
+        self.accepted = 0
+        self.written = 0
+        self._pending: dict[str, PendingWrite] = {}
+        self._lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._db: Optional[AsyncIOMotorDatabase] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._task is not None
+
+    @property
+    def size(self) -> int:
+        return len(self._pending)
+
+    def get(self, token: str) -> Optional[PendingWrite]:
+        return self._pending.get(token)
+
+    def add(self, token: str, entry: PendingWrite, update: dict) -> bool:
+        """Buffer ``update`` for ``token``; False if the caller must flush first."""
+        pending = self._pending.setdefault(token, entry)
+        if not pending.merge(update):
+            return False
+        self.accepted += 1
+        if len(self._pending) >= self.max_pending:
+            self._wake.set()
+        return True
+
+    async def flush_token(self, token: str) -> None:
+        async with self._lock:
+            entry = self._pending.pop(token, None)
+            if entry is not None:
+                await self._write({token: entry})
+
+    async def flush(self) -> None:
+        async with self._lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, {}
+            await self._write(batch)
+
+    async def _write(self, batch: dict[str, PendingWrite]) -> None:
+        writable = {
+            "status": "active",
+            "invite_expires_at": {"$gte": datetime.utcnow()},
+        }
+        writes = {
+            token: split_update(entry.to_update()) for token, entry in batch.items()
+        }
+        # One conditional update per invite rather than a bulk_write, which
+        # can't say which of its updates matched: each before-image is then
+        # exactly what the update applied to, whoever else writes the invite.
+        results = await asyncio.gather(
+            *(
+                self._db.assessments.find_one_and_update(
+                    {"_id": entry.assessment_id, **writable},
+                    writes[token][0],
+                    projection={
+                        **SUMMARY_SOURCE_PROJECTION,
+                        "revision": 1,
+                        PAYLOAD_REVISION: 1,
+                    },
+                    return_document=ReturnDocument.BEFORE,
+                )
+                for token, entry in batch.items()
+            ),
+            return_exceptions=True,
+        )
+        before: dict[str, dict] = {}
+        failed: dict[str, PendingWrite] = {}
+        error: Optional[BaseException] = None
+        for (token, entry), result in zip(batch.items(), results):
+            if isinstance(result, BaseException):
+                failed[token] = entry
+                error = error or result
+            elif result is None:
+                logger.warning(
+                    "Dropped %d buffered saves for invite %s: no longer writable",
+                    entry.saves,
+                    token,
+                )
+            else:
+                before[token] = result
+        self.written += len(before)
+
+        # Payloads only follow metadata writes that landed, so a cancelled
+        # or expired invite never gets answers written. Each is stamped with
+        # the payload_revision its metadata write took.
+        payload_tokens = [token for token in before if writes[token][1] is not None]
+        payload_operations = []
+        for token in payload_tokens:
+            revision = payload_revision(before[token]) + 1
+            payload_operations.append(
+                UpdateOne(
+                    payload_filter(batch[token].assessment_id, revision),
+                    stamped(writes[token][1], revision),
+                    upsert=True,
+                )
+            )
+        if payload_operations:
+            try:
+                superseded = await bulk_write(
+                    self._db.assessment_payloads, payload_operations
+                )
+            except PyMongoError as exc:
+                failed.update((token, batch[token]) for token in payload_tokens)
+                error = error or exc
+            else:
+                # A write that passed the metadata gate after this flush got
+                # its payload in first; these saves go again on top of it.
+                for index in superseded:
+                    failed[payload_tokens[index]] = batch[payload_tokens[index]]
+
+        await apply_changes(
+            self._db,
+            (
+                (
+                    document["owner_id"],
+                    document,
+                    applied(document, {"$set": batch[token].sets}),
+                )
+                for token, document in before.items()
+                if document.get("owner_id")
+            ),
+        )
+
+        # After both writes, so a read that raced them can't cache a mix.
+        for token in batch:
+            await invite_cache.invalidate(token)
+        for token, document in before.items():
+            entry = batch[token]
+            if "progress" in entry.sets:
+                progress_broker.publish_local(
+                    entry.owner_id,
+                    progress_event(
+                        {
+                            "_id": entry.assessment_id,
+                            "status": "active",
+                            "progress": entry.sets["progress"],
+                            "revision": (document.get("revision") or 0) + 1,
+                        }
+                    ),
+                )
+        # Keep the saves that didn't land for the next flush, and let the
+        # caller see why if it failed.
+        self._requeue(failed)
+        if error is not None:
+            raise error
+
+    def _requeue(self, batch: dict[str, PendingWrite]) -> None:
+        for token, entry in batch.items():
+            newer = self._pending.get(token)
+            self._pending[token] = entry
+            if newer is not None and not entry.merge(newer.to_update()):
+                # Can't layer them; keep the newer saves rather than the older.
+                self._pending[token] = newer
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                # Shielded so stop() can't cancel a batch halfway through.
+                await asyncio.shield(self.flush())
+            except Exception:
+                logger.exception("Write-behind flush failed")
+
+    def start(self, db: AsyncIOMotorDatabase) -> None:
+        if self.configured:
+            self._db = db
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the flusher and write out whatever is still buffered."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await self.flush()
+
+
+write_behind = WriteBehindBuffer(
+    WRITE_BEHIND_ENABLED, WRITE_BEHIND_INTERVAL_MS / 1000, WRITE_BEHIND_MAX_PENDING
+)
@@ -4,31 +4,74 @@ import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.db.mongodb import connect_db, close_db
-from app.routes import auth, assessments, users
+from app.db.archive import start_archiver, stop_archiver
+from app.db.mongodb import connect_db, close_db, get_db
+from app.db.write_behind import write_behind
+from app.monitoring import MetricsMiddleware
+from app.monitoring.profiling import ProfilingMiddleware, profiling_enabled, sampler
+from app.routes import admin, auth, assessments, benchmarks, metrics, users
+from app.scoring import benchmark_registry
+from app.security import shutdown_password_pool
+from app.utils.compression import CompressionMiddleware
 from app.utils.cors import get_allowed_origins
+from app.utils.invite_cache import invite_cache
+from app.utils.progress_feed import progress_broker
+from app.utils.rate_limit import RATE_LIMIT_HEADERS, rate_limiter
+from app.utils.serialization import FastJSONResponse
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    connect_db()
+    benchmark_registry.load()
+    await connect_db()
+    archiver = start_archiver(get_db())
+    progress_broker.start(get_db())
+    write_behind.start(get_db())
+    if profiling_enabled():
+        sampler.start()
     yield
+    await write_behind.stop()
+    await stop_archiver(archiver)
+    await progress_broker.stop()
+    if profiling_enabled():
+        sampler.stop()
+    await invite_cache.close()
+    await rate_limiter.close()
     close_db()
+    shutdown_password_pool()
 
 
-app = FastAPI(title="AI Compass API", lifespan=lifespan)
+app = FastAPI(
+    title="AI Compass API",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
+)
 
+app.add_middleware(CompressionMiddleware)
+if profiling_enabled():
+    app.add_middleware(ProfilingMiddleware)
+app.add_middleware(MetricsMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=get_allowed_origins(),
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "ETag",
+        "X-Next-Cursor",
+        "X-Revision",
+        "Retry-After",
+        *RATE_LIMIT_HEADERS,
+    ],
 )
 
 app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(assessments.router)
+app.include_router(benchmarks.router)
+app.include_router(metrics.router)
+app.include_router(admin.router)
 
 
 @app.get("/")
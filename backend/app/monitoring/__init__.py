@@ -0,0 +1,5 @@
+from app.monitoring.metrics import registry
+from app.monitoring.middleware import MetricsMiddleware
+from app.monitoring.mongo import CommandMetrics
+
+__all__ = ["CommandMetrics", "MetricsMiddleware", "registry"]
@@ -0,0 +1,85 @@
+import time
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.monitoring.metrics import (
+    http_request_duration_seconds,
+    http_requests_in_flight,
+    http_requests_total,
+)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+def is_event_stream(start: Message) -> bool:
+    """Whether a response start opens a Server-Sent Events stream."""
+    content_type = Headers(raw=start["headers"]).get("content-type", "")
+    return content_type.startswith("text/event-stream")
+
+
+class RouteTemplates:
+    """Resolve a finished request's scope to its route template.
+
+    Requests are labelled by template (``/api/invite/{token}``), not the raw
+    path, so label cardinality stays bounded.
+    """
+
+    def __init__(self) -> None:
+        self._templates: Optional[dict] = None
+
+    def __call__(self, scope: Scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+        if self._templates is None:
+            self._templates = {
+                route.endpoint: route.path
+                for route in scope["app"].routes
+                if hasattr(route, "endpoint")
+            }
+        return self._templates.get(endpoint, UNMATCHED_ROUTE)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording per-route latency and status counts.
+
+    Event streams stay open for a whole dashboard session, so they leave
+    the in-flight gauge once they start and are kept out of the latency
+    histogram; they are still counted by status.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.route_template = RouteTemplates()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        streaming = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, streaming
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if is_event_stream(message):
+                    streaming = True
+                    http_requests_in_flight.dec()
+            await send(message)
+
+        http_requests_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            method = scope["method"]
+            route = self.route_template(scope)
+            if not streaming:
+                http_requests_in_flight.dec()
+                http_request_duration_seconds.observe(elapsed, method, route)
+            http_requests_total.inc(method, route, str(status_code))
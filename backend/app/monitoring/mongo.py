@@ -0,0 +1,31 @@
+from contextvars import ContextVar
+from typing import Optional
+
+from pymongo import monitoring
+
+from app.monitoring.metrics import mongodb_command_duration_seconds
+
+# Set per request by the profiling middleware; Motor copies the context into
+# its executor threads, so listener callbacks see the request's counter.
+command_counter: ContextVar[Optional[list[int]]] = ContextVar(
+    "command_counter", default=None
+)
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """Feeds MongoDB command round-trip times into the metrics registry."""
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        counter = command_counter.get()
+        if counter is not None:
+            counter[0] += 1
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        mongodb_command_duration_seconds.observe(
+            event.duration_micros / 1_000_000, event.command_name, "success"
+        )
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        mongodb_command_duration_seconds.observe(
+            event.duration_micros / 1_000_000, event.command_name, "failure"
+        )
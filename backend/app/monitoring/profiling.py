@@ -0,0 +1,238 @@
+import asyncio
+import inspect
+import json
+import logging
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, deque
+from pathlib import Path
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.monitoring.middleware import RouteTemplates, is_event_stream
+from app.monitoring.mongo import command_counter
+
+logger = logging.getLogger(__name__)
+
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_SLOW_MS = float(os.getenv("PROFILE_SLOW_MS", "0"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "200"))
+PROFILE_DIR = Path(
+    os.getenv("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "aicompass-profiles"))
+)
+# Longest request window the sampler can reconstruct.
+PROFILE_WINDOW_SECONDS = 60
+
+PROFILE_ID_PATTERN = re.compile(r"^[0-9]+-[0-9a-f]{8}$")
+
+
+def profiling_enabled() -> bool:
+    return PROFILE_SAMPLE_RATE > 0 or PROFILE_SLOW_MS > 0
+
+
+ASYNC_CODE_FLAGS = (
+    inspect.CO_COROUTINE | inspect.CO_ASYNC_GENERATOR | inspect.CO_ITERABLE_COROUTINE
+)
+
+
+def loop_frames(frame) -> frozenset:
+    """Code of the frames running the event loop, seen from a coroutine in it.
+
+    These are the plain frames below the outermost coroutine, e.g.
+    ``run_forever`` and ``_run_once`` for asyncio, or the ``asyncio.run``
+    caller for uvloop, whose loop has no Python frames of its own.
+    Handle._run is left out: it dispatches callbacks, which is work.
+    """
+    codes = set()
+    while frame is not None:
+        code = frame.f_code
+        if code.co_flags & ASYNC_CODE_FLAGS:
+            codes.clear()
+        elif not code.co_filename.endswith(os.path.join("asyncio", "events.py")):
+            codes.add(code)
+        frame = frame.f_back
+    return frozenset(codes)
+
+
+def collapse(frame, idle: frozenset = frozenset()) -> Optional[str]:
+    """Render a frame chain root-first in collapsed-stack (flamegraph) form.
+
+    Returns None when the loop is idle: waiting in the selector, or with
+    one of its own ``idle`` frames on top.
+    """
+    if frame.f_code in idle or frame.f_code.co_filename.endswith("selectors.py"):
+        return None
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(
+            f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+        )
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class StackSampler:
+    """Samples the event-loop thread's stack while requests are in flight.
+
+    A request's profile is the set of samples taken during its lifetime, so
+    it also contains work interleaved from concurrent requests on the loop.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.in_flight = 0
+        self._samples: deque[tuple[float, str]] = deque(
+            maxlen=int(PROFILE_WINDOW_SECONDS / interval)
+        )
+        self._thread_id: Optional[int] = None
+        self._idle: frozenset = frozenset()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start sampling the calling thread; call it from the running loop."""
+        self._thread_id = threading.get_ident()
+        self._idle = loop_frames(sys._getframe(1))
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="profile-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            if not self.in_flight:
+                continue
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+            stack = collapse(frame, self._idle)
+            if stack is not None:
+                self._samples.append((time.perf_counter(), stack))
+
+    def window(self, started: float, finished: float) -> Counter:
+        return Counter(
+            stack for at, stack in list(self._samples) if started <= at <= finished
+        )
+
+
+class ProfileStore:
+    """Collapsed-stack profiles on disk, shared by every worker on the host."""
+
+    def __init__(self, directory: Path, keep: int):
+        self.directory = directory
+        self.keep = keep
+
+    def save(self, meta: dict, stacks: Counter) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profile_id = meta["id"]
+        body = "".join(f"{stack} {count}\n" for stack, count in stacks.items())
+        (self.directory / f"{profile_id}.collapsed").write_text(body)
+        (self.directory / f"{profile_id}.json").write_text(json.dumps(meta))
+        self.prune()
+
+    def prune(self) -> None:
+        metas = sorted(self.directory.glob("*.json"), key=os.path.getmtime)
+        for path in metas[: max(0, len(metas) - self.keep)]:
+            path.unlink(missing_ok=True)
+            path.with_suffix(".collapsed").unlink(missing_ok=True)
+
+    def list(self, limit: int = 50) -> list[dict]:
+        if not self.directory.is_dir():
+            return []
+        metas = sorted(
+            self.directory.glob("*.json"), key=os.path.getmtime, reverse=True
+        )
+        results = []
+        for path in metas[:limit]:
+            try:
+                results.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                continue
+        return results
+
+    def path(self, profile_id: str) -> Optional[Path]:
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        path = self.directory / f"{profile_id}.collapsed"
+        return path if path.is_file() else None
+
+
+def log_save_failure(future: asyncio.Future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Saving a profile failed", exc_info=future.exception())
+
+
+sampler = StackSampler(PROFILE_INTERVAL_MS / 1000)
+store = ProfileStore(PROFILE_DIR, PROFILE_KEEP)
+
+
+class ProfilingMiddleware:
+    """Keeps profiles for a random share of requests and for slow ones.
+
+    Only installed when PROFILE_SAMPLE_RATE or PROFILE_SLOW_MS is set, so a
+    disabled profiler costs nothing per request. Event streams stop counting
+    as in flight once they start and are never profiled, or one open
+    dashboard would keep the sampler running forever.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.route_template = RouteTemplates()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        sampled = random.random() < PROFILE_SAMPLE_RATE
+        counter = [0]
+        streaming = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal streaming
+            if message["type"] == "http.response.start" and is_event_stream(message):
+                streaming = True
+                sampler.in_flight -= 1
+            await send(message)
+
+        context_token = command_counter.set(counter)
+        sampler.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            finished = time.perf_counter()
+            if not streaming:
+                sampler.in_flight -= 1
+            command_counter.reset(context_token)
+
+            elapsed_ms = (finished - started) * 1000
+            slow = PROFILE_SLOW_MS > 0 and elapsed_ms >= PROFILE_SLOW_MS
+            if (sampled or slow) and not streaming:
+                meta = {
+                    "id": f"{int(time.time() * 1000)}-{random.getrandbits(32):08x}",
+                    "method": scope["method"],
+                    "route": self.route_template(scope),
+                    "duration_ms": round(elapsed_ms, 2),
+                    "mongo_commands": counter[0],
+                    "reason": "slow" if slow else "sampled",
+                    "recorded_at": time.time(),
+                }
+                stacks = sampler.window(started, finished)
+                loop = asyncio.get_running_loop()
+                saving = loop.run_in_executor(None, store.save, meta, stacks)
+                saving.add_done_callback(log_save_failure)
@@ -1,12 +1,57 @@
 import os
 
-import uvicorn
+from gunicorn.app.base import BaseApplication
+from uvicorn.workers import UvicornWorker
+
+
+class ProductionWorker(UvicornWorker):
+    CONFIG_KWARGS = {
+        "loop": os.getenv("UVICORN_LOOP", "uvloop"),
+        "http": os.getenv("UVICORN_HTTP", "httptools"),
+        "timeout_graceful_shutdown": int(os.getenv("GRACEFUL_TIMEOUT", "30")),
+    }
+
+
+class ProductionServer(BaseApplication):
+    """Gunicorn master supervising uvicorn workers.
+
+    The app is imported in each worker after fork (no preload), so the Mongo
+    client, thread pools and caches are created per process.
+    """
+
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from app.main import app
+
+        return app
 
 
 def main() -> None:
     host = os.getenv("HOST", "0.0.0.0")
     port = int(os.getenv("PORT", "4001"))
-    uvicorn.run("app.main:app", host=host, port=port)
+    workers = int(os.getenv("WEB_CONCURRENCY") or os.cpu_count() or 1)
+    # Workers read it back to tell whether per-process state is shared.
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    options = {
+        "bind": f"{host}:{port}",
+        "workers": workers,
+        "worker_class": "app.prod.ProductionWorker",
+        "backlog": int(os.getenv("BACKLOG", "2048")),
+        "keepalive": int(os.getenv("KEEP_ALIVE", "5")),
+        "max_requests": int(os.getenv("MAX_REQUESTS", "10000")),
+        "max_requests_jitter": int(os.getenv("MAX_REQUESTS_JITTER", "1000")),
+        "graceful_timeout": int(os.getenv("GRACEFUL_TIMEOUT", "30")),
+        "timeout": int(os.getenv("WORKER_TIMEOUT", "60")),
+        "preload_app": False,
+    }
+    ProductionServer(options).run()
 
 
 if __name__ == "__main__":
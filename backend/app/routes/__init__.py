@@ -1,3 +1,3 @@
-from app.routes import auth, assessments, users
+from app.routes import admin, auth, assessments, benchmarks, metrics, users
 
-__all__ = ["auth", "assessments", "users"]
+__all__ = ["admin", "auth", "assessments", "benchmarks", "metrics", "users"]
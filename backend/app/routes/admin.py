@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse
+
+from app.monitoring.profiling import profiling_enabled, store
+from app.security import require_admin
+
+router = APIRouter(
+    prefix="/api/admin", tags=["admin"], dependencies=[Depends(require_admin)]
+)
+
+
+@router.get("/profiles")
+async def list_profiles(limit: int = Query(50, ge=1, le=500)):
+    return {"enabled": profiling_enabled(), "profiles": store.list(limit)}
+
+
+@router.get("/profiles/{profile_id}")
+async def download_profile(profile_id: str):
+    path = store.path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    return FileResponse(path, media_type="text/plain", filename=path.name)
@@ -1,52 +1,363 @@
+import csv
+import io
+import os
 from datetime import datetime, timedelta
+from typing import Optional, Union
 
 from bson import ObjectId
-from fastapi import APIRouter, Depends, HTTPException, status
-from pymongo.database import Database
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import ValidationError
+from pymongo import DESCENDING, ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 
 from app.db.mongodb import get_db
-from app.db.models import AssessmentDocument, ExecProfileDocument, AssessmentUpdate
+from app.db.payloads import (
+    PAYLOAD_REVISION,
+    SPLIT_FLAG,
+    StalePayload,
+    find_with_payload,
+    migrate_document,
+    payload_filter,
+    payload_revision,
+    settle_payload,
+    split_update,
+    stamped,
+)
+from app.db.singleflight import assessment_reads, invite_reads
+from app.db.summaries import apply_change, apply_changes, applied, summary_response
+from app.db.write_behind import PendingWrite, write_behind
+from app.db.models import (
+    AssessmentDocument,
+    ExecProfileDocument,
+    AssessmentUpdate,
+    keyed_by_metric,
+    metric_list,
+)
 from app.schemas.assessments import (
+    MAX_BULK_ITEMS,
+    AssessmentBulkCreate,
     AssessmentCreate,
     AssessmentResponse,
+    AssessmentsSummary,
     AssessmentUpdate as AssessmentUpdateSchema,
+    BulkCreateResponse,
+    BulkItemResult,
     InviteSnapshot,
     InviteUpdate,
 )
+from app.schemas.scoring import PeerComparison, ScoreSummary
+from app.scoring import (
+    DEFAULT_BENCHMARK_VERSION,
+    get_compiled_benchmark,
+    peer_percentiles,
+    record_completion,
+)
 from app.security import require_auth
+from app.utils import idempotency
+from app.utils.export import (
+    EXPORT_FORMATS,
+    EXPORT_PROJECTION,
+    parquet_available,
+    stream_csv,
+    stream_ndjson,
+    stream_parquet,
+)
+from app.utils.invite_cache import etag_matches, invite_cache, invite_etag
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_filter
+from app.utils.progress_feed import (
+    SSE_HEARTBEAT_SECONDS,
+    progress_broker,
+    progress_event,
+)
+from app.utils.rate_limit import INVITE_IP, INVITE_TOKEN, client_ip, rate_limiter
+from app.utils.serialization import FastJSONResponse, dumps
 from app.utils.tokens import generate_token
 
 router = APIRouter(prefix="/api", tags=["assessments"])
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+
+SCORING_PROJECTION = {"owner_id": 1, "selections": 1, "scores": 1, SPLIT_FLAG: 1}
+SCORING_FIELDS = ("selections", "scores")
+PEERS_PROJECTION = {
+    **SCORING_PROJECTION,
+    "company_industry": 1,
+    "company_size": 1,
+    "score_summary": 1,
+}
+
+# What the dashboard progress feed publishes after an invite write, plus
+# where the document's payload lives and which payload write it expects.
+PROGRESS_PROJECTION = {
+    "owner_id": 1,
+    "status": 1,
+    "progress": 1,
+    "revision": 1,
+    SPLIT_FLAG: 1,
+    PAYLOAD_REVISION: 1,
+}
+
+# Invite and owner writes read the document as it was before the update, so
+# the owner summary can move by the difference.
+SUMMARY_SOURCE = {**PROGRESS_PROJECTION, "score_summary.composite_score": 1}
+
+# Completing an invite scores it, so the write returns what scoring needs.
+COMPLETION_PROJECTION = {
+    **SUMMARY_SOURCE,
+    "selections": 1,
+    "scores": 1,
+    "company_industry": 1,
+    "company_size": 1,
+    "benchmark_version": 1,
+}
+
+# Whole-blob field -> keyed delta field on InviteUpdate.
+DELTA_FIELDS = (
+    ("selections", "selection_updates"),
+    ("scores", "score_updates"),
+    ("responses", "response_updates"),
+)
+
+# Fields needed to build an AssessmentResponse; keeps the response blobs off
+# the wire for list reads.
+SUMMARY_PROJECTION = {
+    "company_name": 1,
+    "company_industry": 1,
+    "company_size": 1,
+    "invite_token": 1,
+    "invite_expires_at": 1,
+    "status": 1,
+    "progress": 1,
+    "created_at": 1,
+}
+
+
+def assessment_summary(item: dict) -> dict:
+    """AssessmentResponse fields as a plain dict, ready for the fast encoder."""
+    return {
+        "id": str(item["_id"]),
+        "company_name": item["company_name"],
+        "company_industry": item.get("company_industry"),
+        "company_size": item.get("company_size"),
+        "invite_token": item["invite_token"],
+        "invite_expires_at": item["invite_expires_at"],
+        "status": item.get("status", "active"),
+        "progress": item.get("progress"),
+    }
+
+
+def invite_snapshot(assessment: dict) -> dict:
+    """InviteSnapshot fields as a plain dict.
+
+    Per-metric fields go back on the wire as the lists clients sent.
+    """
+    return {
+        "company_name": assessment["company_name"],
+        "company_industry": assessment.get("company_industry"),
+        "company_size": assessment.get("company_size"),
+        "exec_profile": assessment.get("exec_profile"),
+        "selections": metric_list(assessment.get("selections")),
+        "scores": metric_list(assessment.get("scores")),
+        "responses": metric_list(assessment.get("responses")),
+        "progress": assessment.get("progress"),
+        "status": assessment.get("status", "active"),
+        "revision": assessment.get("revision", 0),
+    }
+
+
+def invite_response(
+    etag: str, body: bytes, if_none_match: Optional[str], headers: dict
+) -> Response:
+    headers = {**headers, "ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def raise_invite_unavailable(db: AsyncIOMotorDatabase, token: str) -> None:
+    """Explain why a conditional invite write matched nothing."""
+    assessment = await db.assessments.find_one(
+        {"invite_token": token}, {"status": 1, "invite_expires_at": 1, "revision": 1}
+    )
+    if not assessment:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    if assessment.get("status") != "active":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Assessment cancelled"
+        )
+    if assessment.get("invite_expires_at") < datetime.utcnow():
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Invite expired"
+        )
+    # Status and expiry hold, so the revision check (or a concurrent write)
+    # is what failed.
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Revision conflict",
+        headers={"X-Revision": str(assessment.get("revision", 0))},
+    )
+
+
+def raise_full_save_required(assessment: dict) -> None:
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Full save required before delta updates",
+        headers={"X-Revision": str(assessment.get("revision", 0))},
+    )
+
+
+def raise_payload_unavailable() -> None:
+    raise HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Assessment is being saved",
+        headers={"Retry-After": "1"},
+    )
+
+
+async def write_payload(
+    db: AsyncIOMotorDatabase, token: str, assessment: dict, update: dict, guards: dict
+) -> None:
+    """Apply the payload half of an invite write after the metadata gate passed.
+
+    ``assessment`` is the metadata as the write left it; the payload is
+    stamped with its ``payload_revision``. ``guards`` keep per-metric deltas
+    off legacy list values.
+    """
+    revision = payload_revision(assessment)
+    if not assessment.get(SPLIT_FLAG):
+        await migrate_document(db, assessment["_id"])
+        assessment[SPLIT_FLAG] = True
+    try:
+        await db.assessment_payloads.update_one(
+            {**payload_filter(assessment["_id"], revision), **guards},
+            stamped(update, revision),
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        # The payload exists but didn't match, so the upsert tried to insert.
+        stored = await db.assessment_payloads.find_one(
+            {"_id": assessment["_id"]}, {"revision": 1}
+        )
+        if (stored or {}).get("revision", 0) >= revision:
+            # A write that passed the metadata gate after this one got its
+            # payload in first.
+            await raise_invite_unavailable(db, token)
+        # A guard failed: the metadata stands, the deltas don't.
+        await settle_payload(db, assessment["_id"], revision)
+        raise_full_save_required(assessment)
+
+
+async def check_delta_guards(
+    db: AsyncIOMotorDatabase, token: str, query: dict, guards: dict
+) -> dict:
+    """Read the writable invite and check its payload can take the deltas.
+
+    Inline documents are migrated first. Raises before anything is written,
+    so a 409 leaves the invite as it was.
+    """
+    assessment = await db.assessments.find_one(
+        query, {"owner_id": 1, "revision": 1, SPLIT_FLAG: 1}
+    )
+    if assessment is None:
+        await raise_invite_unavailable(db, token)
+    if not assessment.get(SPLIT_FLAG):
+        await migrate_document(db, assessment["_id"])
+    if guards and await db.assessment_payloads.find_one(
+        {
+            "_id": assessment["_id"],
+            "$or": [{field: {"$type": "array"}} for field in guards],
+        },
+        {"_id": 1},
+    ):
+        raise_full_save_required(assessment)
+    return assessment
+
+
+async def buffer_invite_save(
+    db: AsyncIOMotorDatabase,
+    token: str,
+    query: dict,
+    guards: dict,
+    update: AssessmentUpdate,
+) -> bool:
+    """Validate an autosave and hand it to the write-behind buffer.
+
+    Returns False when it has to be written directly instead.
+    """
+    entry = write_behind.get(token)
+    if entry is None or not guards.keys() <= entry.guarded:
+        assessment = await check_delta_guards(db, token, query, guards)
+        # Re-read: a flush may have taken the entry during the lookup.
+        entry = write_behind.get(token) or PendingWrite(
+            assessment["_id"], assessment["owner_id"]
+        )
+        entry.guarded |= guards.keys()
+    if write_behind.add(token, entry, update.to_update()):
+        return True
+    await write_behind.flush_token(token)
+    return False
+
 
 @router.get("/assessments", response_model=list[AssessmentResponse])
 async def list_assessments(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     user_id: str = Depends(require_auth),
-    db: Database = Depends(get_db),
+    db: AsyncIOMotorDatabase = Depends(get_db),
 ):
-    assessments = list(
-        db.assessments.find({"owner_id": user_id}).sort("created_at", -1)
-    )
-    return [
-        AssessmentResponse(
-            id=str(item["_id"]),
-            company_name=item["company_name"],
-            company_industry=item.get("company_industry"),
-            company_size=item.get("company_size"),
-            invite_token=item["invite_token"],
-            invite_expires_at=item["invite_expires_at"],
-            status=item.get("status", "active"),
-            progress=item.get("progress"),
-        )
-        for item in assessments
-    ]
+    """The caller's assessments, newest first.
+
+    Pages follow X-Next-Cursor once ``limit`` or ``cursor`` is given;
+    without either the whole list comes back, as older clients expect.
+    """
+    query: dict = {"owner_id": user_id}
+    if cursor is not None:
+        position = decode_cursor(cursor)
+        if position is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            )
+        query.update(keyset_filter(*position))
+
+    found = db.assessments.find(query, SUMMARY_PROJECTION).sort(
+        [("created_at", DESCENDING), ("_id", DESCENDING)]
+    )
+    if limit is None and cursor is None:
+        assessments = await found.to_list(length=None)
+        return FastJSONResponse([assessment_summary(item) for item in assessments])
+
+    limit = limit or DEFAULT_PAGE_SIZE
+    assessments = await found.limit(limit + 1).to_list(length=limit + 1)
+    headers = {}
+    if len(assessments) > limit:
+        assessments = assessments[:limit]
+        last = assessments[-1]
+        headers["X-Next-Cursor"] = encode_cursor(last["created_at"], last["_id"])
+
+    return FastJSONResponse(
+        [assessment_summary(item) for item in assessments], headers=headers
+    )
 
 
 @router.post("/assessments", response_model=AssessmentResponse)
 async def create_assessment(
     payload: AssessmentCreate,
     user_id: str = Depends(require_auth),
-    db: Database = Depends(get_db),
+    db: AsyncIOMotorDatabase = Depends(get_db),
 ):
     invite_token = generate_token()
     expires_at = datetime.utcnow() + timedelta(days=payload.invite_days)
@@ -59,7 +370,8 @@ async def create_assessment(
         company_industry=payload.company_industry,
         company_size=payload.company_size,
     )
-    result = db.assessments.insert_one(document)
+    result = await db.assessments.insert_one(document)
+    await apply_change(db, user_id, None, document)
 
     return AssessmentResponse(
         id=str(result.inserted_id),
@@ -73,43 +385,379 @@ async def create_assessment(
     )
 
 
+def new_documents(
+    user_id: str, items: list[Union[AssessmentCreate, str]]
+) -> list[Optional[dict]]:
+    """Documents for every valid item, None for rows that failed validation.
+
+    Ids are assigned up front so a retried plan inserts the same documents.
+    """
+    now = datetime.utcnow()
+    documents: list[Optional[dict]] = []
+    for item in items:
+        if isinstance(item, str):
+            documents.append(None)
+            continue
+        documents.append(
+            {
+                "_id": ObjectId(),
+                **AssessmentDocument.create(
+                    owner_id=user_id,
+                    company_name=item.company_name,
+                    invite_token=generate_token(),
+                    invite_expires_at=now + timedelta(days=item.invite_days),
+                    company_industry=item.company_industry,
+                    company_size=item.company_size,
+                ),
+            }
+        )
+    return documents
+
+
+async def insert_assessments(
+    db: AsyncIOMotorDatabase,
+    user_id: str,
+    items: list[Union[AssessmentCreate, str]],
+    documents: Optional[list[Optional[dict]]] = None,
+) -> BulkCreateResponse:
+    """Insert every valid item with one unordered insert_many.
+
+    ``items`` holds parsed payloads, or an error message for rows that
+    failed validation; the result reports each position separately.
+    ``documents`` replays a plan from ``new_documents``: rows an earlier
+    attempt already inserted count as created, not as duplicates.
+    """
+    if documents is None:
+        documents = new_documents(user_id, items)
+    results: list[Optional[BulkItemResult]] = [None] * len(items)
+    pending = [
+        (index, document)
+        for index, document in enumerate(documents)
+        if document is not None
+    ]
+
+    failures: dict[int, str] = {}
+    if pending:
+        try:
+            await db.assessments.insert_many(
+                [document for _, document in pending], ordered=False
+            )
+        except BulkWriteError as exc:
+            for error in exc.details.get("writeErrors", []):
+                failures[error["index"]] = (
+                    "Duplicate invite token"
+                    if error.get("code") == 11000
+                    else error.get("errmsg", "Write failed")
+                )
+        await apply_changes(
+            db,
+            (
+                (user_id, None, document)
+                for position, (_, document) in enumerate(pending)
+                if position not in failures
+            ),
+        )
+        if failures:
+            # Ids are unique to this plan, so any that exist were inserted by
+            # an earlier attempt at it.
+            failed = {pending[position][1]["_id"]: position for position in failures}
+            for existing in await db.assessments.distinct(
+                "_id", {"_id": {"$in": list(failed)}}
+            ):
+                failures.pop(failed[existing])
+
+    for index, item in enumerate(items):
+        if isinstance(item, str):
+            results[index] = BulkItemResult(index=index, ok=False, error=item)
+    for position, (index, document) in enumerate(pending):
+        if position in failures:
+            results[index] = BulkItemResult(
+                index=index, ok=False, error=failures[position]
+            )
+            continue
+        results[index] = BulkItemResult(
+            index=index,
+            ok=True,
+            assessment=AssessmentResponse(
+                id=str(document["_id"]),
+                company_name=document["company_name"],
+                company_industry=document["company_industry"],
+                company_size=document["company_size"],
+                invite_token=document["invite_token"],
+                invite_expires_at=document["invite_expires_at"],
+                status="active",
+                progress=None,
+            ),
+        )
+
+    created = sum(1 for result in results if result.ok)
+    return BulkCreateResponse(
+        created=created, failed=len(results) - created, results=results
+    )
+
+
+async def bulk_create(
+    db: AsyncIOMotorDatabase,
+    user_id: str,
+    idempotency_key: Optional[str],
+    items: list[Union[AssessmentCreate, str]],
+) -> BulkCreateResponse:
+    if idempotency_key is None:
+        return await insert_assessments(db, user_id, items)
+
+    key = idempotency.key_id("assessments-bulk", user_id, idempotency_key)
+    body_hash = idempotency.request_hash(
+        [item if isinstance(item, str) else item.model_dump() for item in items]
+    )
+    record = await idempotency.claim(db, key, body_hash)
+    if record["state"] == "done":
+        return BulkCreateResponse(**record["response"])
+    try:
+        documents = (record.get("plan") or {}).get("documents")
+        if documents is None:
+            documents = new_documents(user_id, items)
+            await idempotency.save_plan(db, key, {"documents": documents})
+        response = await insert_assessments(db, user_id, items, documents)
+    except BaseException:
+        # Also on cancellation; a crash is covered by the lease running out.
+        await idempotency.release(db, key)
+        raise
+    await idempotency.complete(db, key, response.model_dump(mode="json"))
+    return response
+
+
+def parse_assessment_csv(content: bytes) -> list[Union[AssessmentCreate, str]]:
+    """Parse rows with company_name, company_industry, company_size, invite_days."""
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="CSV must be UTF-8"
+        )
+
+    items: list[Union[AssessmentCreate, str]] = []
+    for row in csv.DictReader(io.StringIO(text)):
+        values = {key: value for key, value in row.items() if key and value}
+        try:
+            items.append(AssessmentCreate(**values))
+        except ValidationError as exc:
+            items.append("; ".join(error["msg"] for error in exc.errors()))
+    if not items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="CSV has no rows"
+        )
+    if len(items) > MAX_BULK_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BULK_ITEMS} rows per upload",
+        )
+    return items
+
+
+@router.post("/assessments/bulk", response_model=BulkCreateResponse)
+async def bulk_create_assessments(
+    payload: AssessmentBulkCreate,
+    idempotency_key: Optional[str] = Header(None),
+    user_id: str = Depends(require_auth),
+    db: AsyncIOMotorDatabase = Depends(get_db),
+):
+    return await bulk_create(db, user_id, idempotency_key, list(payload.items))
+
+
+@router.post("/assessments/bulk/csv", response_model=BulkCreateResponse)
+async def bulk_create_assessments_csv(
+    file: UploadFile,
+    idempotency_key: Optional[str] = Header(None),
+    user_id: str = Depends(require_auth),
+    db: AsyncIOMotorDatabase = Depends(get_db),
+):
+    items = parse_assessment_csv(await file.read())
+    return await bulk_create(db, user_id, idempotency_key, items)
+
+
+@router.get("/assessments/export")
+async def export_assessments(
+    format: str = Query("ndjson", pattern="^(ndjson|csv|parquet)$"),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    industry: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    user_id: str = Depends(require_auth),
+    db: AsyncIOMotorDatabase = Depends(get_db),
+):
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Parquet export requires pyarrow",
+        )
+
+    query: dict = {"owner_id": user_id}
+    if status_filter is not None:
+        query["status"] = status_filter
+    if industry is not None:
+        query["company_industry"] = industry
+    if created_from is not None or created_to is not None:
+        query["created_at"] = {}
+        if created_from is not None:
+            query["created_at"]["$gte"] = created_from
+        if created_to is not None:
+            query["created_at"]["$lt"] = created_to
+
+    cursor = (
+        db.assessments.find(query, EXPORT_PROJECTION)
+        .sort("created_at", DESCENDING)
+        .batch_size(EXPORT_BATCH_SIZE)
+    )
+    if format == "ndjson":
+        body = stream_ndjson(db, cursor, EXPORT_BATCH_SIZE)
+    elif format == "csv":
+        body = stream_csv(db, cursor, EXPORT_BATCH_SIZE, get_compiled_benchmark())
+    else:
+        body = stream_parquet(db, cursor, EXPORT_BATCH_SIZE, get_compiled_benchmark())
+
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="assessments.{format}"'},
+    )
+
+
+@router.get("/assessments/stream")
+async def stream_assessments(user_id: str = Depends(require_auth)):
+    """Server-sent progress/status events for the caller's assessments."""
+    if progress_broker.full:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many open streams",
+            headers={"Retry-After": "5"},
+        )
+
+    async def events():
+        subscription = progress_broker.subscribe(user_id)
+        try:
+            yield b"retry: 5000\n\n"
+            while True:
+                event = await subscription.get(SSE_HEARTBEAT_SECONDS)
+                if event is None:
+                    # Keeps proxies from idling the connection out.
+                    yield b": keepalive\n\n"
+                    continue
+                yield b"event: progress\ndata: " + dumps(event) + b"\n\n"
+        finally:
+            progress_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/assessments/summary", response_model=AssessmentsSummary)
+async def get_assessments_summary(
+    user_id: str = Depends(require_auth),
+    db: AsyncIOMotorDatabase = Depends(get_db),
+):
+    """Dashboard totals from the caller's precomputed summary document."""
+    summary = await db.owner_summaries.find_one({"_id": user_id})
+    return FastJSONResponse(summary_response(summary))
+
+
 @router.get("/assessments/{assessment_id}", response_model=AssessmentResponse)
 async def get_assessment(
     assessment_id: str,
     user_id: str = Depends(require_auth),
-    db: Database = Depends(get_db),
+    db: AsyncIOMotorDatabase = Depends(get_db),
 ):
-    assessment = db.assessments.find_one({"_id": ObjectId(assessment_id)})
+    object_id = ObjectId(assessment_id)
+    assessment = await assessment_reads.do(
+        object_id,
+        lambda: db.assessments.find_one(
+            {"_id": object_id}, {**SUMMARY_PROJECTION, "owner_id": 1}
+        ),
+    )
     if not assessment:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
     if assessment.get("owner_id") != user_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
 
-    return AssessmentResponse(
-        id=str(assessment["_id"]),
-        company_name=assessment["company_name"],
-        company_industry=assessment.get("company_industry"),
-        company_size=assessment.get("company_size"),
-        invite_token=assessment["invite_token"],
-        invite_expires_at=assessment["invite_expires_at"],
-        status=assessment.get("status", "active"),
-        progress=assessment.get("progress"),
-    )
+    return FastJSONResponse(assessment_summary(assessment))
 
 
-@router.patch("/assessments/{assessment_id}")
-async def update_assessment(
+@router.get("/assessments/{assessment_id}/scores", response_model=ScoreSummary)
+async def get_assessment_scores(
     assessment_id: str,
-    payload: AssessmentUpdateSchema,
+    version: str = DEFAULT_BENCHMARK_VERSION,
     user_id: str = Depends(require_auth),
-    db: Database = Depends(get_db),
+    db: AsyncIOMotorDatabase = Depends(get_db),
 ):
-    assessment = db.assessments.find_one({"_id": ObjectId(assessment_id)})
+    try:
+        benchmark = get_compiled_benchmark(version)
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Unknown benchmark"
+        )
+
+    try:
+        assessment = await find_with_payload(
+            db, {"_id": ObjectId(assessment_id)}, SCORING_PROJECTION, SCORING_FIELDS
+        )
+    except StalePayload:
+        raise_payload_unavailable()
+    if not assessment:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    if assessment.get("owner_id") != user_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+
+    return benchmark.score_documents([assessment])[0]
+
+
+@router.get("/assessments/{assessment_id}/peers", response_model=PeerComparison)
+async def get_assessment_peers(
+    assessment_id: str,
+    user_id: str = Depends(require_auth),
+    db: AsyncIOMotorDatabase = Depends(get_db),
+):
+    assessment = await db.assessments.find_one(
+        {"_id": ObjectId(assessment_id)}, PEERS_PROJECTION
+    )
     if not assessment:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
     if assessment.get("owner_id") != user_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
 
+    summary = assessment.get("score_summary")
+    if summary is None:
+        try:
+            assessment = await find_with_payload(
+                db, {"_id": assessment["_id"]}, PEERS_PROJECTION, SCORING_FIELDS
+            )
+        except StalePayload:
+            raise_payload_unavailable()
+        if not assessment:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Not found"
+            )
+        summary = get_compiled_benchmark().score_documents([assessment])[0]
+
+    industry = assessment.get("company_industry")
+    size = assessment.get("company_size")
+    ranks = await peer_percentiles(db, industry, size, summary)
+    return PeerComparison(
+        company_industry=industry,
+        company_size=size,
+        benchmark_version=summary["benchmark_version"],
+        ranks=[{"pillar_id": pillar, **rank} for pillar, rank in ranks.items()],
+    )
+
+
+@router.patch("/assessments/{assessment_id}")
+async def update_assessment(
+    assessment_id: str,
+    payload: AssessmentUpdateSchema,
+    user_id: str = Depends(require_auth),
+    db: AsyncIOMotorDatabase = Depends(get_db),
+):
     update = AssessmentUpdate({})
     if payload.status is not None:
         update.set("status", payload.status)
@@ -125,53 +773,92 @@ async def update_assessment(
             datetime.utcnow() + timedelta(days=payload.invite_days),
         )
 
-    db.assessments.update_one({"_id": assessment["_id"]}, update.to_update())
+    object_id = ObjectId(assessment_id)
+    changes = update.to_update()
+    before = await db.assessments.find_one_and_update(
+        {"_id": object_id, "owner_id": user_id},
+        changes,
+        projection={"invite_token": 1, **SUMMARY_SOURCE},
+        return_document=ReturnDocument.BEFORE,
+    )
+    if before is None:
+        exists = await db.assessments.find_one({"_id": object_id}, {"_id": 1})
+        if not exists:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Not found"
+            )
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    result = applied(before, changes)
+    await apply_change(db, user_id, before, result)
+    await invite_cache.invalidate(result["invite_token"])
+    if payload.status is not None:
+        progress_broker.publish_local(user_id, progress_event(result))
     return {"ok": True}
 
 
 @router.get("/invite/{token}", response_model=InviteSnapshot)
-async def get_invite(token: str, db: Database = Depends(get_db)):
-    assessment = db.assessments.find_one({"invite_token": token})
-    if not assessment:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
-    if assessment.get("status") != "active":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN, detail="Assessment cancelled"
-        )
-    if assessment.get("invite_expires_at") < datetime.utcnow():
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN, detail="Invite expired"
+async def get_invite(
+    token: str,
+    request: Request,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncIOMotorDatabase = Depends(get_db),
+):
+    limit_headers = await rate_limiter.enforce(
+        (INVITE_IP, client_ip(request)), (INVITE_TOKEN, token)
+    )
+    if write_behind.get(token) is not None:
+        # Read-your-writes for a respondent reloading mid-autosave.
+        await write_behind.flush_token(token)
+    cached = await invite_cache.get(token)
+    if cached is not None:
+        etag, body = cached
+        return invite_response(etag, body, if_none_match, limit_headers)
+
+    async def read_invite() -> tuple[int, Optional[dict]]:
+        # Taken before the read: a write landing meanwhile bumps it, and the
+        # snapshot read here is then not cached.
+        generation = await invite_cache.generation(token)
+        assessment = await find_with_payload(
+            db,
+            {
+                "invite_token": token,
+                "status": "active",
+                "invite_expires_at": {"$gte": datetime.utcnow()},
+            },
         )
+        return generation, assessment
+
+    try:
+        generation, assessment = await invite_reads.do(token, read_invite)
+    except StalePayload:
+        raise_payload_unavailable()
+    if not assessment:
+        await raise_invite_unavailable(db, token)
+
+    etag = invite_etag(assessment.get("revision", 0), assessment["updated_at"])
+    if etag_matches(if_none_match, etag):
+        return invite_response(etag, b"", if_none_match, limit_headers)
 
-    return InviteSnapshot(
-        company_name=assessment["company_name"],
-        company_industry=assessment.get("company_industry"),
-        company_size=assessment.get("company_size"),
-        exec_profile=assessment.get("exec_profile"),
-        selections=assessment.get("selections"),
-        scores=assessment.get("scores"),
-        responses=assessment.get("responses"),
-        progress=assessment.get("progress"),
-        status=assessment.get("status", "active"),
+    body = dumps(invite_snapshot(assessment))
+    await invite_cache.set(
+        token, generation, etag, body, assessment["invite_expires_at"]
     )
+    return invite_response(etag, body, if_none_match, limit_headers)
 
 
 @router.patch("/invite/{token}")
 async def update_invite(
-    token: str, payload: InviteUpdate, db: Database = Depends(get_db)
+    token: str,
+    payload: InviteUpdate,
+    request: Request,
+    response: Response,
+    db: AsyncIOMotorDatabase = Depends(get_db),
 ):
-    assessment = db.assessments.find_one({"invite_token": token})
-    if not assessment:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
-    if assessment.get("status") != "active":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN, detail="Assessment cancelled"
+    response.headers.update(
+        await rate_limiter.enforce(
+            (INVITE_IP, client_ip(request)), (INVITE_TOKEN, token)
         )
-    if assessment.get("invite_expires_at") < datetime.utcnow():
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN, detail="Invite expired"
-        )
-
+    )
     update = AssessmentUpdate({})
     if payload.status == "completed":
         update.set("status", "completed")
@@ -191,11 +878,17 @@ async def update_invite(
             ),
         )
     if payload.selections is not None:
-        update.set("selections", payload.selections)
+        update.set("selections", keyed_by_metric(payload.selections))
     if payload.scores is not None:
-        update.set("scores", payload.scores)
+        update.set("scores", keyed_by_metric(payload.scores))
     if payload.responses is not None:
-        update.set("responses", payload.responses)
+        update.set("responses", keyed_by_metric(payload.responses))
+    if any(
+        getattr(payload, field) is not None or getattr(payload, delta_field) is not None
+        for field, delta_field in DELTA_FIELDS
+    ):
+        # Answers were validated against this version; record which one.
+        update.set("benchmark_version", payload.benchmark_version)
     if payload.progress is not None:
         update.set(
             "progress",
@@ -207,5 +900,70 @@ async def update_invite(
             },
         )
 
-    db.assessments.update_one({"_id": assessment["_id"]}, update.to_update())
-    return {"ok": True}
+    query: dict = {
+        "invite_token": token,
+        "status": "active",
+        "invite_expires_at": {"$gte": datetime.utcnow()},
+    }
+    guards: dict = {}
+    for field, delta_field in DELTA_FIELDS:
+        delta = getattr(payload, delta_field)
+        if delta is None:
+            continue
+        if getattr(payload, field) is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Send either {field} or {delta_field}, not both",
+            )
+        update.set_keyed(field, delta)
+        guards[field] = {"$not": {"$type": "array"}}
+    if payload.revision is not None:
+        # Documents created before revisions were tracked have no field.
+        query["revision"] = (
+            {"$in": [0, None]} if payload.revision == 0 else payload.revision
+        )
+
+    completed = payload.status == "completed"
+    if write_behind.enabled:
+        if completed or payload.revision is not None:
+            await write_behind.flush_token(token)
+        elif await buffer_invite_save(db, token, query, guards, update):
+            return {"ok": True, "revision": None}
+
+    metadata_update, payload_update = split_update(update.to_update())
+    if payload_update is not None and guards:
+        await check_delta_guards(db, token, query, guards)
+    # Status, expiry and revision are checked on the small metadata document;
+    # the payload is only written once that conditional update succeeded.
+    # If it then fails, readers see the payload lag its metadata (see
+    # app.db.payloads) rather than a mix of two writes.
+    projection = COMPLETION_PROJECTION if completed else SUMMARY_SOURCE
+    before = await db.assessments.find_one_and_update(
+        query,
+        metadata_update,
+        projection={**projection, **{key: 1 for key in metadata_update["$set"]}},
+        return_document=ReturnDocument.BEFORE,
+    )
+    if before is None:
+        await raise_invite_unavailable(db, token)
+    result = applied(before, metadata_update)
+    if payload_update is not None:
+        await write_payload(db, token, result, payload_update, guards)
+    await apply_change(db, result["owner_id"], before, result)
+    # After both writes, so a read that raced them can't cache a mix.
+    await invite_cache.invalidate(token)
+    if completed or payload.progress is not None:
+        progress_broker.publish_local(result["owner_id"], progress_event(result))
+    if completed:
+        try:
+            scoring = await find_with_payload(
+                db, {"_id": result["_id"]}, SCORING_PROJECTION, SCORING_FIELDS
+            )
+        except StalePayload:
+            raise_payload_unavailable()
+        result.update({field: scoring.get(field) for field in SCORING_FIELDS})
+        scored = await record_completion(db, result)
+        await apply_change(
+            db, result["owner_id"], result, {**result, "score_summary": scored}
+        )
+    return {"ok": True, "revision": result["revision"]}
@@ -1,25 +1,67 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from pymongo.database import Database
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Request,
+    Response,
+    status,
+)
+from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from app.db.mongodb import get_db
 from app.db.models import UserDocument
 from app.schemas.auth import RegisterRequest, LoginRequest, AuthResponse, UserResponse
-from app.security import create_access_token, hash_password, verify_password
+from app.security import (
+    create_access_token,
+    hash_password,
+    needs_rehash,
+    verify_password,
+)
+from app.utils.rate_limit import (
+    LOGIN_EMAIL,
+    LOGIN_IP,
+    REGISTER_IP,
+    client_ip,
+    rate_limiter,
+)
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
 
+async def rehash_password(
+    db: AsyncIOMotorDatabase, user_id, password: str, old_hash: str
+) -> None:
+    try:
+        new_hash = await hash_password(password)
+    except HTTPException:
+        # Pool is saturated; the next successful login will retry.
+        return
+    # Same password under a new cost, so tokens and cached users stay valid.
+    await db.users.update_one(
+        {"_id": user_id, "password": old_hash}, {"$set": {"password": new_hash}}
+    )
+
+
 @router.post("/register", response_model=AuthResponse)
-async def register(body: RegisterRequest, db: Database = Depends(get_db)):
-    existing_user = db.users.find_one({"email": body.email})
+async def register(
+    body: RegisterRequest,
+    request: Request,
+    response: Response,
+    db: AsyncIOMotorDatabase = Depends(get_db),
+):
+    response.headers.update(
+        await rate_limiter.enforce((REGISTER_IP, client_ip(request)))
+    )
+    existing_user = await db.users.find_one({"email": body.email})
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
         )
 
-    hashed_password = hash_password(body.password)
+    hashed_password = await hash_password(body.password)
     user_doc = UserDocument.create(email=body.email, password=hashed_password)
-    result = db.users.insert_one(user_doc)
+    result = await db.users.insert_one(user_doc)
     user_id = str(result.inserted_id)
 
     token = create_access_token({"id": user_id, "email": body.email})
@@ -31,18 +73,34 @@ async def register(body: RegisterRequest, db: Database = Depends(get_db)):
 
 
 @router.post("/login", response_model=AuthResponse)
-async def login(body: LoginRequest, db: Database = Depends(get_db)):
-    user = db.users.find_one({"email": body.email})
+async def login(
+    body: LoginRequest,
+    request: Request,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    db: AsyncIOMotorDatabase = Depends(get_db),
+):
+    response.headers.update(
+        await rate_limiter.enforce(
+            (LOGIN_IP, client_ip(request)), (LOGIN_EMAIL, body.email.lower())
+        )
+    )
+    user = await db.users.find_one({"email": body.email})
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials"
         )
 
-    if not verify_password(body.password, user["password"]):
+    if not await verify_password(body.password, user["password"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials"
         )
 
+    if needs_rehash(user["password"]):
+        background_tasks.add_task(
+            rehash_password, db, user["_id"], body.password, user["password"]
+        )
+
     user_id = str(user["_id"])
     token = create_access_token({"id": user_id, "email": user["email"]})
 
@@ -0,0 +1,38 @@
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Response, status
+
+from app.scoring.registry import DEFAULT_BENCHMARK_VERSION, benchmark_registry
+from app.utils.invite_cache import etag_matches
+
+router = APIRouter(prefix="/api/benchmarks", tags=["benchmarks"])
+
+# Published versions never change; a new definition gets a new version.
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+@router.get("")
+async def list_benchmarks():
+    return {
+        "default": DEFAULT_BENCHMARK_VERSION,
+        "versions": [
+            {"version": benchmark.version, "name": benchmark.name}
+            for benchmark in benchmark_registry.versions.values()
+        ],
+    }
+
+
+@router.get("/{version}")
+async def get_benchmark(version: str, if_none_match: Optional[str] = Header(None)):
+    try:
+        benchmark = benchmark_registry.get(version)
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Unknown benchmark"
+        )
+    headers = {"ETag": benchmark.etag, "Cache-Control": IMMUTABLE}
+    if etag_matches(if_none_match, benchmark.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(
+        content=benchmark.body, media_type="application/json", headers=headers
+    )
@@ -0,0 +1,113 @@
+from fastapi import APIRouter, Depends, Response
+
+from app.db.singleflight import GROUPS
+from app.db.write_behind import write_behind
+from app.monitoring.metrics import CallbackCounter, CallbackGauge, registry
+from app.security import passwords, require_admin, token_cache
+from app.utils.invite_cache import invite_cache
+from app.utils.progress_feed import progress_broker
+
+router = APIRouter(tags=["metrics"])
+
+# Prometheus text exposition format.
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+registry.register(
+    CallbackCounter(
+        "cache_lookups_total",
+        "Cache hits and misses since process start.",
+        ("cache", "result"),
+        lambda: {
+            ("token_claims", "hit"): token_cache.hits,
+            ("token_claims", "miss"): token_cache.misses,
+            ("token_user", "hit"): token_cache.user_hits,
+            ("token_user", "miss"): token_cache.user_misses,
+            ("invite", "hit"): invite_cache.hits,
+            ("invite", "miss"): invite_cache.misses,
+        },
+    )
+)
+registry.register(
+    CallbackGauge(
+        "token_cache_entries",
+        "Verified tokens held in this worker's token cache.",
+        (),
+        lambda: {(): token_cache.stats()["size"]},
+    )
+)
+registry.register(
+    CallbackGauge(
+        "password_hash_pending",
+        "bcrypt operations queued or running in the worker pool.",
+        (),
+        lambda: {(): passwords.pending()},
+    )
+)
+
+registry.register(
+    CallbackGauge(
+        "sse_subscribers",
+        "Open dashboard progress streams on this worker.",
+        (),
+        lambda: {(): progress_broker.subscribers},
+    )
+)
+registry.register(
+    CallbackCounter(
+        "sse_events_total",
+        "Progress events published and dropped for slow subscribers.",
+        ("result",),
+        lambda: {
+            ("published",): progress_broker.published,
+            ("dropped",): progress_broker.dropped,
+        },
+    )
+)
+
+registry.register(
+    CallbackCounter(
+        "singleflight_calls_total",
+        "Document reads that ran (leader) or joined one in flight (coalesced).",
+        ("group", "result"),
+        lambda: {
+            key: value
+            for group in GROUPS
+            for key, value in (
+                ((group.name, "leader"), group.leaders),
+                ((group.name, "coalesced"), group.coalesced),
+            )
+        },
+    )
+)
+
+registry.register(
+    CallbackCounter(
+        "invite_write_behind_total",
+        "Invite autosaves buffered (accepted) and document updates sent (written).",
+        ("result",),
+        lambda: {
+            ("accepted",): write_behind.accepted,
+            ("written",): write_behind.written,
+        },
+    )
+)
+registry.register(
+    CallbackGauge(
+        "invite_write_behind_pending",
+        "Invites with buffered autosaves awaiting a flush.",
+        (),
+        lambda: {(): write_behind.size},
+    )
+)
+
+
+@router.get(
+    "/metrics",
+    response_class=Response,
+    include_in_schema=False,
+    dependencies=[Depends(require_admin)],
+)
+async def metrics():
+    # An explicit header, because Starlette appends its own charset to any
+    # text/* media_type even when one is already there.
+    return Response(registry.render(), headers={"Content-Type": METRICS_CONTENT_TYPE})
@@ -1,7 +1,10 @@
+import re
 from datetime import datetime
 from typing import Any, Optional
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator
+
+from app.scoring.registry import DEFAULT_BENCHMARK_VERSION, benchmark_registry
 
 
 class ExecProfile(BaseModel):
@@ -35,6 +38,36 @@ class AssessmentResponse(BaseModel):
     progress: Optional[Progress] = None
 
 
+MAX_BULK_ITEMS = 1000
+
+
+class AssessmentBulkCreate(BaseModel):
+    items: list[AssessmentCreate] = Field(min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    ok: bool
+    assessment: Optional[AssessmentResponse] = None
+    error: Optional[str] = None
+
+
+class BulkCreateResponse(BaseModel):
+    created: int
+    failed: int
+    results: list[BulkItemResult]
+
+
+class AssessmentsSummary(BaseModel):
+    total: int
+    by_status: dict[str, int]
+    average_percent: Optional[float] = None
+    composite_count: int
+    composite_mean: Optional[float] = None
+    # Completed assessments per 10-point composite band, lowest first.
+    composite_histogram: list[int]
+
+
 class AssessmentUpdate(BaseModel):
     status: Optional[str] = None
     invite_days: Optional[int] = None
@@ -53,6 +86,10 @@ class InviteSnapshot(BaseModel):
     responses: Optional[Any] = None
     progress: Optional[Progress] = None
     status: str
+    revision: int = 0
+
+
+METRIC_KEY_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
 
 
 class InviteUpdate(BaseModel):
@@ -65,3 +102,34 @@ class InviteUpdate(BaseModel):
     scores: Optional[Any] = None
     responses: Optional[Any] = None
     progress: Optional[Progress] = None
+    revision: Optional[int] = None
+    benchmark_version: str = DEFAULT_BENCHMARK_VERSION
+    selection_updates: Optional[dict[str, Any]] = None
+    score_updates: Optional[dict[str, Any]] = None
+    response_updates: Optional[dict[str, Any]] = None
+
+    @field_validator("selection_updates", "score_updates", "response_updates")
+    @classmethod
+    def check_metric_keys(
+        cls, value: Optional[dict[str, Any]]
+    ) -> Optional[dict[str, Any]]:
+        if value is not None:
+            for key in value:
+                if not METRIC_KEY_PATTERN.match(key):
+                    raise ValueError(f"Invalid metric id: {key!r}")
+        return value
+
+    @model_validator(mode="after")
+    def check_against_benchmark(self) -> "InviteUpdate":
+        try:
+            benchmark = benchmark_registry.get(self.benchmark_version)
+        except KeyError:
+            raise ValueError(f"Unknown benchmark version: {self.benchmark_version}")
+        for field in ("selections", "scores", "responses"):
+            value = getattr(self, field)
+            if value is not None:
+                benchmark.check_entries(field, value)
+            updates = getattr(self, f"{field.removesuffix('s')}_updates")
+            if updates is not None:
+                benchmark.check_updates(field, updates)
+        return self
@@ -0,0 +1,30 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class PillarScore(BaseModel):
+    pillar_id: str
+    pillar_name: str
+    score: float
+
+
+class ScoreSummary(BaseModel):
+    benchmark_version: str
+    composite_score: float
+    maturity_band: str
+    pillar_scores: list[PillarScore]
+
+
+class PeerRank(BaseModel):
+    pillar_id: str
+    score: float
+    peers: int
+    percentile: Optional[float] = None
+
+
+class PeerComparison(BaseModel):
+    company_industry: Optional[str] = None
+    company_size: Optional[str] = None
+    benchmark_version: str
+    ranks: list[PeerRank]
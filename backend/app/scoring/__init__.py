@@ -0,0 +1,17 @@
+from app.scoring.engine import (
+    DEFAULT_BENCHMARK_VERSION,
+    CompiledBenchmark,
+    get_compiled_benchmark,
+)
+from app.scoring.peers import peer_percentiles, record_completion
+from app.scoring.registry import BenchmarkDefinition, benchmark_registry
+
+__all__ = [
+    "DEFAULT_BENCHMARK_VERSION",
+    "BenchmarkDefinition",
+    "CompiledBenchmark",
+    "benchmark_registry",
+    "get_compiled_benchmark",
+    "peer_percentiles",
+    "record_completion",
+]
@@ -0,0 +1,160 @@
+from functools import lru_cache
+from typing import Any, Iterable
+
+import numpy as np
+
+from app.scoring.registry import DEFAULT_BENCHMARK_VERSION, benchmark_registry
+
+BAND_THRESHOLDS = (80, 60, 40)
+BAND_NAMES = ("Leading", "Scaling", "Developing", "Emerging")
+
+
+def metric_map(value: Any) -> dict:
+    """Per-metric entries keyed by metricId, from either stored form."""
+    if isinstance(value, dict):
+        return value
+    if isinstance(value, list):
+        return {
+            item["metricId"]: item
+            for item in value
+            if isinstance(item, dict) and "metricId" in item
+        }
+    return {}
+
+
+def score_value(item: Any) -> float:
+    value = item.get("score") if isinstance(item, dict) else None
+    return value if isinstance(value, (int, float)) else 0.0
+
+
+def is_selected(item: Any) -> bool:
+    return isinstance(item, dict) and bool(item.get("selected"))
+
+
+def entries(value: Any) -> Iterable[Any]:
+    """Iterate per-metric entries whether stored keyed by metricId or as a list."""
+    if isinstance(value, dict):
+        return value.values()
+    if isinstance(value, list):
+        return value
+    return ()
+
+
+class CompiledBenchmark:
+    """A benchmark definition flattened into dense arrays for batch scoring.
+
+    Mirrors ``calculateScores`` in the frontend: pillar scores are the
+    weight-normalised mean of selected metric scores (1-5) scaled to 0-100,
+    and the composite is the weight-normalised mean of non-zero pillars.
+    """
+
+    def __init__(self, definition: dict):
+        self.version: str = definition["version"]
+        pillars = definition["pillars"]
+        self.pillar_ids = [pillar["id"] for pillar in pillars]
+        self.pillar_names = [pillar["name"] for pillar in pillars]
+        self.pillar_weights = np.array(
+            [pillar.get("weight", 1) for pillar in pillars], dtype=np.float64
+        )
+
+        metric_ids: list[str] = []
+        metric_weights: list[float] = []
+        metric_pillars: list[int] = []
+        for pillar_index, pillar in enumerate(pillars):
+            for metric in pillar["metrics"]:
+                metric_ids.append(metric["id"])
+                metric_weights.append(metric["weight"])
+                metric_pillars.append(pillar_index)
+
+        self.metric_ids = metric_ids
+        self.metric_index = {metric_id: i for i, metric_id in enumerate(metric_ids)}
+        self.metric_weights = np.array(metric_weights, dtype=np.float64)
+        self.membership = np.zeros((len(metric_ids), len(pillars)), dtype=np.float64)
+        self.membership[np.arange(len(metric_ids)), metric_pillars] = 1.0
+
+    def encode(self, documents: list[dict]) -> tuple[np.ndarray, np.ndarray]:
+        """Build (scores, selected) matrices of shape (documents, metrics).
+
+        Filled a metric column at a time: stored answers are already keyed
+        by metricId, so each column is one lookup per document.
+        """
+        rows = len(documents)
+        scores = np.zeros((rows, len(self.metric_ids)), dtype=np.float64)
+        selected = np.zeros((rows, len(self.metric_ids)), dtype=bool)
+        score_maps = [metric_map(document.get("scores")) for document in documents]
+        selection_maps = [
+            metric_map(document.get("selections")) for document in documents
+        ]
+
+        for column, metric_id in enumerate(self.metric_ids):
+            scores[:, column] = np.fromiter(
+                (score_value(answers.get(metric_id)) for answers in score_maps),
+                dtype=np.float64,
+                count=rows,
+            )
+            selected[:, column] = np.fromiter(
+                (is_selected(answers.get(metric_id)) for answers in selection_maps),
+                dtype=bool,
+                count=rows,
+            )
+
+        return scores, selected
+
+    def score_matrix(
+        self, scores: np.ndarray, selected: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return (pillar scores, composite scores) for every row at once."""
+        weights = selected * self.metric_weights
+        pillar_totals = weights @ self.membership
+        pillar_sums = (weights * scores) @ self.membership
+        pillar_scores = np.divide(
+            pillar_sums * 20,
+            pillar_totals,
+            out=np.zeros_like(pillar_sums),
+            where=pillar_totals > 0,
+        )
+
+        pillar_weights = (pillar_scores > 0) * self.pillar_weights
+        composite_totals = pillar_weights.sum(axis=1)
+        composite = np.divide(
+            (pillar_weights * pillar_scores).sum(axis=1),
+            composite_totals,
+            out=np.zeros(len(pillar_scores)),
+            where=composite_totals > 0,
+        )
+        return pillar_scores, composite
+
+    @staticmethod
+    def bands(composite: np.ndarray) -> np.ndarray:
+        conditions = [composite >= threshold for threshold in BAND_THRESHOLDS]
+        return np.select(conditions, BAND_NAMES[:-1], default=BAND_NAMES[-1])
+
+    def summarize(self, pillar_scores: np.ndarray, composite: np.ndarray) -> list[dict]:
+        bands = self.bands(composite)
+        return [
+            {
+                "benchmark_version": self.version,
+                "composite_score": float(composite[row]),
+                "maturity_band": str(bands[row]),
+                "pillar_scores": [
+                    {
+                        "pillar_id": self.pillar_ids[column],
+                        "pillar_name": self.pillar_names[column],
+                        "score": float(pillar_scores[row, column]),
+                    }
+                    for column in np.flatnonzero(pillar_scores[row] > 0)
+                ],
+            }
+            for row in range(len(composite))
+        ]
+
+    def score_documents(self, documents: list[dict]) -> list[dict]:
+        pillar_scores, composite = self.score_matrix(*self.encode(documents))
+        return self.summarize(pillar_scores, composite)
+
+
+@lru_cache(maxsize=None)
+def get_compiled_benchmark(
+    version: str = DEFAULT_BENCHMARK_VERSION,
+) -> CompiledBenchmark:
+    return CompiledBenchmark(benchmark_registry.get(version).definition)
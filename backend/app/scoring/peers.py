@@ -0,0 +1,204 @@
+"""Peer score histograms per benchmark version, industry, size and pillar.
+
+Each completed assessment records which bins it was counted in
+(``peer_points``), so completing it again, or rescoring it, moves its
+counts instead of adding them twice. Histograms can be rebuilt from the
+stored score summaries:
+
+python -m app.scoring.peers --rebuild
+"""
+
+import argparse
+import asyncio
+from collections import Counter
+from datetime import datetime
+from typing import Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument, UpdateOne
+
+from app.db.mongodb import close_db, connect_db, get_db
+from app.scoring.engine import DEFAULT_BENCHMARK_VERSION, get_compiled_benchmark
+
+HISTOGRAM_BINS = 101
+COMPOSITE_KEY = "composite"
+UNKNOWN = "unknown"
+
+
+def bucket_id(
+    version: str, industry: Optional[str], size: Optional[str], pillar: str
+) -> dict:
+    # A document _id rather than a joined string, so free-text industry and
+    # size values can't collide.
+    return {
+        "version": version,
+        "industry": industry or UNKNOWN,
+        "size": size or UNKNOWN,
+        "pillar": pillar,
+    }
+
+
+def score_bin(score: float) -> int:
+    return min(HISTOGRAM_BINS - 1, max(0, int(round(score))))
+
+
+def percentile_rank(counts: list[int], total: int, score: float) -> Optional[float]:
+    """Share of peers scoring below ``score``, counting ties as half."""
+    if total <= 0:
+        return None
+    index = score_bin(score)
+    below = sum(counts[:index])
+    return (below + counts[index] / 2) / total * 100
+
+
+def summary_points(summary: dict) -> dict[str, float]:
+    points = {
+        pillar["pillar_id"]: pillar["score"] for pillar in summary["pillar_scores"]
+    }
+    points[COMPOSITE_KEY] = summary["composite_score"]
+    return points
+
+
+def peer_points(assessment: dict, summary: dict) -> dict:
+    """The histogram bins ``summary`` is counted in, stored on the assessment."""
+    return {
+        "version": summary["benchmark_version"],
+        "industry": assessment.get("company_industry"),
+        "size": assessment.get("company_size"),
+        "bins": {
+            pillar: score_bin(score)
+            for pillar, score in summary_points(summary).items()
+        },
+    }
+
+
+def histogram_moves(
+    changes: list[tuple[Optional[dict], Optional[dict]]],
+) -> list[UpdateOne]:
+    """Net bucket updates for moving assessments from old to new peer points."""
+    deltas: Counter = Counter()
+    for previous, current in changes:
+        for points, step in ((previous, -1), (current, 1)):
+            if not points:
+                continue
+            for pillar, index in points["bins"].items():
+                key = (points["version"], points["industry"], points["size"], pillar)
+                deltas[(key, index)] += step
+
+    buckets: dict[tuple, dict] = {}
+    for (key, index), delta in deltas.items():
+        if delta:
+            update = buckets.setdefault(key, {"total": 0})
+            update[f"counts.{index}"] = delta
+            update["total"] += delta
+    return [
+        UpdateOne({"_id": bucket_id(*key)}, {"$inc": update}, upsert=True)
+        for key, update in buckets.items()
+    ]
+
+
+async def record_completion(db: AsyncIOMotorDatabase, assessment: dict) -> dict:
+    """Score a just-completed assessment and count it in its peer histograms.
+
+    ``assessment`` needs ``_id``, ``selections``, ``scores``,
+    ``company_industry`` and ``company_size``; it is scored against its
+    ``benchmark_version`` when it has one. An assessment completed before
+    has its earlier counts replaced.
+    """
+    benchmark = get_compiled_benchmark(
+        assessment.get("benchmark_version") or DEFAULT_BENCHMARK_VERSION
+    )
+    summary = benchmark.score_documents([assessment])[0]
+    points = peer_points(assessment, summary)
+    # Swapping the points atomically means concurrent completions each undo
+    # exactly what the one before them counted.
+    previous = await db.assessments.find_one_and_update(
+        {"_id": assessment["_id"]},
+        {
+            "$set": {
+                "score_summary": {**summary, "computed_at": datetime.utcnow()},
+                "peer_points": points,
+            }
+        },
+        projection={"peer_points": 1},
+        return_document=ReturnDocument.BEFORE,
+    )
+    operations = histogram_moves([((previous or {}).get("peer_points"), points)])
+    if operations:
+        await db.peer_histograms.bulk_write(operations, ordered=False)
+    return summary
+
+
+async def peer_percentiles(
+    db: AsyncIOMotorDatabase,
+    industry: Optional[str],
+    size: Optional[str],
+    summary: dict,
+) -> dict[str, dict]:
+    points = summary_points(summary)
+    version = summary["benchmark_version"]
+    buckets = await db.peer_histograms.find(
+        {"_id": {"$in": [bucket_id(version, industry, size, p) for p in points]}}
+    ).to_list(length=len(points))
+    by_pillar = {bucket["_id"]["pillar"]: bucket for bucket in buckets}
+
+    results = {}
+    for pillar, score in points.items():
+        bucket = by_pillar.get(pillar, {})
+        counts = bucket.get("counts", {})
+        total = bucket.get("total", 0)
+        dense = [counts.get(str(index), 0) for index in range(HISTOGRAM_BINS)]
+        results[pillar] = {
+            "score": score,
+            "peers": total,
+            "percentile": percentile_rank(dense, total, score),
+        }
+    return results
+
+
+async def rebuild_histograms(db: AsyncIOMotorDatabase, batch_size: int = 1000) -> int:
+    """Recount every completed, scored assessment from its stored summary."""
+    await db.peer_histograms.delete_many({})
+    cursor = db.assessments.find(
+        {"status": "completed", "score_summary": {"$exists": True}},
+        {"company_industry": 1, "company_size": 1, "score_summary": 1},
+    ).batch_size(batch_size)
+    counted = 0
+    while True:
+        documents = await cursor.to_list(length=batch_size)
+        if not documents:
+            return counted
+        points = [
+            peer_points(document, document["score_summary"]) for document in documents
+        ]
+        await db.assessments.bulk_write(
+            [
+                UpdateOne({"_id": document["_id"]}, {"$set": {"peer_points": point}})
+                for document, point in zip(documents, points)
+            ],
+            ordered=False,
+        )
+        await db.peer_histograms.bulk_write(
+            histogram_moves([(None, point) for point in points]), ordered=False
+        )
+        counted += len(documents)
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    await connect_db()
+    try:
+        counted = await rebuild_histograms(get_db(), args.batch_size)
+        print(f"Counted {counted} assessments into peer histograms")
+    finally:
+        close_db()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rebuild", action="store_true", required=True)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Recompute completed assessments' score summaries after a benchmark change.
+
+Rescored assessments move their peer histogram counts with them, and the
+owner dashboard summaries of the affected owners are rebuilt afterwards.
+
+python -m app.scoring.recompute --version 0.2 --batch-size 1000
+"""
+
+import argparse
+import asyncio
+from datetime import datetime
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+from app.db.mongodb import close_db, connect_db, get_db
+from app.db.payloads import SPLIT_FLAG, load_payloads
+from app.db.summaries import reconcile
+from app.scoring.engine import DEFAULT_BENCHMARK_VERSION, get_compiled_benchmark
+from app.scoring.peers import histogram_moves, peer_points
+
+SCORING_PROJECTION = {
+    "owner_id": 1,
+    "company_industry": 1,
+    "company_size": 1,
+    "peer_points": 1,
+    "selections": 1,
+    "scores": 1,
+    SPLIT_FLAG: 1,
+}
+
+
+async def recompute_all(
+    db: AsyncIOMotorDatabase,
+    version: str = DEFAULT_BENCHMARK_VERSION,
+    batch_size: int = 1000,
+) -> int:
+    """Score every completed assessment not yet scored under ``version``.
+
+    Each batch is scored in one vectorised pass and written back with a
+    single unordered bulk_write. Re-running resumes where it left off.
+    """
+    benchmark = get_compiled_benchmark(version)
+    cursor = db.assessments.find(
+        {"status": "completed", "score_summary.benchmark_version": {"$ne": version}},
+        SCORING_PROJECTION,
+    ).batch_size(batch_size)
+
+    updated = 0
+    owners: set[str] = set()
+    while True:
+        documents = await cursor.to_list(length=batch_size)
+        if not documents:
+            break
+
+        await load_payloads(db, documents, ("selections", "scores"))
+        computed_at = datetime.utcnow()
+        summaries = benchmark.score_documents(documents)
+        points = [
+            peer_points(document, summary)
+            for document, summary in zip(documents, summaries)
+        ]
+        await db.assessments.bulk_write(
+            [
+                UpdateOne(
+                    {"_id": document["_id"]},
+                    {
+                        "$set": {
+                            "score_summary": {**summary, "computed_at": computed_at},
+                            "peer_points": point,
+                        }
+                    },
+                )
+                for document, summary, point in zip(documents, summaries, points)
+            ],
+            ordered=False,
+        )
+        moves = histogram_moves(
+            [
+                (document.get("peer_points"), point)
+                for document, point in zip(documents, points)
+            ]
+        )
+        if moves:
+            await db.peer_histograms.bulk_write(moves, ordered=False)
+        updated += len(documents)
+        owners.update(
+            document["owner_id"] for document in documents if document.get("owner_id")
+        )
+
+    # Composites moved under the summaries; rebuild them rather than diffing.
+    await reconcile(db, owners)
+    return updated
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    await connect_db()
+    try:
+        updated = await recompute_all(get_db(), args.version, args.batch_size)
+        print(f"Recomputed {updated} assessments for benchmark {args.version}")
+    finally:
+        close_db()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--version", default=DEFAULT_BENCHMARK_VERSION)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from app.utils.serialization import dumps
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent.parent / "data" / "benchmarks"
+DEFAULT_BENCHMARK_VERSION = "0.2"
+
+
+@dataclass(frozen=True, slots=True)
+class MetricSpec:
+    """What an answer for one metric may contain."""
+
+    id: str
+    pillar_id: str
+    weight: float
+    # Ratings run 1..levels, one label per level.
+    levels: int
+    questions: int
+
+
+class BenchmarkDefinition:
+    """One published benchmark version with its per-metric lookup table.
+
+    Versions are immutable once published, so the serialized body and its
+    ETag are computed once and served as-is.
+    """
+
+    def __init__(self, definition: dict):
+        self.version: str = definition["version"]
+        self.name: str = definition.get("name", "")
+        self.definition = definition
+        self.metrics: dict[str, MetricSpec] = {
+            metric["id"]: MetricSpec(
+                id=metric["id"],
+                pillar_id=pillar["id"],
+                weight=metric["weight"],
+                levels=len(metric["labels"]),
+                questions=len(metric["questions"]),
+            )
+            for pillar in definition["pillars"]
+            for metric in pillar["metrics"]
+        }
+        self.body = dumps(definition)
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+
+    def metric(self, metric_id: Any) -> MetricSpec:
+        spec = self.metrics.get(metric_id) if isinstance(metric_id, str) else None
+        if spec is None:
+            raise ValueError(
+                f"Unknown metric for benchmark {self.version}: {metric_id!r}"
+            )
+        return spec
+
+    def check_pillar(self, spec: MetricSpec, item: dict) -> None:
+        pillar_id = item.get("pillarId")
+        if pillar_id is not None and pillar_id != spec.pillar_id:
+            raise ValueError(f"Metric {spec.id!r} belongs to {spec.pillar_id!r}")
+
+    def check_ratings(self, spec: MetricSpec, ratings: Any) -> None:
+        if not isinstance(ratings, list) or len(ratings) > spec.questions:
+            raise ValueError(
+                f"Responses for {spec.id!r} must be a list of at most "
+                f"{spec.questions} ratings"
+            )
+        for rating in ratings:
+            if (
+                not isinstance(rating, int)
+                or isinstance(rating, bool)
+                or not 1 <= rating <= spec.levels
+            ):
+                raise ValueError(
+                    f"Responses for {spec.id!r} must be between 1 and {spec.levels}"
+                )
+
+    def check_selection(self, key: Optional[str], item: Any) -> None:
+        if not isinstance(item, dict):
+            raise ValueError("Selections must be objects")
+        spec = self.metric(item.get("metricId", key))
+        self.check_pillar(spec, item)
+        if not isinstance(item.get("selected", False), bool):
+            raise ValueError(f"Selection for {spec.id!r} must be true or false")
+
+    def check_score(self, key: Optional[str], item: Any) -> None:
+        if not isinstance(item, dict):
+            raise ValueError("Scores must be objects")
+        spec = self.metric(item.get("metricId", key))
+        self.check_pillar(spec, item)
+        score = item.get("score")
+        if score is not None and (
+            not isinstance(score, (int, float))
+            or isinstance(score, bool)
+            or not 1 <= score <= spec.levels
+        ):
+            raise ValueError(
+                f"Score for {spec.id!r} must be between 1 and {spec.levels}"
+            )
+        if item.get("responses") is not None:
+            self.check_ratings(spec, item["responses"])
+
+    def check_response(self, key: Optional[str], item: Any) -> None:
+        # Stored either as a bare list of ratings keyed by metricId or as an
+        # entry carrying its own metricId.
+        if isinstance(item, dict):
+            spec = self.metric(item.get("metricId", key))
+            self.check_ratings(spec, item.get("responses", []))
+        else:
+            self.check_ratings(self.metric(key), item)
+
+    def check_entries(self, kind: str, value: Any) -> None:
+        """Validate a whole-field save, as a list or a map keyed by metricId."""
+        if not isinstance(value, (list, dict)):
+            raise ValueError(f"{kind} must be a list or an object keyed by metricId")
+        check = getattr(self, f"check_{kind.removesuffix('s')}")
+        if isinstance(value, dict):
+            for key, item in value.items():
+                check(key, item)
+        else:
+            for item in value:
+                check(None, item)
+
+    def check_updates(self, kind: str, updates: dict[str, Any]) -> None:
+        """Validate per-metric deltas; None removes a metric and is always allowed."""
+        check = getattr(self, f"check_{kind.removesuffix('s')}")
+        for key, item in updates.items():
+            if item is None:
+                self.metric(key)
+                continue
+            check(key, item)
+            if isinstance(item, dict) and item.get("metricId", key) != key:
+                raise ValueError(f"Entry under {key!r} is for {item['metricId']!r}")
+
+
+class BenchmarkRegistry:
+    """Every benchmark version shipped in ``app/data/benchmarks``.
+
+    Loaded at startup; anything that asks before then loads it on demand.
+    """
+
+    def __init__(self, directory: Path = BENCHMARKS_DIR):
+        self.directory = directory
+        self._versions: Optional[dict[str, BenchmarkDefinition]] = None
+
+    def load(self) -> None:
+        versions = {}
+        for path in sorted(self.directory.glob("*.json")):
+            with path.open(encoding="utf-8") as handle:
+                definition = BenchmarkDefinition(json.load(handle))
+            versions[definition.version] = definition
+        self._versions = versions
+
+    @property
+    def versions(self) -> dict[str, BenchmarkDefinition]:
+        if self._versions is None:
+            self.load()
+        return self._versions
+
+    def get(self, version: str = DEFAULT_BENCHMARK_VERSION) -> BenchmarkDefinition:
+        try:
+            return self.versions[version]
+        except KeyError:
+            raise KeyError(f"Unknown benchmark version: {version}") from None
+
+
+benchmark_registry = BenchmarkRegistry()
@@ -1,9 +1,16 @@
 from app.security.dependencies import (
     get_current_user,
     get_current_user_id,
+    require_admin,
     require_auth,
 )
-from app.security.passwords import hash_password, verify_password
+from app.security.passwords import (
+    hash_password,
+    needs_rehash,
+    shutdown_password_pool,
+    verify_password,
+)
+from app.security.token_cache import token_cache
 from app.security.tokens import create_access_token, verify_token
 
 __all__ = [
@@ -11,7 +18,11 @@ __all__ = [
     "get_current_user",
     "get_current_user_id",
     "hash_password",
+    "needs_rehash",
+    "require_admin",
     "require_auth",
+    "shutdown_password_pool",
+    "token_cache",
     "verify_password",
     "verify_token",
 ]
@@ -1,17 +1,25 @@
+import os
+import secrets
 from typing import Optional
 
 from bson import ObjectId
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from pymongo.database import Database
+from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from app.db.mongodb import get_db
+from app.db.singleflight import user_reads
+from app.security.token_cache import token_cache
 from app.security.tokens import verify_token
 
 security = HTTPBearer(auto_error=False)
 
+USER_PROJECTION = {"email": 1, "created_at": 1}
 
-def get_current_user_id(
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+
+async def get_current_user_id(
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ) -> Optional[str]:
     if not credentials:
@@ -25,7 +33,7 @@ def get_current_user_id(
     return payload.get("id")
 
 
-def require_auth(user_id: Optional[str] = Depends(get_current_user_id)) -> str:
+async def require_auth(user_id: Optional[str] = Depends(get_current_user_id)) -> str:
     if user_id is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -34,9 +42,9 @@ def require_auth(user_id: Optional[str] = Depends(get_current_user_id)) -> str:
     return user_id
 
 
-def get_current_user(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Database = Depends(get_db),
+    db: AsyncIOMotorDatabase = Depends(get_db),
 ) -> dict:
     if not credentials:
         raise HTTPException(
@@ -59,8 +67,15 @@ def get_current_user(
             detail="Invalid token",
         )
 
+    user = token_cache.get_user(token)
+    if user is not None:
+        return user
+
     try:
-        user = db.users.find_one({"_id": ObjectId(user_id)})
+        object_id = ObjectId(user_id)
+        user = await user_reads.do(
+            object_id, lambda: db.users.find_one({"_id": object_id}, USER_PROJECTION)
+        )
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -73,4 +88,18 @@ def get_current_user(
             detail="User not found",
         )
 
+    token_cache.set_user(token, user)
     return user
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    if not ADMIN_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access disabled",
+        )
+    if x_admin_token is None or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Unauthorized",
+        )
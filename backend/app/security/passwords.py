@@ -1,10 +1,90 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
 import bcrypt
+from fastapi import HTTPException, status
+
+from app.monitoring.metrics import password_hash_duration_seconds
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+HASH_QUEUE_SIZE = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", "64"))
+HASH_RETRY_AFTER_SECONDS = int(os.getenv("PASSWORD_HASH_RETRY_AFTER", "1"))
+
+T = TypeVar("T")
+
+_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="bcrypt")
+_pending = 0
+_pending_lock = threading.Lock()
+
+
+def pending() -> int:
+    return _pending
+
+
+def _release(_future: Optional[Future]) -> None:
+    # Runs when the job itself finishes, on whichever thread that is.
+    global _pending
+    with _pending_lock:
+        _pending -= 1
+
 
+async def _run_in_pool(operation: str, func: Callable[..., T], *args) -> T:
+    global _pending
+    with _pending_lock:
+        if _pending >= HASH_QUEUE_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server busy, try again shortly",
+                headers={"Retry-After": str(HASH_RETRY_AFTER_SECONDS)},
+            )
+        _pending += 1
 
-def hash_password(password: str) -> str:
-    salt = bcrypt.gensalt()
+    started = time.perf_counter()
+    try:
+        future = _executor.submit(func, *args)
+    except BaseException:
+        _release(None)
+        raise
+    # Counted until the job is done, not until its caller stops waiting: a
+    # cancelled request leaves bcrypt running.
+    future.add_done_callback(_release)
+    try:
+        return await asyncio.wrap_future(future)
+    finally:
+        password_hash_duration_seconds.observe(time.perf_counter() - started, operation)
+
+
+def _hash(password: str) -> str:
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
     return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
 
 
-def verify_password(password: str, hashed_password: str) -> bool:
+def _verify(password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
+
+
+async def hash_password(password: str) -> str:
+    return await _run_in_pool("hash", _hash, password)
+
+
+async def verify_password(password: str, hashed_password: str) -> bool:
+    return await _run_in_pool("verify", _verify, password, hashed_password)
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    # bcrypt hashes look like $2b$<rounds>$<salt+digest>. Only upgrade: lowering
+    # BCRYPT_ROUNDS must not weaken hashes that are already stronger.
+    try:
+        rounds = int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return True
+    return rounds < BCRYPT_ROUNDS
+
+
+def shutdown_password_pool() -> None:
+    _executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,136 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+
+
+class _Entry:
+    __slots__ = ("claims", "expires_at", "user", "user_expires_at")
+
+    def __init__(self, claims: dict, expires_at: float):
+        self.claims = claims
+        self.expires_at = expires_at
+        self.user: Optional[dict] = None
+        self.user_expires_at = 0.0
+
+
+class TokenCache:
+    """Bounded LRU of verified JWT claims keyed by token digest.
+
+    Entries never outlive the token's ``exp`` claim. The cached user
+    projection has its own, shorter TTL so profile changes show up quickly.
+    """
+
+    def __init__(self, max_size: int, user_ttl: float):
+        self.max_size = max_size
+        self.user_ttl = user_ttl
+        self.hits = 0
+        self.misses = 0
+        self.user_hits = 0
+        self.user_misses = 0
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._by_user: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def _get(self, key: str, now: float) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= now:
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user_id = entry.claims.get("id")
+        keys = self._by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[user_id]
+
+    def get_claims(self, token: str) -> Optional[dict]:
+        key = self.digest(token)
+        with self._lock:
+            entry = self._get(key, time.time())
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry.claims
+
+    def set_claims(self, token: str, claims: dict) -> None:
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)):
+            return
+        key = self.digest(token)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = _Entry(claims, float(exp))
+            user_id = claims.get("id")
+            if user_id is not None:
+                self._by_user.setdefault(user_id, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def get_user(self, token: str) -> Optional[dict]:
+        key = self.digest(token)
+        now = time.time()
+        with self._lock:
+            entry = self._get(key, now)
+            if entry is None or entry.user is None or entry.user_expires_at <= now:
+                self.user_misses += 1
+                return None
+            self.user_hits += 1
+            return entry.user
+
+    def set_user(self, token: str, user: dict) -> None:
+        key = self.digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.user = user
+            entry.user_expires_at = time.time() + self.user_ttl
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop every cached token of a user.
+
+        Call after any write that changes a user's credentials or removes
+        the account, so cached claims and profiles don't outlive it.
+        """
+        with self._lock:
+            for key in list(self._by_user.get(user_id, ())):
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "user_hits": self.user_hits,
+                "user_misses": self.user_misses,
+            }
+
+
+token_cache = TokenCache(TOKEN_CACHE_SIZE, USER_CACHE_TTL_SECONDS)
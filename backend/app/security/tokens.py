@@ -4,6 +4,8 @@ from typing import Optional
 
 from jose import JWTError, jwt
 
+from app.security.token_cache import token_cache
+
 JWT_SECRET = os.getenv("JWT_SECRET", "default-dev-secret-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_DAYS = 7
@@ -20,7 +22,14 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 
 def verify_token(token: str) -> Optional[dict]:
+    payload = token_cache.get_claims(token)
+    if payload is not None:
+        return payload
+
     try:
-        return jwt.decode(token, JWT_SECRET, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, JWT_SECRET, algorithms=[ALGORITHM])
     except JWTError:
         return None
+
+    token_cache.set_claims(token, payload)
+    return payload
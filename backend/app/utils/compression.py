@@ -0,0 +1,212 @@
+import os
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))
+ZSTD_LEVEL = int(os.getenv("ZSTD_LEVEL", "3"))
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "text/",
+)
+
+
+class GzipCodec:
+    name = "gzip"
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliCodec:
+    name = "br"
+
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdCodec:
+    name = "zstd"
+
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def available_codecs() -> dict[str, tuple[type, int]]:
+    """Supported encodings in server preference order."""
+    codecs: dict[str, tuple[type, int]] = {}
+    if zstandard is not None:
+        codecs["zstd"] = (ZstdCodec, ZSTD_LEVEL)
+    if brotli is not None:
+        codecs["br"] = (BrotliCodec, BROTLI_QUALITY)
+    codecs["gzip"] = (GzipCodec, GZIP_LEVEL)
+    return codecs
+
+
+def negotiate(accept_encoding: str, supported: list[str]) -> Optional[str]:
+    """Pick the supported encoding with the highest q; ties go to server order."""
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for name in supported:
+        quality = weights.get(name, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+class CompressionMiddleware:
+    """Negotiated zstd/br/gzip compression for JSON, NDJSON and text bodies.
+
+    Single-message bodies under ``minimum_size`` are sent as-is. Streaming
+    bodies are compressed chunk by chunk, flushing after each chunk so
+    clients still receive data progressively.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.codecs = available_codecs()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept = Headers(scope=scope).get("accept-encoding", "")
+        encoding = negotiate(accept, list(self.codecs)) if accept else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        codec_class, level = self.codecs[encoding]
+        responder = CompressionResponder(
+            send, lambda: codec_class(level), self.minimum_size
+        )
+        await self.app(scope, receive, responder.send)
+
+
+class CompressionResponder:
+    def __init__(self, send: Send, make_codec, minimum_size: int):
+        self._send = send
+        self._make_codec = make_codec
+        self.minimum_size = minimum_size
+        self._start: Optional[Message] = None
+        self._codec = None
+        self._passthrough = False
+
+    def _skip(self, start: Message) -> bool:
+        headers = Headers(raw=start["headers"])
+        if start["status"] in (204, 304) or "content-encoding" in headers:
+            return True
+        content_type = headers.get("content-type", "")
+        if content_type.startswith("text/event-stream"):
+            # Events are tiny and must reach the client as soon as they're sent.
+            return True
+        return not content_type.startswith(COMPRESSIBLE_TYPES)
+
+    @staticmethod
+    def _mark_variant(headers: MutableHeaders) -> None:
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            # Encoded bytes differ from the identity representation.
+            headers["ETag"] = f"W/{etag}"
+
+    def _prepare(self, start: Message) -> None:
+        self._codec = self._make_codec()
+        headers = MutableHeaders(raw=start["headers"])
+        headers["Content-Encoding"] = self._codec.name
+        del headers["Content-Length"]
+        self._mark_variant(headers)
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self._start = message
+            self._passthrough = self._skip(message)
+            if message["status"] == 304:
+                # Match the validator a compressed 200 would have carried.
+                self._mark_variant(MutableHeaders(raw=message["headers"]))
+            if self._passthrough:
+                await self._send(message)
+            return
+
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._codec is None:
+            if not more_body and len(body) < self.minimum_size:
+                self._passthrough = True
+                await self._send(self._start)
+                await self._send(message)
+                return
+            self._prepare(self._start)
+            if not more_body:
+                compressed = self._codec.compress(body) + self._codec.finish()
+                headers = MutableHeaders(raw=self._start["headers"])
+                headers["Content-Length"] = str(len(compressed))
+                await self._send(self._start)
+                await self._send({"type": "http.response.body", "body": compressed})
+                return
+            await self._send(self._start)
+
+        chunk = self._codec.compress(body) if body else b""
+        if not more_body:
+            chunk += self._codec.finish()
+        await self._send(
+            {"type": "http.response.body", "body": chunk, "more_body": more_body}
+        )
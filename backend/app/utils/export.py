@@ -0,0 +1,181 @@
+import csv
+import io
+from datetime import datetime
+from typing import Any, AsyncIterator, Optional
+
+from motor.motor_asyncio import AsyncIOMotorCursor, AsyncIOMotorDatabase
+
+from app.db.payloads import PAYLOAD_FIELDS, SPLIT_FLAG, load_payloads
+from app.scoring.engine import CompiledBenchmark, entries
+from app.utils.serialization import dumps
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# Everything an analyst needs; owner and invite token stay internal.
+EXPORT_PROJECTION = {"owner_id": 0, "invite_token": 0}
+
+BASE_COLUMNS = (
+    "id",
+    "company_name",
+    "company_industry",
+    "company_size",
+    "status",
+    "created_at",
+    "updated_at",
+    "progress_percent",
+    "composite_score",
+    "maturity_band",
+)
+
+
+def parquet_available() -> bool:
+    return pa is not None
+
+
+def flatten(document: dict, benchmark: CompiledBenchmark) -> list[Any]:
+    """One tabular row: summary columns followed by one score per metric."""
+    summary = document.get("score_summary") or {}
+    progress = document.get("progress") or {}
+    metric_scores: list[Optional[float]] = [None] * len(benchmark.metric_ids)
+    for item in entries(document.get("scores")):
+        if isinstance(item, dict):
+            column = benchmark.metric_index.get(item.get("metricId"))
+            if column is not None and isinstance(item.get("score"), (int, float)):
+                metric_scores[column] = float(item["score"])
+
+    return [
+        str(document["_id"]),
+        document.get("company_name"),
+        document.get("company_industry"),
+        document.get("company_size"),
+        document.get("status", "active"),
+        document.get("created_at"),
+        document.get("updated_at"),
+        progress.get("percent"),
+        summary.get("composite_score"),
+        summary.get("maturity_band"),
+        *metric_scores,
+    ]
+
+
+def columns(benchmark: CompiledBenchmark) -> list[str]:
+    return [*BASE_COLUMNS, *(f"score.{metric}" for metric in benchmark.metric_ids)]
+
+
+async def batches(
+    db: AsyncIOMotorDatabase,
+    cursor: AsyncIOMotorCursor,
+    batch_size: int,
+    fields: tuple[str, ...],
+) -> AsyncIterator[list]:
+    """Pages of documents with the payload ``fields`` joined in."""
+    while True:
+        documents = await cursor.to_list(length=batch_size)
+        if not documents:
+            return
+        yield await load_payloads(db, documents, fields)
+
+
+async def stream_ndjson(
+    db: AsyncIOMotorDatabase, cursor: AsyncIOMotorCursor, batch_size: int
+) -> AsyncIterator[bytes]:
+    async for documents in batches(db, cursor, batch_size, PAYLOAD_FIELDS):
+        lines = []
+        for document in documents:
+            document.pop(SPLIT_FLAG, None)
+            document["id"] = str(document.pop("_id"))
+            lines.append(dumps(document))
+        yield b"\n".join(lines) + b"\n"
+
+
+async def stream_csv(
+    db: AsyncIOMotorDatabase,
+    cursor: AsyncIOMotorCursor,
+    batch_size: int,
+    benchmark: CompiledBenchmark,
+) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns(benchmark))
+    async for documents in batches(db, cursor, batch_size, ("scores",)):
+        for document in documents:
+            writer.writerow(
+                value.isoformat() if isinstance(value, datetime) else value
+                for value in flatten(document, benchmark)
+            )
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back in chunks."""
+
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+async def stream_parquet(
+    db: AsyncIOMotorDatabase,
+    cursor: AsyncIOMotorCursor,
+    batch_size: int,
+    benchmark: CompiledBenchmark,
+) -> AsyncIterator[bytes]:
+    names = columns(benchmark)
+    schema = pa.schema(
+        [
+            ("id", pa.string()),
+            ("company_name", pa.string()),
+            ("company_industry", pa.string()),
+            ("company_size", pa.string()),
+            ("status", pa.string()),
+            ("created_at", pa.timestamp("ms")),
+            ("updated_at", pa.timestamp("ms")),
+            ("progress_percent", pa.int32()),
+            ("composite_score", pa.float64()),
+            ("maturity_band", pa.string()),
+            *((name, pa.float64()) for name in names[len(BASE_COLUMNS) :]),
+        ]
+    )
+    sink = _ChunkSink()
+    # One row group per Mongo batch keeps memory bounded by batch_size.
+    with pq.ParquetWriter(sink, schema) as writer:
+        async for documents in batches(db, cursor, batch_size, ("scores",)):
+            rows = [flatten(document, benchmark) for document in documents]
+            writer.write_table(
+                pa.Table.from_pylist(
+                    [dict(zip(names, row)) for row in rows], schema=schema
+                )
+            )
+            yield sink.drain()
+    yield sink.drain()
@@ -0,0 +1,96 @@
+import hashlib
+import os
+from datetime import datetime, timedelta
+from typing import Any
+
+from fastapi import HTTPException, status
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.utils.serialization import dumps
+
+# Keys expire through a TTL index on created_at (see connect_db).
+IDEMPOTENCY_TTL_SECONDS = 24 * 60 * 60
+# How long a claim stays exclusive before a retry may take it over, in case
+# its holder died without releasing it.
+IDEMPOTENCY_LEASE_SECONDS = int(os.getenv("IDEMPOTENCY_LEASE_SECONDS", "60"))
+
+
+def key_id(scope: str, user_id: str, key: str) -> str:
+    return f"{scope}:{user_id}:{key}"
+
+
+def request_hash(body: Any) -> str:
+    return hashlib.sha256(dumps(body)).hexdigest()
+
+
+async def claim(db: AsyncIOMotorDatabase, key: str, body_hash: str) -> dict:
+    """Reserve ``key`` for a request with ``body_hash`` and return its record.
+
+    A record in state "done" carries the stored response. A pending claim
+    whose lease lapsed is taken over together with the ``plan`` its holder
+    saved, so the retry repeats the same writes instead of new ones.
+    """
+    now = datetime.utcnow()
+    lease_until = now + timedelta(seconds=IDEMPOTENCY_LEASE_SECONDS)
+    record = {
+        "_id": key,
+        "state": "pending",
+        "request_hash": body_hash,
+        "lease_until": lease_until,
+        "created_at": now,
+    }
+    try:
+        await db.idempotency_keys.insert_one(record)
+        return record
+    except DuplicateKeyError:
+        pass
+
+    taken = await db.idempotency_keys.find_one_and_update(
+        {
+            "_id": key,
+            "state": "pending",
+            "request_hash": body_hash,
+            "lease_until": {"$lte": now},
+        },
+        {"$set": {"lease_until": lease_until}},
+        return_document=ReturnDocument.AFTER,
+    )
+    if taken is not None:
+        return taken
+
+    existing = await db.idempotency_keys.find_one({"_id": key})
+    if existing and existing.get("request_hash", body_hash) != body_hash:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used with a different request",
+        )
+    if existing and existing.get("state") == "done":
+        return existing
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="A request with this Idempotency-Key is in progress",
+    )
+
+
+async def save_plan(db: AsyncIOMotorDatabase, key: str, plan: Any) -> None:
+    """Record what the claim is about to write, before writing it."""
+    await db.idempotency_keys.update_one(
+        {"_id": key, "state": "pending"}, {"$set": {"plan": plan}}
+    )
+
+
+async def complete(db: AsyncIOMotorDatabase, key: str, response: dict) -> None:
+    await db.idempotency_keys.update_one(
+        {"_id": key},
+        {"$set": {"state": "done", "response": response}, "$unset": {"plan": ""}},
+    )
+
+
+async def release(db: AsyncIOMotorDatabase, key: str) -> None:
+    """End the lease early so a retry takes over at once, plan included."""
+    await db.idempotency_keys.update_one(
+        {"_id": key, "state": "pending"},
+        {"$set": {"lease_until": datetime.utcnow()}},
+    )
@@ -0,0 +1,232 @@
+import itertools
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+try:
+    import redis.asyncio as redis
+except ImportError:
+    redis = None
+
+from app.utils.workers import worker_count
+
+logger = logging.getLogger(__name__)
+
+INVITE_CACHE_SIZE = int(os.getenv("INVITE_CACHE_SIZE", "5000"))
+INVITE_CACHE_TTL_SECONDS = float(os.getenv("INVITE_CACHE_TTL_SECONDS", "30"))
+REDIS_URL = os.getenv("REDIS_URL")
+# Generations only need to outlive reads that are still in flight.
+GENERATION_TTL_SECONDS = 3600
+
+
+def invite_etag(revision: int, updated_at: datetime) -> str:
+    # Mongo keeps millisecond precision, so revision disambiguates same-ms writes.
+    stamp = updated_at.isoformat(timespec="milliseconds")
+    return f'"{revision}-{stamp}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison, as If-None-Match requires (RFC 9110 13.1.2)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class MemoryBackend:
+    """Per-process LRU; entries also expire after a TTL.
+
+    Generations come from one process-wide counter. Tokens whose generation
+    was evicted report the highest evicted value, which is never lower than
+    what a reader saw before the eviction, so a stale ``set`` still fails.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, str, bytes]] = OrderedDict()
+        self._generations: OrderedDict[str, int] = OrderedDict()
+        self._counter = itertools.count(1)
+        self._evicted_generation = 0
+
+    async def get(self, key: str) -> Optional[tuple[str, bytes]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, etag, body = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return etag, body
+
+    async def generation(self, key: str) -> int:
+        return self._generations.get(key, self._evicted_generation)
+
+    async def set(
+        self, key: str, generation: int, etag: str, body: bytes, ttl: float
+    ) -> bool:
+        if await self.generation(key) != generation:
+            return False
+        self._entries[key] = (time.monotonic() + ttl, etag, body)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return True
+
+    async def invalidate(self, key: str) -> None:
+        self._entries.pop(key, None)
+        self._generations[key] = next(self._counter)
+        self._generations.move_to_end(key)
+        while len(self._generations) > self.max_size:
+            _, evicted = self._generations.popitem(last=False)
+            self._evicted_generation = max(self._evicted_generation, evicted)
+
+    async def close(self) -> None:
+        self._entries.clear()
+
+
+class NullBackend:
+    """Caches nothing.
+
+    Used when several workers have no shared store: a per-process cache
+    would miss other workers' invalidations and serve stale snapshots.
+    """
+
+    async def get(self, key: str) -> Optional[tuple[str, bytes]]:
+        return None
+
+    async def generation(self, key: str) -> int:
+        return 0
+
+    async def set(
+        self, key: str, generation: int, etag: str, body: bytes, ttl: float
+    ) -> bool:
+        return False
+
+    async def invalidate(self, key: str) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+# Stores the entry only if the token's generation is still the one the
+# reader saw; a missing generation counts as 0.
+SET_IF_GENERATION = """
+if (redis.call('GET', KEYS[2]) or '0') == ARGV[1] then
+    redis.call('SET', KEYS[1], ARGV[2], 'PX', ARGV[3])
+    return 1
+end
+return 0
+"""
+
+
+class RedisBackend:
+    """Shared across workers, so invalidations reach every process."""
+
+    def __init__(self, url: str):
+        self._client = redis.from_url(url)
+        self._set_if_generation = self._client.register_script(SET_IF_GENERATION)
+
+    async def get(self, key: str) -> Optional[tuple[str, bytes]]:
+        value = await self._client.get(f"invite:{key}")
+        if value is None:
+            return None
+        etag, _, body = value.partition(b"\n")
+        return etag.decode("ascii"), body
+
+    async def generation(self, key: str) -> int:
+        return int(await self._client.get(f"invite-generation:{key}") or 0)
+
+    async def set(
+        self, key: str, generation: int, etag: str, body: bytes, ttl: float
+    ) -> bool:
+        stored = await self._set_if_generation(
+            keys=[f"invite:{key}", f"invite-generation:{key}"],
+            args=[
+                str(generation),
+                etag.encode("ascii") + b"\n" + body,
+                int(ttl * 1000),
+            ],
+        )
+        return bool(stored)
+
+    async def invalidate(self, key: str) -> None:
+        async with self._client.pipeline(transaction=True) as pipeline:
+            pipeline.delete(f"invite:{key}")
+            pipeline.incr(f"invite-generation:{key}")
+            pipeline.expire(f"invite-generation:{key}", GENERATION_TTL_SECONDS)
+            await pipeline.execute()
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class InviteCache:
+    """Serialized invite snapshots keyed by invite token.
+
+    Writers call ``invalidate``, which also bumps the token's generation.
+    Readers take the generation before reading the database and pass it to
+    ``set``, which refuses to store a snapshot that a write has overtaken.
+    """
+
+    def __init__(self, backend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, token: str) -> Optional[tuple[str, bytes]]:
+        entry = await self.backend.get(token)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    async def generation(self, token: str) -> int:
+        return await self.backend.generation(token)
+
+    async def set(
+        self,
+        token: str,
+        generation: int,
+        etag: str,
+        body: bytes,
+        expires_at: datetime,
+    ) -> bool:
+        ttl = min(self.ttl, (expires_at - datetime.utcnow()).total_seconds())
+        if ttl <= 0:
+            return False
+        return await self.backend.set(token, generation, etag, body, ttl)
+
+    async def invalidate(self, token: str) -> None:
+        await self.backend.invalidate(token)
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+
+def create_invite_cache() -> InviteCache:
+    if REDIS_URL:
+        if redis is None:
+            raise RuntimeError("REDIS_URL is set but the redis package is missing.")
+        backend = RedisBackend(REDIS_URL)
+    elif worker_count() > 1:
+        logger.warning(
+            "Invite cache disabled: %d workers and no REDIS_URL to share it",
+            worker_count(),
+        )
+        backend = NullBackend()
+    else:
+        backend = MemoryBackend(INVITE_CACHE_SIZE)
+    return InviteCache(backend, INVITE_CACHE_TTL_SECONDS)
+
+
+invite_cache = create_invite_cache()
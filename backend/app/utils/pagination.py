@@ -0,0 +1,31 @@
+import base64
+from datetime import datetime
+from typing import Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+
+def encode_cursor(created_at: datetime, document_id: ObjectId) -> str:
+    raw = f"{created_at.isoformat()}|{document_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[tuple[datetime, ObjectId]]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        created_at, document_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), ObjectId(document_id)
+    except (ValueError, InvalidId, UnicodeError):
+        return None
+
+
+def keyset_filter(created_at: datetime, document_id: ObjectId) -> dict:
+    """Match documents strictly after the cursor in (created_at, _id) desc order."""
+    return {
+        "$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": document_id}},
+        ]
+    }
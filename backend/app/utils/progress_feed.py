@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import os
+from collections import defaultdict
+from typing import Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import PyMongoError
+
+from app.utils.workers import worker_count
+
+logger = logging.getLogger(__name__)
+
+# "local": update_invite publishes to subscribers on the same worker.
+# "changestream": every worker tails the assessments change stream instead,
+# so a dashboard sees writes handled by any worker (needs a replica set).
+PROGRESS_FEED_SOURCE = os.getenv("PROGRESS_FEED_SOURCE", "local")
+SSE_MAX_SUBSCRIBERS = int(os.getenv("SSE_MAX_SUBSCRIBERS", "10000"))
+SSE_QUEUE_SIZE = int(os.getenv("SSE_QUEUE_SIZE", "64"))
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+
+CHANGE_STREAM_PIPELINE = [
+    {
+        "$match": {
+            "operationType": "update",
+            "$or": [
+                {"updateDescription.updatedFields.progress": {"$exists": True}},
+                {"updateDescription.updatedFields.status": {"$exists": True}},
+            ],
+        }
+    },
+    {
+        "$project": {
+            "fullDocument._id": 1,
+            "fullDocument.owner_id": 1,
+            "fullDocument.status": 1,
+            "fullDocument.progress": 1,
+            "fullDocument.revision": 1,
+        }
+    },
+]
+
+
+def progress_event(document: dict) -> dict:
+    return {
+        "id": str(document["_id"]),
+        "status": document.get("status"),
+        "progress": document.get("progress"),
+        "revision": document.get("revision", 0),
+    }
+
+
+class Subscription:
+    """One dashboard connection. Slow readers lose their oldest events."""
+
+    def __init__(self, owner_id: str):
+        self.owner_id = owner_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SSE_QUEUE_SIZE)
+
+    def put(self, event: dict) -> bool:
+        """Enqueue an event; returns True when an older one had to go."""
+        dropped = self.queue.full()
+        if dropped:
+            # Each event is a full status/progress snapshot, so newer ones
+            # supersede what gets dropped.
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+        return dropped
+
+    async def get(self, timeout: float) -> Optional[dict]:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class ProgressBroker:
+    """In-process fan-out of assessment progress, keyed by owner."""
+
+    def __init__(self, max_subscribers: int):
+        self.max_subscribers = max_subscribers
+        self._subscribers: dict[str, set[Subscription]] = defaultdict(set)
+        self._count = 0
+        self.published = 0
+        self.dropped = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def subscribers(self) -> int:
+        return self._count
+
+    @property
+    def full(self) -> bool:
+        return self._count >= self.max_subscribers
+
+    def subscribe(self, owner_id: str) -> Subscription:
+        subscription = Subscription(owner_id)
+        self._subscribers[owner_id].add(subscription)
+        self._count += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        owners = self._subscribers.get(subscription.owner_id)
+        if owners is None or subscription not in owners:
+            return
+        owners.discard(subscription)
+        self._count -= 1
+        if not owners:
+            del self._subscribers[subscription.owner_id]
+
+    def publish(self, owner_id: str, event: dict) -> None:
+        owners = self._subscribers.get(owner_id)
+        if not owners:
+            return
+        self.published += 1
+        for subscription in owners:
+            if subscription.put(event):
+                self.dropped += 1
+
+    def publish_local(self, owner_id: str, event: dict) -> None:
+        """Publish from a request handler unless the change stream covers it."""
+        if PROGRESS_FEED_SOURCE != "changestream":
+            self.publish(owner_id, event)
+
+    async def _watch(self, db: AsyncIOMotorDatabase) -> None:
+        resume_token = None
+        while True:
+            try:
+                async with db.assessments.watch(
+                    CHANGE_STREAM_PIPELINE,
+                    full_document="updateLookup",
+                    resume_after=resume_token,
+                ) as stream:
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        document = change.get("fullDocument")
+                        if document and document.get("owner_id"):
+                            self.publish(document["owner_id"], progress_event(document))
+            except asyncio.CancelledError:
+                raise
+            except PyMongoError:
+                logger.exception("Progress change stream failed; retrying")
+                await asyncio.sleep(5)
+
+    def start(self, db: AsyncIOMotorDatabase) -> None:
+        if PROGRESS_FEED_SOURCE == "changestream":
+            self._task = asyncio.create_task(self._watch(db))
+        elif worker_count() > 1:
+            logger.warning(
+                "PROGRESS_FEED_SOURCE=local with %d workers: dashboards miss "
+                "progress saved on other workers; use changestream (needs a "
+                "replica set)",
+                worker_count(),
+            )
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+progress_broker = ProgressBroker(SSE_MAX_SUBSCRIBERS)
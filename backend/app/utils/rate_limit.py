@@ -0,0 +1,204 @@
+import logging
+import math
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import HTTPException, Request, status
+
+from app.monitoring.metrics import rate_limited_total
+
+try:
+    import redis.asyncio as redis
+except ImportError:
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_STORE_SIZE = int(os.getenv("RATE_LIMIT_STORE_SIZE", "100000"))
+REDIS_URL = os.getenv("REDIS_URL")
+
+RATE_LIMIT_HEADERS = ["RateLimit-Limit", "RateLimit-Remaining", "RateLimit-Reset"]
+
+
+@dataclass(frozen=True)
+class Limit:
+    """``count`` requests per ``period`` seconds, allowing a burst of ``count``."""
+
+    name: str
+    count: int
+    period: float
+
+    @property
+    def interval(self) -> float:
+        return self.period / self.count
+
+    @classmethod
+    def from_env(cls, name: str, default: str) -> "Limit":
+        count, _, period = os.getenv(f"RATE_LIMIT_{name.upper()}", default).partition(
+            "/"
+        )
+        return cls(name, int(count), float(period))
+
+
+@dataclass(frozen=True)
+class Decision:
+    allowed: bool
+    remaining: int
+    reset: float
+    retry_after: float
+
+
+def decide(limit: Limit, tat: float, now: float) -> tuple[Decision, float]:
+    """GCRA: one timestamp per key is all the state a sliding window needs.
+
+    ``tat`` is the theoretical arrival time of the next request. Returns the
+    decision and the TAT to store (unchanged when the request is rejected).
+    """
+    tat = max(tat, now)
+    new_tat = tat + limit.interval
+    allow_at = new_tat - limit.period
+    if now < allow_at:
+        remaining = 0
+        return Decision(False, remaining, tat - now, allow_at - now), tat
+    remaining = int((limit.period - (new_tat - now)) / limit.interval)
+    return Decision(True, remaining, new_tat - now, 0.0), new_tat
+
+
+class MemoryBackend:
+    """Per-process store of one float per key; least recently used keys go first."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._tats: OrderedDict[str, float] = OrderedDict()
+
+    async def hit(self, limit: Limit, key: str) -> Decision:
+        now = time.monotonic()
+        tat = self._tats.get(key, now)
+        decision, new_tat = decide(limit, tat, now)
+        self._tats[key] = new_tat
+        self._tats.move_to_end(key)
+        while len(self._tats) > self.max_size:
+            self._tats.popitem(last=False)
+        return decision
+
+    async def close(self) -> None:
+        self._tats.clear()
+
+
+# Same arithmetic as ``decide``, atomically on the server's clock.
+GCRA_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local interval = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local new_tat = tat + interval
+local allow_at = new_tat - period
+if now < allow_at then
+    return {0, tostring(tat - now), tostring(allow_at - now)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {1, tostring(new_tat - now), '0'}
+"""
+
+
+class RedisBackend:
+    """Shared across workers so limits hold for the whole deployment."""
+
+    def __init__(self, url: str):
+        self._client = redis.from_url(url)
+        self._script = self._client.register_script(GCRA_SCRIPT)
+
+    async def hit(self, limit: Limit, key: str) -> Decision:
+        try:
+            allowed, reset, retry_after = await self._script(
+                keys=[f"ratelimit:{key}"], args=[limit.interval, limit.period]
+            )
+        except redis.RedisError:
+            # An unavailable limiter store shouldn't take logins down with it.
+            logger.exception("Rate limit store unavailable; allowing request")
+            return Decision(True, limit.count, 0.0, 0.0)
+        reset = float(reset)
+        if not allowed:
+            return Decision(False, 0, reset, float(retry_after))
+        remaining = int((limit.period - reset) / limit.interval)
+        return Decision(True, remaining, reset, 0.0)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class RateLimiter:
+    def __init__(self, backend, enabled: bool):
+        self.backend = backend
+        self.enabled = enabled
+
+    async def enforce(self, *checks: tuple[Limit, Optional[str]]) -> dict[str, str]:
+        """Count one request against each (limit, key) pair.
+
+        Raises 429 on the first exhausted limit, before later keys are charged.
+        Returns RateLimit-* headers for the tightest limit otherwise.
+        """
+        if not self.enabled:
+            return {}
+        tightest: Optional[tuple[Limit, Decision]] = None
+        for limit, key in checks:
+            if not key:
+                continue
+            decision = await self.backend.hit(limit, f"{limit.name}:{key}")
+            if not decision.allowed:
+                rate_limited_total.inc(limit.name)
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many requests",
+                    headers={
+                        **rate_limit_headers(limit, decision),
+                        "Retry-After": str(math.ceil(decision.retry_after)),
+                    },
+                )
+            if tightest is None or decision.remaining < tightest[1].remaining:
+                tightest = (limit, decision)
+        if tightest is None:
+            return {}
+        return rate_limit_headers(*tightest)
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+
+def rate_limit_headers(limit: Limit, decision: Decision) -> dict[str, str]:
+    return {
+        "RateLimit-Limit": str(limit.count),
+        "RateLimit-Remaining": str(decision.remaining),
+        "RateLimit-Reset": str(math.ceil(decision.reset)),
+    }
+
+
+def client_ip(request: Request) -> Optional[str]:
+    # Behind a proxy uvicorn rewrites client from X-Forwarded-For when the
+    # proxy is listed in FORWARDED_ALLOW_IPS.
+    return request.client.host if request.client else None
+
+
+def create_rate_limiter() -> RateLimiter:
+    if REDIS_URL:
+        if redis is None:
+            raise RuntimeError("REDIS_URL is set but the redis package is missing.")
+        backend = RedisBackend(REDIS_URL)
+    else:
+        backend = MemoryBackend(RATE_LIMIT_STORE_SIZE)
+    return RateLimiter(backend, RATE_LIMIT_ENABLED)
+
+
+LOGIN_IP = Limit.from_env("login_ip", "20/60")
+LOGIN_EMAIL = Limit.from_env("login_email", "10/300")
+REGISTER_IP = Limit.from_env("register_ip", "10/3600")
+INVITE_IP = Limit.from_env("invite_ip", "300/60")
+INVITE_TOKEN = Limit.from_env("invite_token", "120/60")
+
+rate_limiter = create_rate_limiter()
@@ -0,0 +1,25 @@
+from typing import Any
+
+import orjson
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """orjson encode with native datetime support and ObjectId as hex strings."""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """Default response class; hot handlers also return it directly with
+    plain dicts built from Mongo documents to skip response_model validation.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
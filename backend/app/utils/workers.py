@@ -0,0 +1,10 @@
+import os
+
+
+def worker_count() -> int:
+    """Worker processes serving the app.
+
+    ``app.prod`` exports the count it starts as WEB_CONCURRENCY, which is
+    also what ``uvicorn --workers`` defaults to.
+    """
+    return int(os.getenv("WEB_CONCURRENCY") or 1)
@@ -0,0 +1,75 @@
+"""Bytes on the wire and CPU cost per codec for realistic payload sizes.
+
+python -m benchmarks.compression --metrics 8,24,96
+"""
+
+import argparse
+import json
+import time
+
+from app.routes.assessments import assessment_summary, invite_snapshot
+from app.utils.compression import available_codecs
+from app.utils.serialization import dumps
+from benchmarks.serialization import make_assessment
+
+
+def payloads(metric_counts: list[int], list_sizes: list[int]) -> dict[str, bytes]:
+    result = {}
+    for metrics in metric_counts:
+        result[f"invite/{metrics}-metrics"] = dumps(
+            invite_snapshot(make_assessment(metrics, 3))
+        )
+    for size in list_sizes:
+        result[f"list/{size}-items"] = dumps(
+            [assessment_summary(make_assessment(4, 3)) for _ in range(size)]
+        )
+    return result
+
+
+def measure(codec_class, level: int, payload: bytes, rounds: int) -> tuple[int, float]:
+    started = time.process_time()
+    for _ in range(rounds):
+        codec = codec_class(level)
+        encoded = codec.compress(payload) + codec.finish()
+    elapsed = time.process_time() - started
+    return len(encoded), elapsed / rounds * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--metrics", default="8,24,96")
+    parser.add_argument("--list-sizes", default="10,50,200")
+    parser.add_argument("--levels", default=None, help="override, e.g. 1,6,9")
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    codecs = available_codecs()
+    for name, payload in payloads(
+        [int(value) for value in args.metrics.split(",")],
+        [int(value) for value in args.list_sizes.split(",")],
+    ).items():
+        for encoding, (codec_class, default_level) in codecs.items():
+            levels = (
+                [int(value) for value in args.levels.split(",")]
+                if args.levels
+                else [default_level]
+            )
+            for level in levels:
+                size, cpu_us = measure(codec_class, level, payload, args.rounds)
+                print(
+                    json.dumps(
+                        {
+                            "payload": name,
+                            "encoding": encoding,
+                            "level": level,
+                            "raw_bytes": len(payload),
+                            "wire_bytes": size,
+                            "ratio": round(len(payload) / size, 2),
+                            "cpu_us": round(cpu_us, 1),
+                        }
+                    )
+                )
+
+
+if __name__ == "__main__":
+    main()
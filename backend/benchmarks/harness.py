@@ -0,0 +1,324 @@
+"""Scripted load scenarios against the app in-process, on seeded data.
+
+Runs the FastAPI app from app.main through httpx's ASGI transport with
+``get_db`` overridden, either to an in-memory Mongo stand-in (mongomock-motor)
+or to a throwaway database on a real server. Writes one JSON document with
+throughput and latency percentiles per scenario, so runs can be diffed
+between commits.
+
+The stand-in scans collections without indexes, so its numbers are only
+comparable with other stand-in runs; use --mongo-url for absolute figures.
+
+    python -m benchmarks.harness --owners 2000 --per-owner 5 \
+        --scenarios autosave_storm,dashboard_polling,login_burst \
+        --concurrency 32 --requests 5000 --output bench.json
+
+    python -m benchmarks.harness --mongo-url mongodb://localhost:27017/
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+from bson import ObjectId
+
+from app.db.models import keyed_by_metric
+from app.db.mongodb import create_indexes, get_db
+from app.db.payloads import PAYLOAD_FIELDS, SPLIT_FLAG, payload_document
+from app.main import app
+from app.scoring.registry import BENCHMARKS_DIR, DEFAULT_BENCHMARK_VERSION
+from app.security import create_access_token, hash_password
+from app.utils.rate_limit import rate_limiter
+from benchmarks.load import percentile
+
+PASSWORD = "benchmark-password"
+INDUSTRIES = ("Software", "Finance", "Healthcare", "Retail", "Manufacturing")
+SIZES = ("1-50", "50-200", "200-500", "500-1000", "1000+")
+
+
+def load_metrics(version: str) -> list[tuple[str, str, int]]:
+    """(pillar id, metric id, question count) for every benchmark metric."""
+    definition = json.loads((BENCHMARKS_DIR / f"{version}.json").read_text())
+    return [
+        (pillar["id"], metric["id"], len(metric["questions"]))
+        for pillar in definition["pillars"]
+        for metric in pillar["metrics"]
+    ]
+
+
+def make_scores(rng: random.Random, metrics: list[tuple[str, str, int]]) -> list:
+    scores = []
+    for pillar_id, metric_id, questions in metrics:
+        responses = [rng.randint(1, 5) for _ in range(questions)]
+        scores.append(
+            {
+                "metricId": metric_id,
+                "pillarId": pillar_id,
+                "score": sum(responses) / len(responses),
+                "responses": responses,
+                "completed": True,
+            }
+        )
+    return scores
+
+
+def make_assessment(
+    rng: random.Random, owner_id: str, metrics: list[tuple[str, str, int]]
+) -> dict:
+    now = datetime.utcnow()
+    scores = make_scores(rng, metrics)
+    return {
+        "_id": ObjectId(),
+        "owner_id": owner_id,
+        "company_name": f"Company {rng.randrange(10**6)}",
+        "company_industry": rng.choice(INDUSTRIES),
+        "company_size": rng.choice(SIZES),
+        "invite_token": ObjectId().binary.hex(),
+        "invite_expires_at": now + timedelta(days=30),
+        "status": "active",
+        "revision": 0,
+        "created_at": now - timedelta(minutes=rng.randrange(60 * 24 * 30)),
+        "updated_at": now,
+        "exec_profile": {"name": "Jo Doe", "title": "CTO", "email": "jo@example.com"},
+        "selections": keyed_by_metric(
+            [
+                {"metricId": metric_id, "pillarId": pillar_id, "selected": True}
+                for pillar_id, metric_id, _ in metrics
+            ]
+        ),
+        "scores": keyed_by_metric(scores),
+        "responses": {score["metricId"]: score["responses"] for score in scores},
+        "progress": {
+            "completed_metrics": len(metrics),
+            "total_metrics": len(metrics),
+            "percent": 100,
+            "updated_at": now.isoformat(),
+        },
+    }
+
+
+async def seed(db, owners: int, per_owner: int, seed_value: int) -> dict:
+    rng = random.Random(seed_value)
+    metrics = load_metrics(DEFAULT_BENCHMARK_VERSION)
+    # One hash for everyone: seeding thousands of bcrypt hashes would dominate.
+    password_hash = await hash_password(PASSWORD)
+    users, tokens, emails, invites = [], [], [], []
+    for index in range(owners):
+        user_id = ObjectId()
+        email = f"owner{index}@bench.example.com"
+        users.append(
+            {
+                "_id": user_id,
+                "email": email,
+                "password": password_hash,
+                "created_at": datetime.utcnow(),
+            }
+        )
+        emails.append(email)
+        tokens.append(create_access_token({"id": str(user_id), "email": email}))
+
+    batch, payloads = [], []
+    for user in users:
+        for _ in range(per_owner):
+            assessment = make_assessment(rng, str(user["_id"]), metrics)
+            invites.append(assessment["invite_token"])
+            # Same layout the app writes: metadata and payload apart.
+            payloads.append(payload_document(assessment))
+            for field in PAYLOAD_FIELDS:
+                assessment.pop(field, None)
+            assessment[SPLIT_FLAG] = True
+            batch.append(assessment)
+            if len(batch) >= 1000:
+                await db.assessments.insert_many(batch)
+                await db.assessment_payloads.insert_many(payloads)
+                batch, payloads = [], []
+    if batch:
+        await db.assessments.insert_many(batch)
+        await db.assessment_payloads.insert_many(payloads)
+    await db.users.insert_many(users)
+    return {"tokens": tokens, "emails": emails, "invites": invites, "metrics": metrics}
+
+
+def autosave_storm(rng: random.Random, data: dict) -> tuple[str, str, dict]:
+    _, metric_id, questions = rng.choice(data["metrics"])
+    responses = [rng.randint(1, 5) for _ in range(questions)]
+    body = {
+        "score_updates": {
+            metric_id: {
+                "metricId": metric_id,
+                "score": sum(responses) / len(responses),
+                "responses": responses,
+                "completed": True,
+            }
+        }
+    }
+    token = rng.choice(data["invites"])
+    return "PATCH", f"/api/invite/{token}", {"json": body}
+
+
+def invite_reads(rng: random.Random, data: dict) -> tuple[str, str, dict]:
+    return "GET", f"/api/invite/{rng.choice(data['invites'])}", {}
+
+
+def dashboard_polling(rng: random.Random, data: dict) -> tuple[str, str, dict]:
+    token = rng.choice(data["tokens"])
+    return "GET", "/api/assessments", {"headers": {"Authorization": f"Bearer {token}"}}
+
+
+def login_burst(rng: random.Random, data: dict) -> tuple[str, str, dict]:
+    body = {"email": rng.choice(data["emails"]), "password": PASSWORD}
+    return "POST", "/api/auth/login", {"json": body}
+
+
+# Each scenario picks the next request: (method, path, httpx options).
+SCENARIOS = {
+    "autosave_storm": autosave_storm,
+    "invite_reads": invite_reads,
+    "dashboard_polling": dashboard_polling,
+    "login_burst": login_burst,
+}
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    name: str,
+    data: dict,
+    concurrency: int,
+    requests: int,
+    seed_value: int,
+) -> dict:
+    rng = random.Random(seed_value)
+    build = SCENARIOS[name]
+    latencies: list[float] = []
+    statuses: dict[str, int] = {}
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            method, path, options = build(rng, data)
+            started = time.perf_counter()
+            response = await client.request(method, path, **options)
+            latencies.append((time.perf_counter() - started) * 1000)
+            key = str(response.status_code)
+            statuses[key] = statuses.get(key, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "scenario": name,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "statuses": dict(sorted(statuses.items())),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p90_ms": round(percentile(latencies, 90), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(max(latencies, default=0.0), 2),
+    }
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def open_database(mongo_url: str | None):
+    if mongo_url is None:
+        from mongomock_motor import AsyncMongoMockClient
+
+        client = AsyncMongoMockClient()
+        return client, client["aicompass_bench"], None
+
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    client = AsyncIOMotorClient(mongo_url)
+    name = f"aicompass_bench_{os.getpid()}"
+    db = client[name]
+    await create_indexes(db)
+    return client, db, name
+
+
+async def main_async(args: argparse.Namespace) -> dict:
+    client, db, database_name = await open_database(args.mongo_url)
+    app.dependency_overrides[get_db] = lambda: db
+    # Scenarios deliberately hammer a few keys; limits would just produce 429s.
+    rate_limiter.enabled = args.rate_limit
+    try:
+        seed_started = time.perf_counter()
+        data = await seed(db, args.owners, args.per_owner, args.seed)
+        seed_seconds = time.perf_counter() - seed_started
+
+        transport = httpx.ASGITransport(app=app, client=("127.0.0.1", 50000))
+        results = []
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=60
+        ) as http:
+            for name in args.scenarios.split(","):
+                results.append(
+                    await run_scenario(
+                        http, name, data, args.concurrency, args.requests, args.seed
+                    )
+                )
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        if database_name is not None:
+            await client.drop_database(database_name)
+        client.close()
+
+    return {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "backend": "mongodb" if args.mongo_url else "mongomock",
+        "owners": args.owners,
+        "assessments": args.owners * args.per_owner,
+        "seed_seconds": round(seed_seconds, 2),
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mongo-url", default=None)
+    parser.add_argument("--owners", type=int, default=1000)
+    parser.add_argument("--per-owner", type=int, default=5)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--rate-limit", action="store_true")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios.split(",")) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    report = json.dumps(asyncio.run(main_async(args)), indent=2, sort_keys=True)
+    if args.output:
+        Path(args.output).write_text(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Concurrency sweep against a running API instance.
+
+Fires a fixed number of requests at each concurrency level and reports
+p50/p99 latency, so event-loop stalls show up as latency growing with load.
+
+    python -m benchmarks.load --url http://localhost:4001 --path /api/assessments \
+        --token <jwt> --levels 1,8,32,128
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_level(
+    client: httpx.AsyncClient, path: str, concurrency: int, requests: int
+) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            response = await client.get(path)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "mean_ms": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+    }
+
+
+async def main_async(args: argparse.Namespace) -> list[dict]:
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    levels = [int(level) for level in args.levels.split(",")]
+    limits = httpx.Limits(max_connections=max(levels))
+    async with httpx.AsyncClient(
+        base_url=args.url, headers=headers, limits=limits, timeout=30
+    ) as client:
+        results = []
+        for level in levels:
+            results.append(await run_level(client, args.path, level, args.requests))
+        return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:4001")
+    parser.add_argument("--path", default="/api/assessments")
+    parser.add_argument("--token", default=None)
+    parser.add_argument("--levels", default="1,8,32,128")
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    for row in asyncio.run(main_async(args)):
+        print(json.dumps(row))
+
+
+if __name__ == "__main__":
+    main()
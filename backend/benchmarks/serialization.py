@@ -0,0 +1,132 @@
+"""Compare response serialization: pydantic response_model path vs fast path.
+
+python -m benchmarks.serialization --list-size 50 --metrics 24
+"""
+
+import argparse
+import json
+import timeit
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from app.routes.assessments import assessment_summary, invite_snapshot
+from app.schemas.assessments import AssessmentResponse, InviteSnapshot
+from app.utils.serialization import dumps
+
+
+def make_assessment(metrics: int, questions: int) -> dict:
+    now = datetime.utcnow()
+    metric_ids = [f"metric-{index}" for index in range(metrics)]
+    return {
+        "_id": ObjectId(),
+        "owner_id": str(ObjectId()),
+        "company_name": "Acme Holdings",
+        "company_industry": "Software",
+        "company_size": "200-500",
+        "invite_token": ObjectId().binary.hex(),
+        "invite_expires_at": now + timedelta(days=30),
+        "status": "active",
+        "revision": 12,
+        "created_at": now,
+        "updated_at": now,
+        "exec_profile": {"name": "Jo Doe", "title": "CTO", "email": "jo@acme.co"},
+        "progress": {
+            "completed_metrics": metrics // 2,
+            "total_metrics": metrics,
+            "percent": 50,
+            "updated_at": now,
+        },
+        "selections": {
+            metric: {"metricId": metric, "pillarId": "pillar", "selected": True}
+            for metric in metric_ids
+        },
+        "scores": {
+            metric: {
+                "metricId": metric,
+                "pillarId": "pillar",
+                "score": 3.5,
+                "responses": [4] * questions,
+                "completed": True,
+            }
+            for metric in metric_ids
+        },
+        "responses": {metric: [3] * questions for metric in metric_ids},
+    }
+
+
+def starlette_json(content) -> bytes:
+    # Mirrors starlette.responses.JSONResponse.render.
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def pydantic_list(documents: list[dict]) -> bytes:
+    models = [
+        AssessmentResponse(
+            id=str(item["_id"]),
+            company_name=item["company_name"],
+            company_industry=item.get("company_industry"),
+            company_size=item.get("company_size"),
+            invite_token=item["invite_token"],
+            invite_expires_at=item["invite_expires_at"],
+            status=item.get("status", "active"),
+            progress=item.get("progress"),
+        )
+        for item in documents
+    ]
+    # What FastAPI does with response_model: validate again, dump, then encode.
+    content = [
+        AssessmentResponse.model_validate(model).model_dump(mode="json")
+        for model in models
+    ]
+    return starlette_json(content)
+
+
+def pydantic_invite(document: dict) -> bytes:
+    snapshot = InviteSnapshot(**invite_snapshot(document))
+    content = InviteSnapshot.model_validate(snapshot).model_dump(mode="json")
+    return starlette_json(content)
+
+
+def fast_list(documents: list[dict]) -> bytes:
+    return dumps([assessment_summary(item) for item in documents])
+
+
+def fast_invite(document: dict) -> bytes:
+    return dumps(invite_snapshot(document))
+
+
+def measure(label: str, func, *args, number: int) -> dict:
+    seconds = min(timeit.repeat(lambda: func(*args), number=number, repeat=5))
+    return {
+        "case": label,
+        "ops_per_sec": round(number / seconds, 1),
+        "bytes": len(func(*args)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--list-size", type=int, default=50)
+    parser.add_argument("--metrics", type=int, default=24)
+    parser.add_argument("--questions", type=int, default=3)
+    parser.add_argument("--number", type=int, default=500)
+    args = parser.parse_args()
+
+    documents = [
+        make_assessment(args.metrics, args.questions) for _ in range(args.list_size)
+    ]
+    invite = make_assessment(args.metrics, args.questions)
+    for row in (
+        measure("list/pydantic", pydantic_list, documents, number=args.number),
+        measure("list/fast", fast_list, documents, number=args.number),
+        measure("invite/pydantic", pydantic_invite, invite, number=args.number),
+        measure("invite/fast", fast_invite, invite, number=args.number),
+    ):
+        print(json.dumps(row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import httpx
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+import app.db.mongodb as mongodb
+from app.db.mongodb import get_db
+from app.main import app
+from app.security.token_cache import token_cache
+from app.utils.invite_cache import MemoryBackend, invite_cache
+from app.utils.rate_limit import rate_limiter
+
+PASSWORD = "password1"
+
+
+@pytest.fixture
+def db(monkeypatch):
+    database = AsyncMongoMockClient()["aicompass_test"]
+    monkeypatch.setattr(mongodb, "db", database)
+    app.dependency_overrides[get_db] = lambda: database
+    yield database
+    app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture(autouse=True)
+def reset_state(monkeypatch):
+    # Process-wide caches and limiters would otherwise leak between tests.
+    monkeypatch.setattr(rate_limiter, "enabled", False)
+    monkeypatch.setattr(invite_cache, "backend", MemoryBackend(100))
+    token_cache.clear()
+    yield
+    token_cache.clear()
+
+
+@pytest.fixture
+async def client(db):
+    transport = httpx.ASGITransport(app=app, client=("127.0.0.1", 50000))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        yield http
+
+
+async def register(client: httpx.AsyncClient, email: str = "owner@example.com"):
+    response = await client.post(
+        "/api/auth/register", json={"email": email, "password": PASSWORD}
+    )
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['token']}"}
+
+
+@pytest.fixture
+async def owner(client):
+    return await register(client)
+
+
+@pytest.fixture
+async def invite(client, owner):
+    response = await client.post(
+        "/api/assessments", json={"company_name": "Acme"}, headers=owner
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def score(metric_id: str, value: float, pillar_id: str = "internal-adoption"):
+    return {"metricId": metric_id, "pillarId": pillar_id, "score": value}
@@ -0,0 +1,22 @@
+import orjson
+
+from tests.conftest import score
+
+
+async def test_ndjson_export_includes_payload(client, owner, invite):
+    await client.patch(
+        f"/api/invite/{invite['invite_token']}",
+        json={"scores": [score("adoption-coverage", 3)]},
+    )
+
+    response = await client.get("/api/assessments/export", headers=owner)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [orjson.loads(line) for line in response.content.splitlines()]
+    assert len(rows) == 1
+    row = rows[0]
+    assert row["id"] == invite["id"]
+    assert "invite_token" not in row and "owner_id" not in row
+    assert row["scores"]["adoption-coverage"]["score"] == 3
+    assert isinstance(row["created_at"], str)
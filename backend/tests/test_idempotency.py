@@ -0,0 +1,117 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.routes import assessments
+from app.utils import idempotency
+
+ITEMS = {"items": [{"company_name": "Acme"}, {"company_name": "Globex"}]}
+
+
+def keyed(owner, key="key-1"):
+    return {**owner, "Idempotency-Key": key}
+
+
+async def test_retry_returns_stored_response(client, db, owner):
+    first = await client.post("/api/assessments/bulk", json=ITEMS, headers=keyed(owner))
+    second = await client.post(
+        "/api/assessments/bulk", json=ITEMS, headers=keyed(owner)
+    )
+
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    assert await db.assessments.count_documents({}) == 2
+
+
+async def test_different_body_under_same_key_is_rejected(client, db, owner):
+    await client.post("/api/assessments/bulk", json=ITEMS, headers=keyed(owner))
+
+    response = await client.post(
+        "/api/assessments/bulk",
+        json={"items": [{"company_name": "Initech"}]},
+        headers=keyed(owner),
+    )
+
+    assert response.status_code == 422
+    assert await db.assessments.count_documents({}) == 2
+
+
+async def test_live_claim_conflicts(client, db, owner, monkeypatch):
+    entered, finish = asyncio.Event(), asyncio.Event()
+    insert = assessments.insert_assessments
+
+    async def slow_insert(*args):
+        entered.set()
+        await finish.wait()
+        return await insert(*args)
+
+    monkeypatch.setattr(assessments, "insert_assessments", slow_insert)
+    first = asyncio.create_task(
+        client.post("/api/assessments/bulk", json=ITEMS, headers=keyed(owner))
+    )
+    await entered.wait()
+
+    second = await client.post(
+        "/api/assessments/bulk", json=ITEMS, headers=keyed(owner)
+    )
+    finish.set()
+
+    assert second.status_code == 409
+    assert (await first).status_code == 200
+
+
+async def test_cancelled_claim_is_released(db, monkeypatch):
+    key = idempotency.key_id("assessments-bulk", "user", "key-1")
+    items = [assessments.AssessmentCreate(company_name="Acme")]
+    started = asyncio.Event()
+
+    async def hang(*args):
+        started.set()
+        await asyncio.Event().wait()
+
+    with monkeypatch.context() as patch:
+        patch.setattr(assessments, "insert_assessments", hang)
+        task = asyncio.create_task(assessments.bulk_create(db, "user", "key-1", items))
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    record = await db.idempotency_keys.find_one({"_id": key})
+    assert record["lease_until"] <= datetime.utcnow()
+    response = await assessments.bulk_create(db, "user", "key-1", items)
+    assert response.created == 1
+
+
+async def test_stale_claim_is_taken_over_without_duplicates(client, db, owner):
+    # An earlier attempt saved its plan, inserted one row and then died.
+    user_id = str((await db.users.find_one({}))["_id"])
+    items = [assessments.AssessmentCreate(**item) for item in ITEMS["items"]]
+    key = idempotency.key_id("assessments-bulk", user_id, "key-1")
+    body_hash = idempotency.request_hash([item.model_dump() for item in items])
+    await idempotency.claim(db, key, body_hash)
+    documents = assessments.new_documents(user_id, items)
+    await idempotency.save_plan(db, key, {"documents": documents})
+    await db.assessments.insert_one(documents[0])
+
+    blocked = await client.post(
+        "/api/assessments/bulk", json=ITEMS, headers=keyed(owner)
+    )
+    assert blocked.status_code == 409
+
+    await db.idempotency_keys.update_one(
+        {"_id": key},
+        {"$set": {"lease_until": datetime.utcnow() - timedelta(seconds=1)}},
+    )
+    response = await client.post(
+        "/api/assessments/bulk", json=ITEMS, headers=keyed(owner)
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["created"] == 2 and body["failed"] == 0
+    assert [result["assessment"]["id"] for result in body["results"]] == [
+        str(document["_id"]) for document in documents
+    ]
+    assert await db.assessments.count_documents({}) == 2
@@ -0,0 +1,77 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from app.routes import assessments
+from app.utils import invite_cache as invite_cache_module
+from app.utils.invite_cache import (
+    InviteCache,
+    MemoryBackend,
+    NullBackend,
+    create_invite_cache,
+    invite_cache,
+)
+from tests.conftest import score
+
+LATER = datetime.utcnow() + timedelta(days=1)
+
+
+async def test_set_after_invalidate_is_refused():
+    cache = InviteCache(MemoryBackend(10), ttl=30)
+    generation = await cache.generation("token")
+
+    await cache.invalidate("token")
+
+    assert not await cache.set("token", generation, '"1"', b"stale", LATER)
+    assert await cache.get("token") is None
+    current = await cache.generation("token")
+    assert await cache.set("token", current, '"2"', b"fresh", LATER)
+    assert await cache.get("token") == ('"2"', b"fresh")
+
+
+async def test_evicted_generations_still_refuse_stale_sets():
+    cache = InviteCache(MemoryBackend(2), ttl=30)
+    generation = await cache.generation("token")
+    await cache.invalidate("token")
+    # Push "token" out of the generation table.
+    await cache.invalidate("a")
+    await cache.invalidate("b")
+
+    assert not await cache.set("token", generation, '"1"', b"stale", LATER)
+
+
+def test_per_process_cache_is_off_with_several_workers(monkeypatch):
+    monkeypatch.setattr(invite_cache_module, "REDIS_URL", None)
+    monkeypatch.setenv("WEB_CONCURRENCY", "4")
+    assert isinstance(create_invite_cache().backend, NullBackend)
+
+    monkeypatch.setenv("WEB_CONCURRENCY", "1")
+    assert isinstance(create_invite_cache().backend, MemoryBackend)
+
+
+async def test_read_overtaken_by_write_is_not_cached(client, invite, monkeypatch):
+    token = invite["invite_token"]
+    paused, resume = asyncio.Event(), asyncio.Event()
+    find_with_payload = assessments.find_with_payload
+
+    async def slow_find(*args, **kwargs):
+        if not paused.is_set():
+            paused.set()
+            await resume.wait()
+        return await find_with_payload(*args, **kwargs)
+
+    monkeypatch.setattr(assessments, "find_with_payload", slow_find)
+    read = asyncio.create_task(client.get(f"/api/invite/{token}"))
+    await paused.wait()
+
+    saved = await client.patch(
+        f"/api/invite/{token}", json={"scores": [score("adoption-coverage", 4)]}
+    )
+    assert saved.status_code == 200
+    resume.set()
+    assert (await read).status_code == 200
+    # The generation was taken before the write, so the read isn't cached.
+    assert await invite_cache.get(token) is None
+
+    fresh = await client.get(f"/api/invite/{token}")
+    assert fresh.json()["revision"] == 1
+    assert fresh.json()["scores"][0]["score"] == 4
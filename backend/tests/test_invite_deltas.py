@@ -0,0 +1,79 @@
+import asyncio
+
+from tests.conftest import score
+
+
+async def test_deltas_round_trip_as_lists(client, invite):
+    url = f"/api/invite/{invite['invite_token']}"
+    await client.patch(url, json={"scores": [score("adoption-coverage", 2)]})
+    response = await client.patch(
+        url,
+        json={
+            "score_updates": {
+                "adoption-depth": score("adoption-depth", 4),
+                "adoption-coverage": None,
+            }
+        },
+    )
+    assert response.json() == {"ok": True, "revision": 2}
+
+    snapshot = (await client.get(url)).json()
+    assert snapshot["scores"] == [score("adoption-depth", 4)]
+    assert snapshot["revision"] == 2
+
+
+async def test_stale_revision_is_rejected(client, invite):
+    url = f"/api/invite/{invite['invite_token']}"
+    await client.patch(url, json={"company_name": "First"})
+
+    response = await client.patch(url, json={"company_name": "Late", "revision": 0})
+
+    assert response.status_code == 409
+    assert response.headers["X-Revision"] == "1"
+    assert (await client.get(url)).json()["company_name"] == "First"
+
+
+async def test_concurrent_saves_on_one_revision_admit_one(client, invite):
+    url = f"/api/invite/{invite['invite_token']}"
+    responses = await asyncio.gather(
+        *(
+            client.patch(url, json={"company_name": f"Writer {n}", "revision": 0})
+            for n in range(5)
+        )
+    )
+    assert sorted(r.status_code for r in responses) == [200, 409, 409, 409, 409]
+
+
+async def test_legacy_inline_list_is_keyed_before_a_delta(client, db, invite):
+    await db.assessments.update_one(
+        {},
+        {
+            "$set": {"scores": [score("adoption-coverage", 2)]},
+            "$unset": {"payload_split": ""},
+        },
+    )
+    url = f"/api/invite/{invite['invite_token']}"
+
+    response = await client.patch(
+        url, json={"score_updates": {"adoption-depth": score("adoption-depth", 4)}}
+    )
+
+    assert response.status_code == 200
+    assert (await client.get(url)).json()["scores"] == [
+        score("adoption-coverage", 2),
+        score("adoption-depth", 4),
+    ]
+
+
+async def test_delta_against_unkeyable_list_needs_full_save(client, db, invite):
+    document = await db.assessments.find_one({})
+    await db.assessment_payloads.insert_one({"_id": document["_id"], "scores": [2, 4]})
+    url = f"/api/invite/{invite['invite_token']}"
+
+    response = await client.patch(
+        url, json={"score_updates": {"adoption-depth": score("adoption-depth", 4)}}
+    )
+
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Full save required before delta updates"
+    assert (await db.assessment_payloads.find_one({}))["scores"] == [2, 4]
@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+from pymongo.errors import AutoReconnect
+
+from app.routes import assessments
+from tests.conftest import score
+
+PROGRESS = {
+    "completed_metrics": 1,
+    "total_metrics": 10,
+    "percent": 10,
+    "updated_at": "2024-01-01T00:00:00",
+}
+DELTA = {
+    "score_updates": {"adoption-depth": score("adoption-depth", 4)},
+    "progress": PROGRESS,
+}
+
+
+async def metadata(db, invite):
+    return await db.assessments.find_one(
+        {"_id": ObjectId(invite["id"])},
+        {"revision": 1, "updated_at": 1, "progress": 1, "status": 1},
+    )
+
+
+async def test_guard_failure_leaves_metadata_untouched(client, db, invite):
+    await db.assessment_payloads.insert_one(
+        {"_id": ObjectId(invite["id"]), "scores": [2, 4]}
+    )
+    unchanged = await metadata(db, invite)
+
+    response = await client.patch(f"/api/invite/{invite['invite_token']}", json=DELTA)
+
+    assert response.status_code == 409
+    assert await metadata(db, invite) == unchanged
+    assert "progress" not in await db.owner_summaries.find_one({})
+
+
+async def test_guard_lost_to_a_race_settles_payload(client, db, invite, monkeypatch):
+    async def passes(db, token, query, guards):
+        # The list lands after the check, as if a legacy write raced it.
+        await db.assessment_payloads.insert_one(
+            {"_id": ObjectId(invite["id"]), "scores": []}
+        )
+
+    monkeypatch.setattr(assessments, "check_delta_guards", passes)
+    url = f"/api/invite/{invite['invite_token']}"
+
+    response = await client.patch(url, json=DELTA)
+
+    assert response.status_code == 409
+    snapshot = await client.get(url)
+    assert snapshot.status_code == 200
+    assert snapshot.json()["revision"] == (await metadata(db, invite))["revision"]
+    assert snapshot.json()["scores"] == []
+
+
+async def test_payload_lagging_its_metadata_is_not_served(
+    client, db, invite, monkeypatch
+):
+    async def unavailable(*args):
+        raise AutoReconnect("primary stepped down")
+
+    url = f"/api/invite/{invite['invite_token']}"
+    with monkeypatch.context() as patch:
+        patch.setattr(assessments, "write_payload", unavailable)
+        with pytest.raises(AutoReconnect):
+            await client.patch(
+                url,
+                json={"scores": [score("adoption-coverage", 3)], "progress": PROGRESS},
+            )
+
+    response = await client.get(url)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+    # Once the write is old enough to be abandoned, the payload is settled.
+    await db.assessments.update_one(
+        {}, {"$set": {"updated_at": datetime.utcnow() - timedelta(minutes=1)}}
+    )
+    response = await client.get(url)
+    assert response.status_code == 200
+    assert response.json()["revision"] == 1
+    assert response.json()["scores"] is None
+    payload = await db.assessment_payloads.find_one({})
+    assert (
+        payload["revision"] == (await db.assessments.find_one({}))["payload_revision"]
+    )
+
+
+async def test_superseded_payload_write_is_refused(client, db, invite):
+    newer = {"adoption-depth": score("adoption-depth", 5)}
+    await db.assessment_payloads.insert_one(
+        {"_id": ObjectId(invite["id"]), "revision": 5, "scores": newer}
+    )
+
+    response = await client.patch(
+        f"/api/invite/{invite['invite_token']}",
+        json={"scores": [score("adoption-coverage", 3)]},
+    )
+
+    assert response.status_code == 409
+    assert (await db.assessment_payloads.find_one({}))["scores"] == newer
+
+
+async def test_full_save_migrates_inline_payload(client, db, invite):
+    await db.assessments.update_one(
+        {},
+        {
+            "$set": {
+                "selections": [{"metricId": "adoption-coverage", "selected": True}],
+                "scores": [score("adoption-coverage", 2)],
+            },
+            "$unset": {"payload_split": ""},
+        },
+    )
+    url = f"/api/invite/{invite['invite_token']}"
+
+    response = await client.patch(url, json={"scores": [score("adoption-depth", 5)]})
+
+    assert response.status_code == 200
+    document = await db.assessments.find_one({})
+    assert document["payload_split"] is True
+    assert "scores" not in document and "selections" not in document
+    payload = await db.assessment_payloads.find_one({})
+    assert payload["scores"] == {"adoption-depth": score("adoption-depth", 5)}
+    assert payload["selections"] == {
+        "adoption-coverage": {"metricId": "adoption-coverage", "selected": True}
+    }
+    snapshot = (await client.get(url)).json()
+    assert snapshot["scores"] == [score("adoption-depth", 5)]
+    assert snapshot["revision"] == 1
@@ -0,0 +1,99 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from app.schemas.assessments import InviteSnapshot
+from tests.conftest import score
+
+
+async def test_cancelled_invite_is_not_written(client, db, owner, invite):
+    await client.patch(
+        f"/api/assessments/{invite['id']}", json={"status": "cancelled"}, headers=owner
+    )
+
+    response = await client.patch(
+        f"/api/invite/{invite['invite_token']}",
+        json={"scores": [score("adoption-coverage", 3)]},
+    )
+
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Assessment cancelled"
+    assert await db.assessment_payloads.count_documents({}) == 0
+
+
+async def test_expired_invite_is_not_written(client, db, invite):
+    await db.assessments.update_one(
+        {}, {"$set": {"invite_expires_at": datetime.utcnow() - timedelta(minutes=1)}}
+    )
+
+    response = await client.patch(
+        f"/api/invite/{invite['invite_token']}",
+        json={"scores": [score("adoption-coverage", 3)]},
+    )
+
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Invite expired"
+    assert await db.assessment_payloads.count_documents({}) == 0
+
+
+async def test_unknown_invite(client, db):
+    response = await client.patch("/api/invite/missing", json={"company_name": "x"})
+    assert response.status_code == 404
+
+
+async def test_owner_update_checks_ownership(client, invite):
+    from tests.conftest import register
+
+    other = await register(client, "other@example.com")
+    url = f"/api/assessments/{invite['id']}"
+
+    assert (
+        await client.patch(url, json={"status": "cancelled"}, headers=other)
+    ).status_code == 403
+
+
+async def test_invite_snapshot_matches_schema(client, invite):
+    token = invite["invite_token"]
+    await client.patch(
+        f"/api/invite/{token}", json={"scores": [score("adoption-coverage", 3)]}
+    )
+
+    response = await client.get(f"/api/invite/{token}")
+
+    body = response.json()
+    assert InviteSnapshot.model_validate(body).model_dump(mode="json") == body
+    assert body["scores"] == [score("adoption-coverage", 3)]
+    assert body["revision"] == 1
+
+
+async def test_concurrent_completions_count_once(client, db, owner, invite):
+    url = f"/api/invite/{invite['invite_token']}"
+    body = {
+        "selections": [{"metricId": "adoption-coverage", "selected": True}],
+        "scores": [score("adoption-coverage", 4)],
+        "status": "completed",
+    }
+
+    responses = await asyncio.gather(*(client.patch(url, json=body) for _ in range(3)))
+
+    assert sorted(response.status_code for response in responses) == [200, 403, 403]
+    document = await db.assessments.find_one({})
+    assert document["revision"] == 1
+    summary = (await client.get("/api/assessments/summary", headers=owner)).json()
+    assert summary["by_status"]["completed"] == 1
+    assert summary["composite_count"] == 1
+    histogram = await db.peer_histograms.find_one({"_id.pillar": "composite"})
+    assert histogram["total"] == 1
+
+
+async def test_owner_cancel_wins_over_a_pending_invite_write(client, db, owner, invite):
+    await client.patch(
+        f"/api/assessments/{invite['id']}", json={"status": "cancelled"}, headers=owner
+    )
+
+    response = await client.patch(
+        f"/api/invite/{invite['invite_token']}",
+        json={"revision": 0, "progress": None, "company_name": "Renamed"},
+    )
+
+    assert response.status_code == 403
+    assert (await db.assessments.find_one({}))["company_name"] == "Acme"
@@ -0,0 +1,90 @@
+import asyncio
+
+from app.monitoring.metrics import (
+    http_request_duration_seconds,
+    http_requests_in_flight,
+    http_requests_total,
+)
+from app.monitoring.middleware import UNMATCHED_ROUTE, MetricsMiddleware
+from app.security import dependencies
+
+
+def observed(method="GET"):
+    series = http_request_duration_seconds._series.get((method, UNMATCHED_ROUTE))
+    return sum(series[0]) if series else 0
+
+
+def in_flight():
+    return http_requests_in_flight._values.get((), 0)
+
+
+async def call(app, method="GET"):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": method, "path": "/", "headers": []}
+    await MetricsMiddleware(app)(scope, receive, send)
+    return messages
+
+
+async def test_metrics_require_admin_token(client, monkeypatch):
+    monkeypatch.setattr(dependencies, "ADMIN_TOKEN", "secret")
+
+    assert (await client.get("/metrics")).status_code == 401
+    response = await client.get("/metrics", headers={"X-Admin-Token": "wrong"})
+    assert response.status_code == 401
+
+
+async def test_metrics_content_type_has_one_charset(client, monkeypatch):
+    monkeypatch.setattr(dependencies, "ADMIN_TOKEN", "secret")
+    response = await client.get("/metrics", headers={"X-Admin-Token": "secret"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == (
+        "text/plain; version=0.0.4; charset=utf-8"
+    )
+    assert "# TYPE http_requests_total counter" in response.text
+
+
+async def test_event_streams_leave_gauge_and_histogram():
+    opened, close = asyncio.Event(), asyncio.Event()
+
+    async def stream(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"text/event-stream")],
+            }
+        )
+        opened.set()
+        await close.wait()
+        await send({"type": "http.response.body", "body": b""})
+
+    baseline, seen = in_flight(), observed("PUT")
+    task = asyncio.create_task(call(stream, "PUT"))
+    await opened.wait()
+    assert in_flight() == baseline
+    close.set()
+    await task
+
+    assert in_flight() == baseline
+    assert observed("PUT") == seen
+    assert http_requests_total._values[("PUT", UNMATCHED_ROUTE, "200")] >= 1
+
+
+async def test_plain_requests_are_timed():
+    async def plain(scope, receive, send):
+        await send({"type": "http.response.start", "status": 204, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    baseline, seen = in_flight(), observed("DELETE")
+    await call(plain, "DELETE")
+
+    assert in_flight() == baseline
+    assert observed("DELETE") == seen + 1
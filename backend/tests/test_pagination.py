@@ -0,0 +1,37 @@
+from tests.conftest import register
+
+
+async def create(client, owner, count):
+    for index in range(count):
+        response = await client.post(
+            "/api/assessments", json={"company_name": f"Co {index}"}, headers=owner
+        )
+        assert response.status_code == 200
+
+
+async def test_unpaged_list_returns_everything(client, owner):
+    await create(client, owner, 3)
+
+    response = await client.get("/api/assessments", headers=owner)
+
+    assert [item["company_name"] for item in response.json()] == [
+        "Co 2",
+        "Co 1",
+        "Co 0",
+    ]
+    assert "X-Next-Cursor" not in response.headers
+
+
+async def test_pages_follow_the_cursor(client, owner):
+    await create(client, owner, 3)
+    await create(client, await register(client, "other@example.com"), 1)
+
+    first = await client.get("/api/assessments?limit=2", headers=owner)
+    cursor = first.headers["X-Next-Cursor"]
+    second = await client.get(
+        "/api/assessments", params={"cursor": cursor}, headers=owner
+    )
+
+    names = [item["company_name"] for item in first.json() + second.json()]
+    assert names == ["Co 2", "Co 1", "Co 0"]
+    assert "X-Next-Cursor" not in second.headers
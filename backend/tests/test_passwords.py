@@ -0,0 +1,49 @@
+import asyncio
+import threading
+
+import bcrypt
+import pytest
+
+from app.security import passwords
+
+
+def make_hash(rounds: int) -> str:
+    return bcrypt.hashpw(b"secret", bcrypt.gensalt(rounds=rounds)).decode()
+
+
+def test_weaker_hashes_are_upgraded(monkeypatch):
+    monkeypatch.setattr(passwords, "BCRYPT_ROUNDS", 5)
+    assert passwords.needs_rehash(make_hash(4))
+    assert not passwords.needs_rehash(make_hash(5))
+
+
+def test_lowering_rounds_keeps_stronger_hashes(monkeypatch):
+    monkeypatch.setattr(passwords, "BCRYPT_ROUNDS", 4)
+    assert not passwords.needs_rehash(make_hash(6))
+
+
+def test_unparseable_hash_is_replaced():
+    assert passwords.needs_rehash("not-a-bcrypt-hash")
+
+
+async def test_cancelled_caller_keeps_job_counted():
+    started, finish = threading.Event(), threading.Event()
+
+    def job():
+        started.set()
+        finish.wait(5)
+
+    baseline = passwords.pending()
+    task = asyncio.create_task(passwords._run_in_pool("hash", job))
+    await asyncio.to_thread(started.wait, 5)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert passwords.pending() == baseline + 1
+    finish.set()
+    for _ in range(100):
+        if passwords.pending() == baseline:
+            break
+        await asyncio.sleep(0.01)
+    assert passwords.pending() == baseline
@@ -0,0 +1,102 @@
+from app.scoring import recompute
+from app.scoring.peers import (
+    COMPOSITE_KEY,
+    bucket_id,
+    peer_percentiles,
+    rebuild_histograms,
+    record_completion,
+)
+
+
+def completed(_id, score, industry="Retail", size="50-200", version=None):
+    document = {
+        "_id": _id,
+        "status": "completed",
+        "company_industry": industry,
+        "company_size": size,
+        "selections": [{"metricId": "adoption-coverage", "selected": True}],
+        "scores": [{"metricId": "adoption-coverage", "score": score}],
+    }
+    if version:
+        document["benchmark_version"] = version
+    return document
+
+
+async def composite_totals(db):
+    return {
+        (bucket["_id"]["industry"], bucket["_id"]["size"]): bucket["total"]
+        async for bucket in db.peer_histograms.find({"_id.pillar": COMPOSITE_KEY})
+    }
+
+
+async def test_recompletion_moves_counts_instead_of_adding(db):
+    document = completed(1, 2)
+    await db.assessments.insert_one(document)
+
+    await record_completion(db, document)
+    summary = await record_completion(
+        db, {**document, "scores": completed(1, 5)["scores"]}
+    )
+
+    assert await composite_totals(db) == {("Retail", "50-200"): 1}
+    ranks = await peer_percentiles(db, "Retail", "50-200", summary)
+    assert ranks[COMPOSITE_KEY]["peers"] == 1
+    bucket = await db.peer_histograms.find_one(
+        {"_id": bucket_id("0.2", "Retail", "50-200", COMPOSITE_KEY)}
+    )
+    assert sum(bucket["counts"].values()) == 1
+
+
+async def test_buckets_do_not_collide_on_separator(db):
+    first = completed(1, 3, industry="a|b", size="c")
+    second = completed(2, 3, industry="a", size="b|c")
+    await db.assessments.insert_many([first, second])
+
+    for document in (first, second):
+        await record_completion(db, document)
+
+    assert await composite_totals(db) == {("a|b", "c"): 1, ("a", "b|c"): 1}
+
+
+async def test_percentiles_only_compare_the_same_version(db):
+    document = completed(1, 3)
+    await db.assessments.insert_one(document)
+    summary = await record_completion(db, document)
+
+    other = {**summary, "benchmark_version": "0.1"}
+    ranks = await peer_percentiles(db, "Retail", "50-200", other)
+    assert ranks[COMPOSITE_KEY] == {
+        "score": summary["composite_score"],
+        "peers": 0,
+        "percentile": None,
+    }
+
+
+async def test_recompute_moves_histogram_counts(db, monkeypatch):
+    async def fake_reconcile(db, owner_ids):
+        pass
+
+    monkeypatch.setattr(recompute, "reconcile", fake_reconcile)
+    document = completed(1, 3)
+    await db.assessments.insert_one(document)
+    await record_completion(db, document)
+    # Force a rescore as if the summary came from an older benchmark.
+    await db.assessments.update_one(
+        {"_id": 1}, {"$set": {"score_summary.benchmark_version": "0.1"}}
+    )
+
+    assert await recompute.recompute_all(db) == 1
+    assert await composite_totals(db) == {("Retail", "50-200"): 1}
+
+
+async def test_rebuild_recounts_from_summaries(db):
+    documents = [completed(index, 1 + index % 5) for index in range(1, 8)]
+    await db.assessments.insert_many(documents)
+    for document in documents:
+        await record_completion(db, document)
+    expected = await composite_totals(db)
+    await db.peer_histograms.insert_one({"_id": "Retail|50-200|composite", "total": 9})
+
+    assert await rebuild_histograms(db, batch_size=3) == 7
+    assert await composite_totals(db) == expected
+    assert await db.peer_histograms.count_documents({"_id": {"$type": "string"}}) == 0
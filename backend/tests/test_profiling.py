@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+
+import pytest
+
+from app.monitoring import profiling
+from app.monitoring.profiling import ProfilingMiddleware, collapse, loop_frames
+
+
+async def test_loop_frames_are_idle_but_coroutines_are_not():
+    frame = sys._getframe()
+    idle = loop_frames(frame)
+    assert idle
+
+    outermost_loop_frame = frame
+    while outermost_loop_frame.f_code not in idle:
+        outermost_loop_frame = outermost_loop_frame.f_back
+
+    assert collapse(outermost_loop_frame, idle) is None
+    stack = collapse(frame, idle)
+    assert stack.endswith(
+        f"test_loop_frames_are_idle_but_coroutines_are_not "
+        f"(test_profiling.py:{frame.f_code.co_firstlineno})"
+    )
+
+
+async def call(app):
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": []}
+    await ProfilingMiddleware(app)(scope, receive, send)
+
+
+async def test_event_streams_are_not_in_flight_or_profiled(monkeypatch):
+    saved = []
+    monkeypatch.setattr(profiling, "PROFILE_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(profiling.store, "save", lambda *args: saved.append(args))
+    opened, close = asyncio.Event(), asyncio.Event()
+
+    async def stream(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"text/event-stream")],
+            }
+        )
+        opened.set()
+        await close.wait()
+
+    task = asyncio.create_task(call(stream))
+    await opened.wait()
+    assert profiling.sampler.in_flight == 0
+    close.set()
+    await task
+
+    assert profiling.sampler.in_flight == 0
+    assert saved == []
+
+
+async def test_failed_saves_are_logged(monkeypatch, caplog):
+    def fail(meta, stacks):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(profiling, "PROFILE_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(profiling.store, "save", fail)
+
+    async def plain(scope, receive, send):
+        await send({"type": "http.response.start", "status": 204, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    with caplog.at_level(logging.ERROR, logger=profiling.__name__):
+        await call(plain)
+        for _ in range(50):
+            if caplog.records:
+                break
+            await asyncio.sleep(0.01)
+
+    assert profiling.sampler.in_flight == 0
+    assert [record.getMessage() for record in caplog.records] == [
+        "Saving a profile failed"
+    ]
+
+
+def idle_sample(new_loop) -> tuple[frozenset, object]:
+    """Frames the loop's thread shows while it waits with nothing to run."""
+    result = {}
+
+    async def main():
+        result["idle"] = loop_frames(sys._getframe())
+        result["thread"] = threading.get_ident()
+        await asyncio.sleep(0.05)
+
+    def sample():
+        time.sleep(0.025)
+        result["frame"] = sys._current_frames()[result["thread"]]
+
+    sampler = threading.Thread(target=sample)
+    loop = new_loop()
+    try:
+        sampler.start()
+        loop.run_until_complete(main())
+    finally:
+        loop.close()
+        sampler.join()
+    return result["idle"], result["frame"]
+
+
+def test_idle_asyncio_loop_is_not_sampled():
+    idle, frame = idle_sample(asyncio.new_event_loop)
+    assert collapse(frame, idle) is None
+
+
+def test_idle_uvloop_is_not_sampled():
+    uvloop = pytest.importorskip("uvloop")
+    idle, frame = idle_sample(uvloop.new_event_loop)
+    assert collapse(frame, idle) is None
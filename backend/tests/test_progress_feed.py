@@ -0,0 +1,17 @@
+from app.utils.progress_feed import ProgressBroker
+
+
+def test_local_feed_warns_with_several_workers(db, monkeypatch, caplog):
+    monkeypatch.setenv("WEB_CONCURRENCY", "4")
+
+    ProgressBroker(10).start(db)
+
+    assert "PROGRESS_FEED_SOURCE=local with 4 workers" in caplog.text
+
+
+def test_local_feed_is_quiet_on_one_worker(db, monkeypatch, caplog):
+    monkeypatch.setenv("WEB_CONCURRENCY", "1")
+
+    ProgressBroker(10).start(db)
+
+    assert "PROGRESS_FEED_SOURCE" not in caplog.text
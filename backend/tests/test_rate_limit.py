@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.utils import rate_limit
+from app.utils.rate_limit import (
+    Limit,
+    MemoryBackend,
+    RateLimiter,
+    RedisBackend,
+    decide,
+)
+
+LIMIT = Limit("test", count=3, period=30)
+
+
+def test_burst_then_one_per_interval():
+    tat, now = 0.0, 100.0
+    remaining = []
+    for _ in range(3):
+        decision, tat = decide(LIMIT, tat, now)
+        assert decision.allowed
+        remaining.append(decision.remaining)
+    assert remaining == [2, 1, 0]
+
+    rejected, unchanged = decide(LIMIT, tat, now)
+    assert not rejected.allowed
+    assert unchanged == tat
+    assert rejected.retry_after == pytest.approx(LIMIT.interval)
+
+    decision, _ = decide(LIMIT, tat, now + LIMIT.interval)
+    assert decision.allowed and decision.remaining == 0
+
+
+def test_idle_key_refills_to_a_full_burst():
+    _, tat = decide(LIMIT, 0.0, 100.0)
+    decision, _ = decide(LIMIT, tat, 100.0 + LIMIT.period)
+    assert decision.remaining == LIMIT.count - 1
+
+
+async def test_concurrent_hits_allow_exactly_the_burst():
+    backend = MemoryBackend(100)
+
+    decisions = await asyncio.gather(*(backend.hit(LIMIT, "key") for _ in range(10)))
+
+    assert sum(decision.allowed for decision in decisions) == LIMIT.count
+
+
+async def test_memory_backend_evicts_least_recent_keys():
+    backend = MemoryBackend(2)
+    for key in ("a", "b", "c"):
+        await backend.hit(LIMIT, key)
+    assert list(backend._tats) == ["b", "c"]
+
+
+async def test_exhausted_limit_rejects_before_charging_later_keys():
+    limiter = RateLimiter(MemoryBackend(100), enabled=True)
+    tight = Limit("tight", count=1, period=60)
+    loose = Limit("loose", count=10, period=60)
+    await limiter.enforce((tight, "ip"), (loose, "email"))
+
+    with pytest.raises(HTTPException) as rejected:
+        await limiter.enforce((tight, "ip"), (loose, "email"))
+
+    assert rejected.value.status_code == 429
+    assert rejected.value.headers["Retry-After"] == "60"
+    assert rejected.value.headers["RateLimit-Remaining"] == "0"
+    headers = await limiter.enforce((loose, "email"))
+    assert headers["RateLimit-Remaining"] == "8"
+
+
+async def test_missing_keys_are_not_limited():
+    limiter = RateLimiter(MemoryBackend(100), enabled=True)
+    assert await limiter.enforce((LIMIT, None), (LIMIT, "")) == {}
+
+
+async def test_unavailable_redis_allows_requests():
+    backend = RedisBackend.__new__(RedisBackend)
+
+    async def unavailable(**kwargs):
+        raise rate_limit.redis.ConnectionError("down")
+
+    backend._script = unavailable
+
+    decision = await backend.hit(LIMIT, "key")
+
+    assert decision.allowed and decision.remaining == LIMIT.count
+
+
+async def test_login_is_limited_per_email(client, db, monkeypatch):
+    monkeypatch.setattr(rate_limit.rate_limiter, "enabled", True)
+    monkeypatch.setattr(rate_limit.rate_limiter, "backend", MemoryBackend(100))
+    body = {"email": "someone@example.com", "password": "wrong-password"}
+
+    statuses = [
+        (await client.post("/api/auth/login", json=body)).status_code
+        for _ in range(rate_limit.LOGIN_EMAIL.count + 1)
+    ]
+
+    assert statuses[:-1] == [401] * rate_limit.LOGIN_EMAIL.count
+    assert statuses[-1] == 429
@@ -0,0 +1,84 @@
+import random
+
+import numpy as np
+
+from app.db.models import keyed_by_metric
+from app.scoring import get_compiled_benchmark
+from app.scoring import recompute
+from app.scoring.engine import entries
+
+
+def reference_encode(benchmark, documents):
+    """The row-at-a-time encoding the column-wise one replaced."""
+    shape = (len(documents), len(benchmark.metric_ids))
+    scores, selected = np.zeros(shape), np.zeros(shape, dtype=bool)
+    for row, document in enumerate(documents):
+        for item in entries(document.get("selections")):
+            if isinstance(item, dict) and item.get("selected"):
+                column = benchmark.metric_index.get(item.get("metricId"))
+                if column is not None:
+                    selected[row, column] = True
+        for item in entries(document.get("scores")):
+            if isinstance(item, dict):
+                column = benchmark.metric_index.get(item.get("metricId"))
+                value = item.get("score")
+                if column is not None and isinstance(value, (int, float)):
+                    scores[row, column] = value
+    return scores, selected
+
+
+def random_document(rng, metric_ids):
+    chosen = rng.sample(metric_ids, rng.randrange(len(metric_ids)))
+    selections = [
+        {"metricId": metric_id, "selected": rng.random() < 0.8} for metric_id in chosen
+    ]
+    scores = [
+        {"metricId": metric_id, "score": rng.uniform(1, 5)} for metric_id in chosen
+    ]
+    scores.append({"metricId": "not-a-metric", "score": 3})
+    if rng.random() < 0.5:
+        return {
+            "selections": keyed_by_metric(selections),
+            "scores": keyed_by_metric(scores),
+        }
+    return {"selections": selections, "scores": scores + ["junk"]}
+
+
+def test_column_wise_encoding_matches_row_wise():
+    benchmark = get_compiled_benchmark()
+    rng = random.Random(7)
+    documents = [random_document(rng, benchmark.metric_ids) for _ in range(200)]
+    documents += [{}, {"scores": None, "selections": "legacy"}]
+
+    scores, selected = benchmark.encode(documents)
+    expected_scores, expected_selected = reference_encode(benchmark, documents)
+
+    np.testing.assert_array_equal(scores, expected_scores)
+    np.testing.assert_array_equal(selected, expected_selected)
+
+
+async def test_recompute_scores_completed_only(db, monkeypatch):
+    reconciled = []
+
+    async def fake_reconcile(db, owner_ids):
+        reconciled.append(set(owner_ids))
+
+    monkeypatch.setattr(recompute, "reconcile", fake_reconcile)
+    answers = {
+        "selections": [{"metricId": "adoption-coverage", "selected": True}],
+        "scores": [{"metricId": "adoption-coverage", "score": 4}],
+    }
+    await db.assessments.insert_many(
+        [
+            {"_id": 1, "owner_id": "a", "status": "completed", **answers},
+            {"_id": 2, "owner_id": "b", "status": "active", **answers},
+            {"_id": 3, "owner_id": "c", "status": "cancelled", **answers},
+        ]
+    )
+
+    assert await recompute.recompute_all(db) == 1
+    scored = await db.assessments.distinct("_id", {"score_summary": {"$exists": True}})
+    assert scored == [1]
+    assert reconciled == [{"a"}]
+    # Already on this version: nothing to redo.
+    assert await recompute.recompute_all(db) == 0
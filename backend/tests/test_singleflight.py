@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from app.db.singleflight import SingleFlight, invite_reads
+
+
+async def test_concurrent_reads_share_one_call():
+    group = SingleFlight("test")
+    calls = 0
+    release = asyncio.Event()
+
+    async def read():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return {"calls": calls}
+
+    readers = [asyncio.create_task(group.do("key", read)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*readers)
+
+    assert calls == 1
+    assert all(result is results[0] for result in results)
+    assert (group.leaders, group.coalesced) == (1, 4)
+
+
+async def test_finished_reads_are_not_reused():
+    group = SingleFlight("test")
+    values = iter(range(10))
+
+    async def read():
+        return next(values)
+
+    assert await group.do("key", read) == 0
+    assert await group.do("key", read) == 1
+    assert await asyncio.gather(group.do("a", read), group.do("b", read)) == [2, 3]
+
+
+async def test_cancelled_caller_does_not_cancel_the_read():
+    group = SingleFlight("test")
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def read():
+        started.set()
+        await release.wait()
+        return "document"
+
+    first = asyncio.create_task(group.do("key", read))
+    await started.wait()
+    second = asyncio.create_task(group.do("key", read))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == "document"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+async def test_errors_reach_every_caller_and_are_not_cached():
+    group = SingleFlight("test")
+    release = asyncio.Event()
+    attempts = 0
+
+    async def read():
+        nonlocal attempts
+        attempts += 1
+        await release.wait()
+        if attempts == 1:
+            raise RuntimeError("read failed")
+        return "document"
+
+    readers = [asyncio.create_task(group.do("key", read)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*readers, return_exceptions=True)
+
+    assert [type(result) for result in results] == [RuntimeError] * 3
+    assert await group.do("key", read) == "document"
+    assert attempts == 2
+
+
+async def test_abandoned_failed_read_is_retrieved(caplog):
+    group = SingleFlight("test")
+    started = asyncio.Event()
+
+    async def read():
+        started.set()
+        await asyncio.sleep(0)
+        raise RuntimeError("nobody is waiting")
+
+    caller = asyncio.create_task(group.do("key", read))
+    await started.wait()
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+    await asyncio.sleep(0.01)
+
+    assert "Task exception was never retrieved" not in caplog.text
+    assert "key" not in group._inflight
+
+
+async def test_concurrent_invite_loads_read_once(client, invite):
+    leaders = invite_reads.leaders
+    responses = await asyncio.gather(
+        *(client.get(f"/api/invite/{invite['invite_token']}") for _ in range(4))
+    )
+
+    assert [response.status_code for response in responses] == [200] * 4
+    assert len({response.content for response in responses}) == 1
+    # The rest joined that read or were served from the cache it filled.
+    assert invite_reads.leaders - leaders == 1
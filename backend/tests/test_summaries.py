@@ -0,0 +1,164 @@
+import asyncio
+from datetime import datetime
+
+from app.db.summaries import (
+    reconcile,
+    reconcile_pipeline,
+    rollup_stages,
+    summary_response,
+)
+
+from tests.conftest import register, score
+
+PROGRESS = {
+    "completed_metrics": 1,
+    "total_metrics": 2,
+    "percent": 50,
+    "updated_at": "2026-01-01T00:00:00",
+}
+ANSWERS = {
+    "selections": [
+        {
+            "metricId": "adoption-coverage",
+            "pillarId": "internal-adoption",
+            "selected": True,
+        }
+    ],
+    "scores": [score("adoption-coverage", 4)],
+}
+
+
+async def rebuilt(db, owner_ids=None) -> dict:
+    """What reconcile would $merge, keyed by owner ($merge isn't in mongomock)."""
+    rows = await db.assessments.aggregate(
+        rollup_stages(datetime.utcnow(), owner_ids)
+    ).to_list(length=None)
+    return {row["_id"]: summary_response(row) for row in rows}
+
+
+async def incremental(client, headers) -> dict:
+    return (await client.get("/api/assessments/summary", headers=headers)).json()
+
+
+async def owner_id(db, email="owner@example.com") -> str:
+    return str((await db.users.find_one({"email": email}))["_id"])
+
+
+async def test_writes_keep_summary_equal_to_rebuild(client, db, owner):
+    created = [
+        (
+            await client.post(
+                "/api/assessments", json={"company_name": name}, headers=owner
+            )
+        ).json()
+        for name in ("A", "B", "C")
+    ]
+    first, second, third = (f"/api/invite/{item['invite_token']}" for item in created)
+    await client.patch(first, json={"progress": PROGRESS})
+    await client.patch(second, json={**ANSWERS, "progress": PROGRESS})
+    await client.patch(second, json={"status": "completed"})
+    await client.patch(
+        f"/api/assessments/{created[2]['id']}",
+        json={"status": "cancelled"},
+        headers=owner,
+    )
+
+    summary = await incremental(client, owner)
+    assert summary == (await rebuilt(db))[await owner_id(db)]
+    assert summary["by_status"] == {"active": 1, "completed": 1, "cancelled": 1}
+    assert summary["average_percent"] == 50.0
+    assert summary["composite_count"] == 1
+    assert summary["composite_histogram"][8] == 1
+
+
+async def test_reopened_assessment_leaves_composite(client, db, owner, invite):
+    url = f"/api/invite/{invite['invite_token']}"
+    await client.patch(url, json={**ANSWERS, "status": "completed"})
+    await client.patch(
+        f"/api/assessments/{invite['id']}", json={"status": "active"}, headers=owner
+    )
+
+    summary = await incremental(client, owner)
+    assert summary["composite_count"] == 0
+    assert summary["composite_histogram"] == [0] * 10
+    assert summary == (await rebuilt(db))[await owner_id(db)]
+
+
+async def test_scores_on_unfinished_assessments_are_ignored(client, db, owner, invite):
+    # The recompute job writes score_summary onto active documents too.
+    await db.assessments.update_one(
+        {}, {"$set": {"score_summary": {"composite_score": 55.0}}}
+    )
+
+    summary = (await rebuilt(db))[await owner_id(db)]
+
+    assert summary["composite_count"] == 0
+    assert summary == await incremental(client, owner)
+
+
+async def test_rebuild_can_be_scoped_to_owners(client, db, owner, invite):
+    other = await register(client, "other@example.com")
+    await client.post("/api/assessments", json={"company_name": "Z"}, headers=other)
+
+    scoped = await rebuilt(db, [await owner_id(db)])
+
+    assert list(scoped) == [await owner_id(db)]
+    assert scoped[await owner_id(db)]["total"] == 1
+
+
+async def test_concurrent_writes_for_one_owner_do_not_lose_updates(client, db, owner):
+    created = [
+        (
+            await client.post(
+                "/api/assessments", json={"company_name": f"Co {index}"}, headers=owner
+            )
+        ).json()
+        for index in range(6)
+    ]
+
+    await asyncio.gather(
+        *(
+            client.patch(
+                f"/api/invite/{item['invite_token']}",
+                json={**ANSWERS, "progress": PROGRESS, "status": "completed"},
+            )
+            for item in created[:3]
+        ),
+        *(
+            client.patch(
+                f"/api/assessments/{item['id']}",
+                json={"status": "cancelled"},
+                headers=owner,
+            )
+            for item in created[3:]
+        ),
+    )
+
+    summary = await incremental(client, owner)
+    assert summary["by_status"] == {"active": 0, "completed": 3, "cancelled": 3}
+    assert summary["composite_count"] == 3
+    assert summary == (await rebuilt(db))[await owner_id(db)]
+
+
+async def test_reconcile_with_no_owners_touches_nothing(db):
+    await db.owner_summaries.insert_one({"_id": "someone", "total": 7})
+
+    assert await reconcile(db, []) == 0
+    assert await db.owner_summaries.find_one({"_id": "someone"}) == {
+        "_id": "someone",
+        "total": 7,
+    }
+
+
+def test_reconcile_replaces_scoped_summaries_by_owner():
+    started = datetime.utcnow()
+
+    pipeline = reconcile_pipeline(started, ["a", "b"])
+
+    assert pipeline[0] == {"$match": {"owner_id": {"$in": ["a", "b"]}}}
+    assert pipeline[-1]["$merge"] == {
+        "into": "owner_summaries",
+        "on": "_id",
+        "whenMatched": "replace",
+        "whenNotMatched": "insert",
+    }
@@ -0,0 +1,46 @@
+import bcrypt
+
+from app.routes.auth import rehash_password
+from app.security import dependencies, token_cache
+
+from tests.conftest import PASSWORD
+
+
+async def test_rehash_keeps_cached_tokens(client, db, owner):
+    assert (await client.get("/api/auth/me", headers=owner)).status_code == 200
+    user = await db.users.find_one({})
+    assert token_cache.stats()["size"] == 1
+
+    await rehash_password(db, user["_id"], PASSWORD, user["password"])
+
+    assert token_cache.stats()["size"] == 1
+    stored = (await db.users.find_one({}))["password"]
+    assert stored != user["password"]
+    assert bcrypt.checkpw(PASSWORD.encode(), stored.encode())
+
+
+async def test_lost_rehash_race_keeps_stored_hash(db, owner):
+    user = await db.users.find_one({})
+
+    await rehash_password(db, user["_id"], PASSWORD, "stale-hash")
+
+    assert (await db.users.find_one({}))["password"] == user["password"]
+
+
+def test_invalidate_user_only_drops_that_user():
+    token_cache.set_claims("a", {"id": "1", "exp": 2**40})
+    token_cache.set_claims("b", {"id": "1", "exp": 2**40})
+    token_cache.set_claims("c", {"id": "2", "exp": 2**40})
+
+    token_cache.invalidate_user("1")
+
+    assert token_cache.get_claims("a") is None
+    assert token_cache.get_claims("b") is None
+    assert token_cache.get_claims("c") == {"id": "2", "exp": 2**40}
+
+
+async def test_cache_stats_are_on_metrics_only(client, owner, monkeypatch):
+    monkeypatch.setattr(dependencies, "ADMIN_TOKEN", "secret")
+    assert (await client.get("/api/auth/token-cache", headers=owner)).status_code == 404
+    body = (await client.get("/metrics", headers={"X-Admin-Token": "secret"})).text
+    assert "token_cache_entries " in body
@@ -0,0 +1,156 @@
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+from pymongo.errors import AutoReconnect
+
+from app.db import write_behind as write_behind_module
+from app.db.models import AssessmentUpdate
+from app.db.write_behind import PendingWrite, WriteBehindBuffer
+from app.utils.invite_cache import invite_cache
+from app.utils.progress_feed import progress_broker
+from tests.conftest import score
+
+PROGRESS = {
+    "completed_metrics": 1,
+    "total_metrics": 10,
+    "percent": 10,
+    "updated_at": datetime(2024, 1, 1),
+}
+
+
+@pytest.fixture
+async def buffer(db):
+    buffer = WriteBehindBuffer(True, interval=60, max_pending=100)
+    buffer._db = db
+    return buffer
+
+
+@pytest.fixture
+async def stored(db, invite):
+    return await db.assessments.find_one({"_id": ObjectId(invite["id"])})
+
+
+def save(buffer, stored, **fields):
+    update = AssessmentUpdate({})
+    for key, value in fields.items():
+        update.set(key, value)
+    token = stored["invite_token"]
+    entry = buffer.get(token) or PendingWrite(stored["_id"], stored["owner_id"])
+    assert buffer.add(token, entry, update.to_update())
+    return token
+
+
+async def payload(db, stored):
+    return await db.assessment_payloads.find_one({"_id": stored["_id"]})
+
+
+async def test_flush_writes_metadata_then_payload(db, buffer, stored):
+    subscription = progress_broker.subscribe(stored["owner_id"])
+    try:
+        save(buffer, stored, scores=[score("adoption-coverage", 2)])
+        save(buffer, stored, scores=[score("adoption-coverage", 4)], progress=PROGRESS)
+
+        await buffer.flush()
+
+        document = await db.assessments.find_one({"_id": stored["_id"]})
+        assert document["revision"] == stored["revision"] + 1
+        assert document["progress"]["percent"] == 10
+        stored_payload = await payload(db, stored)
+        assert stored_payload["scores"] == [score("adoption-coverage", 4)]
+        assert stored_payload["revision"] == document["payload_revision"]
+        event = await subscription.get(1)
+        assert event["revision"] == document["revision"]
+        assert buffer.written == 1 and buffer.size == 0
+    finally:
+        progress_broker.unsubscribe(subscription)
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        {"status": "cancelled"},
+        {"invite_expires_at": datetime.utcnow() - timedelta(minutes=1)},
+    ],
+)
+async def test_unwritable_invites_get_no_payload(db, buffer, stored, change):
+    token = save(buffer, stored, scores=[score("adoption-coverage", 3)])
+    await db.assessments.update_one({"_id": stored["_id"]}, {"$set": change})
+
+    await buffer.flush()
+
+    document = await db.assessments.find_one({"_id": stored["_id"]})
+    assert document["revision"] == stored["revision"]
+    assert await payload(db, stored) is None
+    assert buffer.written == 0
+    assert await invite_cache.get(token) is None
+
+
+async def test_unwritable_drop_is_logged(db, buffer, stored, caplog):
+    token = save(buffer, stored, progress=PROGRESS)
+    save(buffer, stored, scores=[score("adoption-coverage", 3)])
+    await db.assessments.update_one(
+        {"_id": stored["_id"]}, {"$set": {"status": "cancelled"}}
+    )
+
+    await buffer.flush()
+
+    assert f"Dropped 2 buffered saves for invite {token}" in caplog.text
+
+
+async def test_concurrent_write_keeps_buffered_saves(db, buffer, stored):
+    subscription = progress_broker.subscribe(stored["owner_id"])
+    try:
+        save(buffer, stored, scores=[score("adoption-coverage", 3)], progress=PROGRESS)
+        # Another writer bumps the revision after the saves were acknowledged.
+        await db.assessments.update_one(
+            {"_id": stored["_id"]}, {"$inc": {"revision": 5}}
+        )
+
+        await buffer.flush()
+
+        document = await db.assessments.find_one({"_id": stored["_id"]})
+        assert document["revision"] == stored["revision"] + 6
+        assert document["progress"]["percent"] == 10
+        assert (await payload(db, stored))["scores"] == [score("adoption-coverage", 3)]
+        assert (await subscription.get(1))["revision"] == document["revision"]
+        assert buffer.written == 1
+    finally:
+        progress_broker.unsubscribe(subscription)
+
+
+async def test_superseded_payload_is_requeued(db, buffer, stored):
+    newer = {"_id": stored["_id"], "revision": 9, "scores": []}
+    await db.assessment_payloads.insert_one(newer)
+    token = save(buffer, stored, scores=[score("adoption-coverage", 3)])
+
+    await buffer.flush()
+
+    assert await payload(db, stored) == newer
+    assert buffer.get(token).sets["scores"] == [score("adoption-coverage", 3)]
+
+
+async def test_failed_flush_requeues_under_newer_saves(db, buffer, stored, monkeypatch):
+    async def unavailable(collection, operations):
+        raise AutoReconnect("primary stepped down")
+
+    token = save(
+        buffer,
+        stored,
+        company_name="Older",
+        scores=[score("adoption-coverage", 2)],
+        progress=PROGRESS,
+    )
+    with monkeypatch.context() as patch:
+        patch.setattr(write_behind_module, "bulk_write", unavailable)
+        with pytest.raises(AutoReconnect):
+            await buffer.flush()
+
+    assert buffer.get(token).sets["company_name"] == "Older"
+    save(buffer, stored, company_name="Newer")
+    await buffer.flush()
+
+    document = await db.assessments.find_one({"_id": stored["_id"]})
+    assert document["company_name"] == "Newer"
+    assert document["progress"]["percent"] == 10
+    assert (await payload(db, stored))["scores"] == [score("adoption-coverage", 2)]